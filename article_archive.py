@@ -0,0 +1,322 @@
+# 기사 아카이브 (SQLite, 추가 전용)
+# 수집한 기사를 기사당 한 행(소스, URL, 제목, KST 날짜, 카테고리, 키워드)으로 계속 쌓아 두고
+# 날짜 기준 인덱스로 기간/키워드/소스별 조회와 주·월 단위 집계를 바로 처리
+#   articles:         (source, url) 당 한 행 — 처음 수집된 내용 유지, (day, source) 인덱스
+#   article_keywords: (keyword, day, source, article_id) — 키워드+기간 조회가 인덱스 범위 탐색 하나
+#   daily_counts:     (day, source) 날짜별 기사 수 — 주/월 집계는 기사 행을 훑지 않고 이 표만 묶음
+# 사용: python article_archive.py items --keyword SMR --period 2026-Q3
+#       python article_archive.py counts --by week --period 2026
+#       python article_archive.py stats
+
+# -*- coding: utf-8 -*-
+from datetime import date, timedelta
+import argparse
+import os
+import re
+import sqlite3
+import threading
+
+from keyword_matcher import get_matcher
+from news_dates import news_day, now_kst
+
+ARCHIVE_DB = os.getenv('NEWSBOT_ARCHIVE_DB', 'article_archive.db')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id          INTEGER PRIMARY KEY,
+    source      TEXT NOT NULL,
+    url         TEXT NOT NULL,
+    title       TEXT,
+    day         TEXT NOT NULL,
+    dated       INTEGER NOT NULL,
+    category    TEXT,
+    keywords    TEXT,
+    archived_at TEXT NOT NULL,
+    UNIQUE (source, url)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_day ON articles (day, source);
+CREATE TABLE IF NOT EXISTS article_keywords (
+    keyword    TEXT NOT NULL COLLATE NOCASE,
+    day        TEXT NOT NULL,
+    source     TEXT NOT NULL,
+    article_id INTEGER NOT NULL,
+    PRIMARY KEY (keyword, day, source, article_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS daily_counts (
+    day    TEXT NOT NULL,
+    source TEXT NOT NULL,
+    count  INTEGER NOT NULL,
+    PRIMARY KEY (day, source)
+) WITHOUT ROWID;
+"""
+
+# 집계 단위 → 기간 키 SQL (day는 'YYYY-MM-DD' 문자열, 주는 월요일 날짜로 표시)
+PERIOD_SQL = {
+    'day': 'day',
+    'week': "date(day, '-6 days', 'weekday 1')",
+    'month': 'substr(day, 1, 7)',
+    'year': 'substr(day, 1, 4)',
+}
+
+# CrawlResult 속성 → (소스 키, URL 필드)
+RESULT_SOURCES = (
+    ('energy_news', 'energy_news', 'url'),
+    ('knp_news', 'knpnews', 'url'),
+    ('kaif_posts', 'kaif', 'list_url'),
+    ('newsletter_items', 'kaif_newsletter', 'url'),
+)
+
+
+def parse_period(text):
+    """
+    기간 문자열 → (시작일, 종료일) date (양 끝 포함)
+    2026 / 2026-Q3 / 2026-07 / 2026-07-15 / 2026-07-01:2026-09-30
+    """
+    if ':' in text:
+        start, end = text.split(':', 1)
+        return parse_period(start)[0], parse_period(end)[1]
+    m = re.fullmatch(r'(\d{4})(?:-(?:Q([1-4])|(\d{1,2})(?:-(\d{1,2}))?))?', text.strip(), re.IGNORECASE)
+    if not m:
+        raise ValueError(f'기간 형식을 알 수 없음: {text} (예: 2026, 2026-Q3, 2026-07, 2026-07-15)')
+    try:
+        return _period_bounds(m)
+    except ValueError:
+        raise ValueError(f'없는 날짜: {text}') from None
+
+
+def _period_bounds(m):
+    year = int(m.group(1))
+    if m.group(2):
+        first_month = (int(m.group(2)) - 1) * 3 + 1
+        return date(year, first_month, 1), _month_end(year, first_month + 2)
+    if m.group(4):
+        day = date(year, int(m.group(3)), int(m.group(4)))
+        return day, day
+    if m.group(3):
+        month = int(m.group(3))
+        return date(year, month, 1), _month_end(year, month)
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def _month_end(year, month):
+    following = date(year + month // 12, month % 12 + 1, 1)
+    return following - timedelta(days=1)
+
+
+def _range_clause(column, start, end, params):
+    clauses = []
+    if start is not None:
+        clauses.append(f'{column} >= ?')
+        params.append(start.isoformat())
+    if end is not None:
+        clauses.append(f'{column} <= ?')
+        params.append(end.isoformat())
+    return clauses
+
+
+class ArticleArchive:
+    """
+    추가 전용 기사 아카이브 — 같은 (source, url)은 다시 넣어도 무시 (재실행/--slack-only 재전송에도 중복 없음)
+    날짜를 해석할 수 없는 기사는 수집한 날(KST)로 넣고 dated=0으로 표시
+    저널은 기본(rollback) 모드 — DB 파일 하나만 보관해도 커밋된 내용이 모두 들어 있도록
+    """
+
+    def __init__(self, path=ARCHIVE_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def add(self, items, source=None, url_key='url', date_key='date', today=None):
+        """
+        기사 리스트 추가 — source가 없으면 기사마다 'source' 필드 사용
+        키워드는 기사의 'keywords' 필드, 없으면 공용 키워드 사전으로 매칭
+        반환: 새로 추가된 기사 수
+        """
+        today = today or now_kst().date()
+        archived_at = now_kst().strftime('%Y-%m-%d %H:%M:%S')
+        matcher = None
+        added = 0
+        with self._lock, self._conn:
+            for item in items:
+                url = (item.get(url_key) or '').strip()
+                item_source = source or item.get('source')
+                if not url or not item_source:
+                    continue
+                day = news_day(item, date_key, today)
+                day_text = (day or today).isoformat()
+                keywords = item.get('keywords')
+                if keywords is None:
+                    matcher = matcher or get_matcher()
+                    keywords = matcher.match_item(item)
+                cursor = self._conn.execute(
+                    'INSERT INTO articles (source, url, title, day, dated, category, keywords, archived_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (source, url) DO NOTHING',
+                    (item_source, url, item.get('title'), day_text, day is not None,
+                     item.get('category'), ','.join(keywords), archived_at),
+                )
+                if not cursor.rowcount:
+                    continue
+                self._conn.executemany(
+                    'INSERT OR IGNORE INTO article_keywords (keyword, day, source, article_id) VALUES (?, ?, ?, ?)',
+                    [(keyword, day_text, item_source, cursor.lastrowid) for keyword in keywords],
+                )
+                self._conn.execute(
+                    'INSERT INTO daily_counts (day, source, count) VALUES (?, ?, 1) '
+                    'ON CONFLICT (day, source) DO UPDATE SET count = count + 1',
+                    (day_text, item_source),
+                )
+                added += 1
+        return added
+
+    def add_result(self, result, today=None):
+        """CrawlResult 전체(일반 기사, KAIF 게시물, 뉴스레터) 추가 — 반환: {소스: 새로 추가된 수}"""
+        added = {}
+        for attr, source, url_key in RESULT_SOURCES:
+            items = getattr(result, attr)
+            if items:
+                added[source] = self.add(items, source=source, url_key=url_key, today=today)
+        return added
+
+    def items(self, keyword=None, start=None, end=None, source=None, limit=None):
+        """
+        기사 조회 (날짜순) — keyword는 키워드 사전 항목과 대소문자 무시 일치
+        start/end: date (양 끝 포함), limit: 최대 개수
+        """
+        params = []
+        if keyword:
+            clauses = ['k.keyword = ?']
+            params.append(keyword)
+            clauses += _range_clause('k.day', start, end, params)
+            if source:
+                clauses.append('k.source = ?')
+                params.append(source)
+            sql = ('SELECT a.* FROM article_keywords k JOIN articles a ON a.id = k.article_id '
+                   f'WHERE {" AND ".join(clauses)} ORDER BY k.day, a.id')
+        else:
+            clauses = _range_clause('day', start, end, params)
+            if source:
+                clauses.append('source = ?')
+                params.append(source)
+            where = f'WHERE {" AND ".join(clauses)}' if clauses else ''
+            sql = f'SELECT * FROM articles INDEXED BY idx_articles_day {where} ORDER BY day, id'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row(row) for row in rows]
+
+    @staticmethod
+    def _row(row):
+        item = dict(row)
+        item['keywords'] = item['keywords'].split(',') if item['keywords'] else []
+        item['dated'] = bool(item['dated'])
+        return item
+
+    def counts(self, by='week', start=None, end=None, keyword=None, source=None):
+        """
+        기간 단위(by: day/week/month/year) × 소스별 기사 수
+        keyword가 없으면 daily_counts만, 있으면 키워드 인덱스만 읽음 (기사 행은 읽지 않음)
+        반환: [(기간 키, 소스, 기사 수)] (기간순)
+        """
+        period = PERIOD_SQL[by]
+        params = []
+        if keyword:
+            table, value = 'article_keywords', 'COUNT(*)'
+            clauses = ['keyword = ?']
+            params.append(keyword)
+        else:
+            table, value = 'daily_counts', 'SUM(count)'
+            clauses = []
+        clauses += _range_clause('day', start, end, params)
+        if source:
+            clauses.append('source = ?')
+            params.append(source)
+        where = f'WHERE {" AND ".join(clauses)}' if clauses else ''
+        sql = (f'SELECT {period} AS period, source, {value} AS n FROM {table} {where} '
+               'GROUP BY period, source ORDER BY period, source')
+        with self._lock:
+            return [tuple(row) for row in self._conn.execute(sql, params)]
+
+    def stats(self):
+        """전체 기사 수, 날짜 범위, 소스별 기사 수"""
+        with self._lock:
+            total, first, last = self._conn.execute(
+                'SELECT SUM(count), MIN(day), MAX(day) FROM daily_counts'
+            ).fetchone()
+            by_source = dict(self._conn.execute(
+                'SELECT source, SUM(count) FROM daily_counts GROUP BY source ORDER BY source'
+            ).fetchall())
+        return {'total': total or 0, 'first_day': first, 'last_day': last, 'sources': by_source}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive():
+    """프로세스 공용 ArticleArchive (NEWSBOT_ARCHIVE_DB, 기본 article_archive.db)"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = ArticleArchive()
+        return _archive
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='기사 아카이브 조회')
+    parser.add_argument('--db', default=ARCHIVE_DB, help=f'아카이브 DB 경로 (기본 {ARCHIVE_DB})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_filters(command):
+        command.add_argument('--period', help='기간 (2026, 2026-Q3, 2026-07, 2026-07-15, 시작:끝)')
+        command.add_argument('--keyword', help='키워드 (키워드 사전 항목, 예: SMR, 두코바니)')
+        command.add_argument('--source', help='소스 (energy_news, knpnews, kaif, kaif_newsletter)')
+
+    items_cmd = commands.add_parser('items', help='기사 목록')
+    add_filters(items_cmd)
+    items_cmd.add_argument('--limit', type=int, default=100, help='최대 출력 개수 (0이면 전부)')
+    counts_cmd = commands.add_parser('counts', help='기간 × 소스별 기사 수')
+    add_filters(counts_cmd)
+    counts_cmd.add_argument('--by', choices=sorted(PERIOD_SQL), default='week', help='집계 단위 (기본 week)')
+    commands.add_parser('stats', help='전체 기사 수/날짜 범위')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        parser.error(f'아카이브 DB가 없습니다: {args.db}')
+    archive = ArticleArchive(args.db)
+    try:
+        start, end = parse_period(args.period) if getattr(args, 'period', None) else (None, None)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.command == 'items':
+        rows = archive.items(args.keyword, start, end, args.source, limit=args.limit or None)
+        for item in rows:
+            mark = '' if item['dated'] else ' (수집일)'
+            print(f"{item['day']}{mark} [{item['source']}] {item['title']}")
+            print(f"    {item['url']}" + (f"  #{' #'.join(item['keywords'])}" if item['keywords'] else ''))
+        print(f'[OK] {len(rows)}개')
+    elif args.command == 'counts':
+        rows = archive.counts(args.by, start, end, args.keyword, args.source)
+        totals = {}
+        for period, source, n in rows:
+            print(f'{period}  {source:<16} {n:>6}')
+            totals[source] = totals.get(source, 0) + n
+        print(f"[OK] 합계: {', '.join(f'{s} {n}' for s, n in sorted(totals.items())) or '없음'}")
+    else:
+        stats = archive.stats()
+        print(f"[OK] 기사 {stats['total']}개 ({stats['first_day']} ~ {stats['last_day']})")
+        for source, n in stats['sources'].items():
+            print(f'    {source:<16} {n:>8}')
+    archive.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,367 @@
+# 수집 기사 한국어 전문 검색 (SQLite FTS5)
+# 제목 / 미리보기 / KAIF 게시물 본문·뉴스 링크 제목 / 뉴스레터 항목을 한 색인에 모아 순위(bm25)대로 검색
+# 한국어는 띄어쓰기 단위로 자르면 '두코바니 원전을'처럼 조사가 붙어 검색이 안 되므로 글자 2-gram으로 색인:
+#   '체코두코바니' → 체코 코두 두코 코바 바니 니   (한글/한자 구간: 겹치는 2글자 + 마지막 1글자)
+#   'i-SMR 수주'   → i smr 수주 주               (영문/숫자 구간: 단어 그대로, 검색 시 접두어 일치)
+#   검색어 '두코바니' → "두코 코바 바니" 구문 검색 (= 부분 문자열 일치), 한 글자는 접두어 검색
+# Python sqlite3에서는 FTS5 토크나이저를 등록할 수 없어 n-gram 분해는 여기서 하고 FTS5(unicode61)에는 공백 구분 토큰으로 넣음
+# 색인 본문은 FTS5에 저장하지 않고(contentless) 원문만 search_docs에 보관 — 내용이 바뀐 기사는 원문으로 다시 분해해 삭제 후 재색인
+# 기본 DB는 기사 아카이브와 같은 파일 (CI 상태 릴리스에 같이 보관)
+# 사용: python article_search.py search 두코바니 [--source kaif] [--period 2026-Q3] [--limit 20]
+#       python article_search.py index [JSON 파일 ...]   (지난 결과 파일 일괄 색인, 기본: 현재 폴더의 소스별 파일)
+#       python article_search.py stats
+
+# -*- coding: utf-8 -*-
+from datetime import date
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+
+from article_archive import ARCHIVE_DB, RESULT_SOURCES, parse_period
+from news_dates import news_day, now_kst
+
+SEARCH_DB = os.getenv('NEWSBOT_SEARCH_DB', ARCHIVE_DB)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_docs (
+    id     INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    url    TEXT NOT NULL,
+    title  TEXT,
+    body   TEXT,
+    day    TEXT,
+    UNIQUE (source, url)
+);
+CREATE INDEX IF NOT EXISTS idx_search_docs_day ON search_docs (day);
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+    title, body, content='', tokenize='unicode61 remove_diacritics 0'
+);
+"""
+
+# 제목 가중치 (본문 대비)
+TITLE_WEIGHT = 3.0
+# 기본으로 순위를 매길 최근 매칭 문서 수 — '원전'처럼 대부분의 기사에 나오는 검색어도
+# 전체 매칭에 bm25를 계산하지 않고 (소스/기간 조건에 맞는) 최근 RANK_WINDOW건 안에서 고름 (rowid 순 = 색인 순)
+# 그보다 오래된 기사까지 순위에 넣으려면 search(window=None) / CLI --all
+RANK_WINDOW = 5000
+SNIPPET_CHARS = 60
+
+# 한글(음절/자모), 한자 구간 / 영문·숫자 구간
+_RUNS = re.compile(r'[가-힣ㄱ-ㆎ一-鿿]+|[a-z0-9]+')
+
+
+def _normalize(text):
+    return unicodedata.normalize('NFKC', text or '').lower()
+
+
+def ngrams(text):
+    """색인용 토큰 — 한글/한자 구간은 겹치는 2-gram + 마지막 글자, 영문/숫자 구간은 단어 그대로"""
+    tokens = []
+    for run in _RUNS.findall(_normalize(text)):
+        if run.isascii():
+            tokens.append(run)
+            continue
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        tokens.append(run[-1])
+    return tokens
+
+
+def build_query(text):
+    """
+    검색어 → FTS5 MATCH 식 (공백으로 나눈 단어는 모두 포함해야 함)
+    한글 2글자 이상: 2-gram 구문, 한 글자: 접두어, 영문/숫자: 접두어 ('apr' → APR1400)
+    반환: 식 문자열 (검색할 토큰이 없으면 None)
+    """
+    terms = []
+    for run in _RUNS.findall(_normalize(text)):
+        if run.isascii() or len(run) == 1:
+            terms.append(f'"{run}"*')
+        else:
+            terms.append('"' + ' '.join(run[i:i + 2] for i in range(len(run) - 1)) + '"')
+    return ' AND '.join(terms) if terms else None
+
+
+def item_text(item):
+    """기사 dict → (제목, 본문) — 소스마다 다른 필드를 한 본문으로"""
+    title = item.get('title') or item.get('detail_title') or ''
+    parts = [item.get('preview'), item.get('content'), item.get('summary')]
+    if item.get('detail_title') and item.get('detail_title') != title:
+        parts.insert(0, item['detail_title'])
+    # KAIF 게시물: 본문에 실린 국내외 기사 제목도 검색 대상
+    for links in (item.get('news_links') or {}).values():
+        parts.extend(link.get('title') for link in links)
+    return title, '\n'.join(p for p in parts if p)
+
+
+def _snippet(body, query):
+    """본문에서 검색어가 처음 나온 위치 주변 SNIPPET_CHARS자 (없으면 본문 앞부분)"""
+    if not body:
+        return ''
+    lowered = _normalize(body)
+    positions = [p for p in (lowered.find(w) for w in _normalize(query).split()) if p >= 0]
+    start = max(0, min(positions) - SNIPPET_CHARS // 3) if positions else 0
+    snippet = ' '.join(body[start:start + SNIPPET_CHARS].split())
+    return ('…' if start else '') + snippet + ('…' if start + SNIPPET_CHARS < len(body) else '')
+
+
+class ArticleSearch:
+    """
+    FTS5 색인 — search_docs 행 id가 곧 search_index rowid
+    같은 (source, url)을 다시 넣으면 제목/본문이 바뀐 경우에만 재색인 (증분 갱신)
+    """
+
+    def __init__(self, path=SEARCH_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def index(self, items, source=None, url_key='url', date_key='date', today=None):
+        """
+        기사 리스트 색인 — source가 없으면 기사마다 'source' 필드 사용
+        반환: (새로 색인한 수, 내용이 바뀌어 다시 색인한 수)
+        """
+        today = today or now_kst().date()
+        added = updated = 0
+        with self._lock, self._conn:
+            for item in items:
+                url = (item.get(url_key) or '').strip()
+                item_source = source or item.get('source')
+                if not url or not item_source:
+                    continue
+                title, body = item_text(item)
+                day = news_day(item, date_key, today)
+                row = self._conn.execute(
+                    'SELECT id, title, body FROM search_docs WHERE source = ? AND url = ?', (item_source, url)
+                ).fetchone()
+                if row is not None:
+                    if (row['title'] or '', row['body'] or '') == (title, body):
+                        continue
+                    # contentless 색인 삭제: 색인할 때 넣었던 토큰을 그대로 다시 넘겨야 함
+                    self._conn.execute(
+                        "INSERT INTO search_index (search_index, rowid, title, body) VALUES ('delete', ?, ?, ?)",
+                        (row['id'], ' '.join(ngrams(row['title'])), ' '.join(ngrams(row['body']))),
+                    )
+                    self._conn.execute(
+                        'UPDATE search_docs SET title = ?, body = ?, day = COALESCE(?, day) WHERE id = ?',
+                        (title, body, day.isoformat() if day else None, row['id']),
+                    )
+                    doc_id = row['id']
+                    updated += 1
+                else:
+                    doc_id = self._conn.execute(
+                        'INSERT INTO search_docs (source, url, title, body, day) VALUES (?, ?, ?, ?, ?)',
+                        (item_source, url, title, body, day.isoformat() if day else None),
+                    ).lastrowid
+                    added += 1
+                self._conn.execute(
+                    'INSERT INTO search_index (rowid, title, body) VALUES (?, ?, ?)',
+                    (doc_id, ' '.join(ngrams(title)), ' '.join(ngrams(body))),
+                )
+        return added, updated
+
+    def index_result(self, result, today=None):
+        """CrawlResult 전체 색인 — 반환: {소스: (새로 색인, 재색인)}"""
+        counts = {}
+        for attr, source, url_key in RESULT_SOURCES:
+            items = getattr(result, attr)
+            if items:
+                counts[source] = self.index(items, source=source, url_key=url_key, today=today)
+        return counts
+
+    def search(self, query, limit=20, source=None, start=None, end=None, window=RANK_WINDOW):
+        """
+        검색 — bm25 순위 (제목 가중치 TITLE_WEIGHT), 같은 점수면 최신 기사 먼저
+        window: 소스/기간 조건에 맞는 매칭 중 최근 window건 안에서만 순위 (None이면 전체 매칭)
+        start/end: date (양 끝 포함, 날짜를 모르는 기사는 기간 지정 시 제외)
+        반환: [{source, url, title, day, score, snippet}]
+        """
+        match = build_query(query)
+        if match is None:
+            return []
+        clauses, params = _filter_clauses(source, start, end)
+        with self._lock:
+            rowid_range = self._rowid_range(match, clauses, params, start, end, window)
+            if rowid_range is None:
+                return []
+            sql = (
+                f'SELECT d.source, d.url, d.title, d.body, d.day, bm25(search_index, {TITLE_WEIGHT}, 1.0) AS score '
+                'FROM search_index JOIN search_docs d ON d.id = search_index.rowid '
+                'WHERE search_index MATCH ? AND search_index.rowid BETWEEN ? AND ? '
+                f'{"".join(" AND " + c for c in clauses)} ORDER BY score, d.day DESC LIMIT ?'
+            )
+            rows = self._conn.execute(sql, [match, *rowid_range, *params, limit]).fetchall()
+        return [{
+            'source': row['source'], 'url': row['url'], 'title': row['title'], 'day': row['day'],
+            'score': round(-row['score'], 3), 'snippet': _snippet(row['body'], query),
+        } for row in rows]
+
+    def truncated(self, query, source=None, start=None, end=None, window=RANK_WINDOW):
+        """조건에 맞는 매칭이 window건을 넘어 search()가 최근 window건 안에서만 순위를 매기는지"""
+        match = build_query(query)
+        if match is None or window is None:
+            return False
+        clauses, params = _filter_clauses(source, start, end)
+        with self._lock:
+            bounds = self._period_ids(start, end)
+            if bounds is None:
+                return False
+            return self._window_edge(match, clauses, params, bounds, window) is not None
+
+    def _period_ids(self, start, end):
+        """기간 기사의 id 범위 (기사는 대개 그날 색인되므로 범위가 좁음) — 기간에 기사가 없으면 None"""
+        if start is None and end is None:
+            high = self._conn.execute('SELECT COALESCE(MAX(id), -1) FROM search_docs').fetchone()[0]
+            return 0, high
+        low, high = self._conn.execute(
+            'SELECT MIN(id), MAX(id) FROM search_docs WHERE day BETWEEN ? AND ?',
+            ((start or date.min).isoformat(), (end or date.max).isoformat()),
+        ).fetchone()
+        if low is None:
+            return None
+        return low, high
+
+    def _window_edge(self, match, clauses, params, bounds, window):
+        """조건에 맞는 매칭 중 window번째로 최근인 문서의 rowid (매칭이 window건 이하면 None)"""
+        row = self._conn.execute(
+            'SELECT search_index.rowid FROM search_index JOIN search_docs d ON d.id = search_index.rowid '
+            'WHERE search_index MATCH ? AND search_index.rowid BETWEEN ? AND ? '
+            f'{"".join(" AND " + c for c in clauses)} ORDER BY search_index.rowid DESC LIMIT 1 OFFSET ?',
+            [match, *bounds, *params, window - 1],
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def _rowid_range(self, match, clauses, params, start, end, window):
+        """
+        FTS5가 바로 쓸 수 있는 rowid 범위로 후보 좁히기 (소스/기간 조건은 본 쿼리에서 다시 확인)
+        기간: 그 기간 기사의 id 범위, 흔한 검색어: 조건에 맞는 매칭 중 window번째로 최근인 문서부터
+        반환: (low, high) 또는 None (기간에 기사가 없음)
+        """
+        bounds = self._period_ids(start, end)
+        if bounds is None or window is None:
+            return bounds
+        edge = self._window_edge(match, clauses, params, bounds, window)
+        return (edge, bounds[1]) if edge is not None else bounds
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM search_docs').fetchone()[0]
+
+    def optimize(self):
+        """FTS5 세그먼트 병합 (대량 색인 후 검색 속도 유지용)"""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO search_index (search_index) VALUES ('optimize')")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _filter_clauses(source, start, end):
+    """search_docs d 에 거는 소스/기간 조건"""
+    clauses, params = [], []
+    if source:
+        clauses.append('d.source = ?')
+        params.append(source)
+    if start is not None:
+        clauses.append('d.day >= ?')
+        params.append(start.isoformat())
+    if end is not None:
+        clauses.append('d.day <= ?')
+        params.append(end.isoformat())
+    return clauses, params
+
+
+_search = None
+_search_lock = threading.Lock()
+
+
+def get_search():
+    """프로세스 공용 ArticleSearch (NEWSBOT_SEARCH_DB, 기본은 기사 아카이브 DB)"""
+    global _search
+    with _search_lock:
+        if _search is None:
+            _search = ArticleSearch()
+        return _search
+
+
+# 결과 JSON의 목록 키 → (소스 키, URL 필드) — 소스 키가 None이면 기사마다 'source' 필드 사용
+_JSON_LISTS = {
+    'news_list': (None, 'url'),
+    'news': (None, 'url'),
+    'posts': ('kaif', 'list_url'),
+    'kaif_posts': ('kaif', 'list_url'),
+    'items': ('kaif_newsletter', 'url'),
+    'newsletter_items': ('kaif_newsletter', 'url'),
+}
+
+
+def index_json_file(search, path):
+    """
+    결과 JSON 파일 하나 색인 (소스별 *_data.json, all_news_data.json, yesterday_news_*.json)
+    반환: 새로 색인한 수
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    added = 0
+    for key, (source, url_key) in _JSON_LISTS.items():
+        items = data.get(key)
+        if items:
+            added += search.index(items, source=source or data.get('source'), url_key=url_key)[0]
+    return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='수집 기사 전문 검색')
+    parser.add_argument('--db', default=SEARCH_DB, help=f'검색 색인 DB 경로 (기본 {SEARCH_DB})')
+    commands = parser.add_subparsers(dest='command', required=True)
+    search_cmd = commands.add_parser('search', help='검색')
+    search_cmd.add_argument('query', nargs='+', help='검색어 (여러 단어는 모두 포함)')
+    search_cmd.add_argument('--source', help='소스 (energy_news, knpnews, kaif, kaif_newsletter)')
+    search_cmd.add_argument('--period', help='기간 (2026, 2026-Q3, 2026-07, 2026-07-15, 시작:끝)')
+    search_cmd.add_argument('--limit', type=int, default=20)
+    search_cmd.add_argument('--all', action='store_true',
+                            help=f'최근 {RANK_WINDOW}건이 아니라 전체 매칭에서 순위 (느림)')
+    index_cmd = commands.add_parser('index', help='결과 JSON 파일 색인')
+    index_cmd.add_argument('files', nargs='*', help='JSON 파일 (기본: 현재 폴더의 소스별 결과 파일)')
+    commands.add_parser('stats', help='색인된 문서 수')
+    args = parser.parse_args(argv)
+
+    search = ArticleSearch(args.db)
+    if args.command == 'search':
+        try:
+            start, end = parse_period(args.period) if args.period else (None, None)
+        except ValueError as e:
+            parser.error(str(e))
+        query = ' '.join(args.query)
+        window = None if args.all else RANK_WINDOW
+        results = search.search(query, args.limit, args.source, start, end, window)
+        for i, hit in enumerate(results, 1):
+            print(f"[{i}] {hit['day'] or '날짜 없음'} [{hit['source']}] {hit['title']}  (점수 {hit['score']})")
+            print(f"    {hit['url']}")
+            if hit['snippet']:
+                print(f"    {hit['snippet']}")
+        print(f"[OK] '{query}' {len(results)}건")
+        if search.truncated(query, args.source, start, end, window):
+            print(f"[INFO] 매칭이 {RANK_WINDOW}건을 넘어 최근 {RANK_WINDOW}건 안에서만 순위를 매김 — 전체 순위는 --all")
+    elif args.command == 'index':
+        from crawl_result import SOURCE_FILES
+        files = args.files or [path for path, _ in SOURCE_FILES.values() if os.path.exists(path)]
+        for path in files:
+            try:
+                print(f'[OK] {path}: {index_json_file(search, path)}개 새로 색인')
+            except (OSError, ValueError) as e:
+                print(f'[SKIP] {path} 색인 실패: {e}')
+        search.optimize()
+    else:
+        print(f'[OK] 색인된 문서 {search.count()}개')
+    search.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+# 기사 아카이브 조회 벤치마크
+# 여러 해 분량의 합성 기사를 임시 아카이브에 쌓고 자주 쓰는 조회의 소요 시간 측정:
+#   키워드 + 분기 기사 목록 ("3분기 SMR 기사"), 전체 기간 소스별 주간 집계,
+#   키워드 월간 집계, 하루치 기사 목록
+# 실행: python benchmarks/bench_article_archive.py [--years 5] [--per-day 300]
+
+# -*- coding: utf-8 -*-
+from datetime import date, timedelta
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_archive import ArticleArchive, parse_period
+from keyword_matcher import NUCLEAR_KEYWORDS
+
+SOURCES = ['energy_news', 'knpnews', 'kaif', 'kaif_newsletter']
+_WORDS = ['정부', '발표', '에너지', '전력', '수급', '계획', '확정', '추진', '협력', '산업부', '지원', '시장']
+
+
+def synthetic_day(day, per_day, rng):
+    """하루치 기사 — 제목의 30%에 원자력 키워드 1~2개"""
+    items = []
+    for i in range(per_day):
+        words = [rng.choice(_WORDS) for _ in range(6)]
+        if rng.random() < 0.3:
+            words[rng.randrange(6)] = rng.choice(NUCLEAR_KEYWORDS)
+            if rng.random() < 0.3:
+                words[rng.randrange(6)] = rng.choice(NUCLEAR_KEYWORDS)
+        items.append({
+            'source': SOURCES[i % len(SOURCES)],
+            'url': f'https://example.com/{day.isoformat()}/{i}',
+            'title': ' '.join(words),
+            'date': day.strftime('%Y.%m.%d 09:00'),
+            'category': '원자력',
+        })
+    return items
+
+
+def timed_ms(func, repeat=5):
+    """최소 소요 시간 (ms)과 마지막 결과"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='기사 아카이브 조회 벤치마크')
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--per-day', type=int, default=300)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(7)
+    last = date(2026, 12, 31)
+    first = date(last.year - args.years + 1, 1, 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = ArticleArchive(os.path.join(tmp, 'archive.db'))
+        started = time.perf_counter()
+        day, total = first, 0
+        while day <= last:
+            total += archive.add(synthetic_day(day, args.per_day, rng), today=last)
+            day += timedelta(days=1)
+        load = time.perf_counter() - started
+        size = os.path.getsize(os.path.join(tmp, 'archive.db')) / 1e6
+        print(f'[OK] {total}개 적재 ({first} ~ {last}): {load:.1f}초 '
+              f'({total / load:.0f}개/초), DB {size:.1f}MB')
+
+        q3 = parse_period(f'{last.year - 1}-Q3')
+        cases = [
+            (f'SMR 기사 {last.year - 1}-Q3', lambda: archive.items('SMR', *q3)),
+            ('소스별 주간 집계 (전체 기간)', lambda: archive.counts('week')),
+            ('두코바니 월간 집계 (전체 기간)', lambda: archive.counts('month', keyword='두코바니')),
+            ('하루치 기사 목록', lambda: archive.items(start=last, end=last)),
+            ('knpnews 한 달 기사 목록', lambda: archive.items(source='knpnews', start=date(last.year, 6, 1),
+                                                          end=date(last.year, 6, 30))),
+        ]
+        for label, func in cases:
+            ms, result = timed_ms(func)
+            print(f'  {label:<32} {ms:>8.2f}ms  ({len(result)}행)')
+        archive.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# 기사 전문 검색 벤치마크
+# 합성 기사(제목 + 본문 미리보기)를 임시 색인에 쌓고 자주 쓰는 검색의 소요 시간 측정:
+#   두 글자 검색어("원전"), 세 글자 이상("두코바니"), 여러 단어, 영문 접두어("SMR"),
+#   한 글자 검색어, 기간/소스 조건, 전체 매칭 순위(--all), 재실행 시 색인 갱신(바뀐 기사 없음)
+# 실행: python benchmarks/bench_article_search.py [--docs 300000]
+
+# -*- coding: utf-8 -*-
+from datetime import date, timedelta
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from article_search import ArticleSearch
+from keyword_matcher import NUCLEAR_KEYWORDS
+
+SOURCES = ['energy_news', 'knpnews', 'kaif', 'kaif_newsletter']
+_WORDS = ['정부', '발표', '에너지', '전력', '수급', '계획', '확정', '추진', '협력', '산업부', '지원', '시장',
+          '원전', '발전소', '수출', '안전', '규제', '기술', '연구', '개발', '건설', '운영', '계약', '해외']
+PER_DAY = 150
+
+
+def synthetic_docs(count, last, rng):
+    """last에서 끝나도록 하루 PER_DAY개씩 날짜순 기사 (실제처럼 오래된 기사부터 색인) — 제목의 30%, 본문의 50%에 원자력 키워드"""
+    first = last - timedelta(days=(count - 1) // PER_DAY)
+    docs = []
+    for i in range(count):
+        title = [rng.choice(_WORDS) for _ in range(6)]
+        body = [rng.choice(_WORDS) for _ in range(30)]
+        if rng.random() < 0.3:
+            title[rng.randrange(6)] = rng.choice(NUCLEAR_KEYWORDS)
+        if rng.random() < 0.5:
+            body[rng.randrange(30)] = rng.choice(NUCLEAR_KEYWORDS)
+        day = first + timedelta(days=i // PER_DAY)
+        docs.append({
+            'source': SOURCES[i % len(SOURCES)],
+            'url': f'https://example.com/{i}',
+            'title': ' '.join(title),
+            'preview': ' '.join(body),
+            'date': day.strftime('%Y.%m.%d 09:00'),
+        })
+    return docs
+
+
+def timed_ms(func, repeat=5):
+    """최소 소요 시간 (ms)과 마지막 결과"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='기사 전문 검색 벤치마크')
+    parser.add_argument('--docs', type=int, default=300000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(7)
+    last = date(2026, 12, 31)
+    docs = synthetic_docs(args.docs, last, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'search.db')
+        search = ArticleSearch(path)
+        started = time.perf_counter()
+        for i in range(0, len(docs), 1000):
+            search.index(docs[i:i + 1000], today=last)
+        search.optimize()
+        load = time.perf_counter() - started
+        size = os.path.getsize(path) / 1e6
+        print(f'[OK] {search.count()}개 색인: {load:.1f}초 ({len(docs) / load:.0f}개/초), DB {size:.1f}MB')
+
+        ms, (added, updated) = timed_ms(lambda: search.index(docs[-PER_DAY:], today=last), repeat=3)
+        print(f'  {"하루치 재색인 (바뀐 기사 없음)":<32} {ms:>8.2f}ms  (새 {added} / 갱신 {updated})')
+
+        cases = [
+            ('두 글자 "원전"', lambda: search.search('원전')),
+            ('세 글자 이상 "두코바니"', lambda: search.search('두코바니')),
+            ('여러 단어 "원전 수출 계약"', lambda: search.search('원전 수출 계약')),
+            ('영문 접두어 "SMR"', lambda: search.search('SMR')),
+            ('한 글자 "핵"', lambda: search.search('핵')),
+            ('"원전" + kaif', lambda: search.search('원전', source='kaif')),
+            ('"원전" 전체 매칭 순위 (window 없음)', lambda: search.search('원전', window=None)),
+            ('"원전" + 한 달 + knpnews', lambda: search.search('원전', source='knpnews',
+                                                               start=date(2026, 6, 1), end=date(2026, 6, 30))),
+        ]
+        for label, func in cases:
+            ms, result = timed_ms(func)
+            print(f'  {label:<32} {ms:>8.2f}ms  ({len(result)}건)')
+        search.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# KAIF 뉴스레터 Gmail 수집 벤치마크 (로컬 스텁 서버)
+# 기존 방식: messages.list(maxResults=10) 후 메일마다 messages.get(format='full') 순차 호출
+# 현재 방식: nextPageToken 페이지 처리 + fields 부분 응답
+#   DIRECT_FETCH_MAX통 이하는 메일별 직접 조회, 그보다 많으면 배치 요청 + HTML 파트만 조회
+# 왕복 수, 응답 바이트, 소요 시간, 추출한 HTML 일치 여부 비교
+# --latency: 요청마다 스텁 응답 지연 (ms, 실제 Gmail 왕복 흉내 — 0이면 왕복 비용이 거의 없어 배치가 불리)
+# 실행: python benchmarks/bench_gmail_fetch.py [--latency 50]
+
+# -*- coding: utf-8 -*-
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_newsletter_sections import synthetic_newsletter
+from gmail_stub import GmailStub, Mailbox
+from kaif_newsletter import KAIFNewsletterParser, build_gmail_service
+
+MAILBOX_SIZES = [1, 3, 5, 30]
+IMAGE_BYTES = 50 * 1024
+IMAGES_PER_MAIL = 3
+
+
+def legacy_fetch(parser):
+    """기존 fetch 단계 — 목록 1회 + 메일별 전체(format=full) 조회"""
+    result = parser.service.users().messages().list(userId='me', q='', maxResults=10).execute()
+    bodies = []
+    for m in result.get('messages', []):
+        msg = parser.service.users().messages().get(userId='me', id=m['id'], format='full').execute()
+        bodies.append((m['id'], parser._extract_html(msg)))
+    return bodies
+
+
+def current_fetch(parser):
+    return parser._fetch_html_bodies(parser._list_message_ids(''))
+
+
+def main(argv=None):
+    cli = argparse.ArgumentParser(description='KAIF 뉴스레터 Gmail 수집 벤치마크')
+    cli.add_argument('--latency', type=float, default=0, help='요청마다 스텁 응답 지연 (ms)')
+    args = cli.parse_args(argv)
+
+    print(f"요청당 지연 {args.latency:g}ms")
+    print(f"{'메일 수':>6} {'방식':<8} {'왕복':>5} {'호출':>5} {'응답 KB':>9} {'ms':>8} {'HTML':>5}")
+    failed = False
+    for size in MAILBOX_SIZES:
+        mailbox = Mailbox()
+        for i in range(size):
+            html = synthetic_newsletter(1).replace('원전 관련 기사', f'원전 관련 기사 #{i}')
+            mailbox.add_newsletter(html, images=[bytes(IMAGE_BYTES)] * IMAGES_PER_MAIL)
+
+        with GmailStub(mailbox, latency=args.latency / 1000) as stub:
+            parser = KAIFNewsletterParser(service=build_gmail_service(api_endpoint=stub.endpoint))
+            results = {}
+            for name, fetch in (('기존', legacy_fetch), ('현재', current_fetch)):
+                stub.reset_stats()
+                started = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results[name] = fetch(parser)
+                elapsed = (time.perf_counter() - started) * 1000
+                stats = stub.stats
+                print(f"{size:>6} {name:<8} {stats['requests']:>5} "
+                      f"{stats['requests'] - stats['batches'] + stats['batched_calls']:>5} "
+                      f"{stats['bytes'] / 1024:>9.1f} {elapsed:>8.1f} {sum(1 for _, h in results[name] if h):>5}")
+
+        # 기존 방식은 maxResults=10까지만 받으므로 공통 범위만 비교
+        legacy = dict(results['기존'])
+        same = all(html == legacy[mid] for mid, html in results['현재'] if mid in legacy)
+        if not same:
+            print(f"{size:>6} [HTML 불일치]")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# 키워드 매칭 벤치마크
+# 사전 크기를 키워가며 항목당 매칭 비용 비교:
+#   naive — any(kw in text for kw in keywords) (기존 방식, 키워드 수에 비례)
+#   automaton — KeywordMatcher (SCAN_MAX_KEYWORDS개부터 Aho-Corasick, 텍스트 길이 + 매칭 수에 비례)
+# 키워드가 수십 개일 땐 str.__contains__가 더 빠르므로 KeywordMatcher도 그 구간은 포함 검사
+# 실행: python benchmarks/bench_keyword_matcher.py
+
+# -*- coding: utf-8 -*-
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_matcher import NUCLEAR_KEYWORDS, KeywordMatcher
+
+SIZES = [17, 40, 100, 500, 2000]
+N_ITEMS = 2000
+
+_SYLLABLES = '가나다라마바사아자차카타파하원전력핵연료방사선우라늄한수원기술산업협회'
+_TITLE_WORDS = ['정부', '발표', '에너지', '전력', '수급', '계획', '확정', '추진', '협력',
+                '원전', '수출', '한수원', 'SMR', '두코바니', '계약', '체결', '산업부', '지원']
+
+
+def synthetic_vocabulary(size, rng):
+    """실제 키워드 + 임의 한글 조합으로 size개 사전 생성"""
+    vocab = list(NUCLEAR_KEYWORDS)
+    while len(vocab) < size:
+        word = ''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(3, 6)))
+        if word not in vocab:
+            vocab.append(word)
+    return vocab[:size]
+
+
+def synthetic_items(n, rng):
+    """제목(~40자) + 미리보기(~120자) 형태의 기사 n개"""
+    items = []
+    for _ in range(n):
+        title = ' '.join(rng.choice(_TITLE_WORDS) for _ in range(8))
+        preview = ' '.join(rng.choice(_TITLE_WORDS) for _ in range(25))
+        items.append({'title': title, 'preview': preview})
+    return items
+
+
+def per_item_us(func, items, repeat=3):
+    """항목당 평균 소요 시간 (µs, repeat회 중 최소)"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - started)
+    return best / len(items) * 1e6
+
+
+def main():
+    rng = random.Random(42)
+    items = synthetic_items(N_ITEMS, rng)
+
+    print(f"항목 {N_ITEMS}개 (title + preview), 항목당 µs")
+    print(f"{'사전 크기':>10} {'naive':>10} {'automaton':>10} {'compile ms':>11}")
+    for size in SIZES:
+        vocab = synthetic_vocabulary(size, rng)
+
+        def naive(item, vocab=vocab):
+            return [kw for kw in vocab if kw in item['title'] or kw in item['preview']]
+
+        started = time.perf_counter()
+        matcher = KeywordMatcher(vocab)
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        # 두 방식의 결과가 같은지 확인
+        for item in items[:200]:
+            assert naive(item) == matcher.match_item(item, ('title', 'preview'))
+
+        naive_us = per_item_us(naive, items)
+        automaton_us = per_item_us(lambda item: matcher.match_item(item, ('title', 'preview')), items)
+        print(f"{size:>10} {naive_us:>10.2f} {automaton_us:>10.2f} {compile_ms:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
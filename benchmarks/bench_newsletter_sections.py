@@ -0,0 +1,174 @@
+# KAIF 뉴스레터 섹션 추출 벤치마크
+# 기존 BeautifulSoup(html.parser) + 태그별 get_text 방식과
+# lxml HTMLParser target 한 번 순회 방식(KAIFNewsletterParser._parse_sections)의 결과 일치 여부와 속도 비교
+# 입력: kaif_newsletter_debug.html (있으면) + 중첩 테이블 구조의 합성 뉴스레터 (기본/10배/깊은 중첩)
+# 실행: python benchmarks/bench_newsletter_sections.py [html 파일 ...]
+
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from kaif_newsletter import KAIFNewsletterParser
+
+DEBUG_HTML = 'kaif_newsletter_debug.html'
+
+
+def legacy_parse_sections(parser, html, date):
+    """기존 구현 (비교 기준) — soup.find_all(True) 순회 + div/td/span마다 get_text"""
+    def get_text(tag):
+        text = tag.get_text(strip=False).replace('\xa0', ' ')
+        return re.sub(r'\s+', ' ', text).strip()
+
+    soup = BeautifulSoup(html, 'html.parser')
+    date_str = date.strftime('%Y.%m.%d')
+    items = []
+    seen_urls = set()
+    current_section = None
+
+    for tag in soup.find_all(True):
+        if tag.name in ('script', 'style', 'head', 'meta', 'link'):
+            continue
+
+        if tag.name in ('div', 'td', 'span'):
+            text = get_text(tag)
+            if 0 < len(text) < 30:
+                matched = False
+                for keyword, category in parser.TARGET_SECTIONS.items():
+                    if keyword in text:
+                        current_section = category
+                        matched = True
+                        break
+                if not matched:
+                    for skip in parser.SKIP_SECTIONS:
+                        if skip in text:
+                            current_section = None
+                            break
+
+        if tag.name == 'a' and current_section:
+            href = tag.get('href', '')
+            if 'neo_reject' in href:
+                continue
+
+            if current_section == 'nuclear_events':
+                spans = tag.find_all('span', recursive=False)
+                if len(spans) >= 2:
+                    event_title = get_text(spans[0])
+                    date_loc = get_text(spans[1])
+                    display_title = f"{event_title} / {date_loc}" if date_loc else event_title
+                else:
+                    display_title = get_text(tag)
+            else:
+                display_title = get_text(tag)
+
+            if '수신거부' in display_title or '>' in display_title:
+                continue
+
+            if not href.startswith('http') or len(display_title) <= 3 or href in seen_urls:
+                continue
+
+            if current_section == 'nuclear_news':
+                org = ''
+                tr = tag.find_parent('tr')
+                if tr:
+                    tds = tr.find_all('td', recursive=False)
+                    if len(tds) >= 3:
+                        org = get_text(tds[-1])
+                if org:
+                    display_title = f"{display_title} - {org}"
+
+            seen_urls.add(href)
+            items.append({
+                'title': display_title,
+                'url': href,
+                'source': 'kaif_newsletter',
+                'date': date_str,
+                'category': current_section,
+            })
+    return items
+
+
+def _wrap(html, depth):
+    """뉴스레터 레이아웃처럼 테이블 depth겹으로 감쌈"""
+    for _ in range(depth):
+        html = f'<table width="100%"><tr><td align="center">\n  {html}\n</td></tr></table>'
+    return html
+
+
+def synthetic_newsletter(repeat=1, depth=4):
+    """섹션 구성(국내/세계기사 → 원자력계 소식 → 원자력계 이벤트)을 repeat번 반복한 합성 HTML"""
+    blocks = []
+    for r in range(repeat):
+        for header in ('국내기사', '세계기사'):
+            rows = ''.join(
+                f'<tr><td>·</td><td><a href="https://news.example.com/{r}/{header}/{i}">'
+                f'원전 관련 기사 제목 {r}-{i}&nbsp;입니다</a></td><td>언론사{i}</td></tr>'
+                for i in range(15)
+            )
+            blocks.append(_wrap(f'<div style="font-weight:bold">{header}</div>', 2))
+            blocks.append(_wrap(f'<table>{rows}</table>', depth))
+        rows = ''.join(
+            f'<tr><td>·</td><td><a href="https://org.example.com/{r}/{i}">'
+            f'<span>원자력계 소식 항목 {r}-{i}</span></a></td><td>\n  단체{i}\n</td></tr>'
+            for i in range(10)
+        )
+        blocks.append(_wrap('<td><span>⚛ 원자력계 소식</span></td>', 2))
+        blocks.append(_wrap(f'<table>{rows}</table>', depth))
+        events = ''.join(
+            f'<p><a href="https://event.example.com/{r}/{i}"><span style="color:green">원자력 행사 {r}-{i}</span>'
+            f'<span>2026.05.{i + 1:02d} / 서울 코엑스</span></a></p>'
+            for i in range(8)
+        )
+        blocks.append(_wrap('<div>원자력계 이벤트</div>', 2))
+        blocks.append(_wrap(f'<div>{events}</div>', depth))
+        blocks.append(_wrap('<div>사설·칼럼</div>', 2))
+        blocks.append(_wrap('<a href="https://kaif.or.kr/neo_reject?u=1">수신거부</a>', 1))
+    body = '\n'.join(blocks)
+    return f'<html><head><style>td {{ font-size: 12px; }}</style></head><body>{_wrap(body, depth)}</body></html>'
+
+
+def best_ms(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, result
+
+
+def main(paths):
+    parser = KAIFNewsletterParser.__new__(KAIFNewsletterParser)  # Gmail 인증 없이 파서만 사용
+    date = datetime(2026, 4, 13)
+
+    cases = []
+    for path in paths or ([DEBUG_HTML] if os.path.exists(DEBUG_HTML) else []):
+        with open(path, 'r', encoding='utf-8') as f:
+            cases.append((os.path.basename(path), f.read()))
+    cases += [
+        ('synthetic x1', synthetic_newsletter(1)),
+        ('synthetic x10', synthetic_newsletter(10)),
+        ('synthetic x1 deep', synthetic_newsletter(1, depth=12)),
+    ]
+
+    print(f"{'입력':<28} {'KB':>7} {'항목':>5} {'soup ms':>9} {'lxml ms':>9} {'배':>6}")
+    failed = False
+    for name, html in cases:
+        with contextlib.redirect_stdout(io.StringIO()):
+            legacy_ms, legacy = best_ms(lambda: legacy_parse_sections(parser, html, date))
+            new_ms, items = best_ms(lambda: parser._parse_sections(html, date))
+        same = legacy == items
+        failed |= not same
+        print(f"{name:<28} {len(html.encode('utf-8')) / 1024:>7.0f} {len(items):>5} "
+              f"{legacy_ms:>9.1f} {new_ms:>9.1f} {legacy_ms / new_ms:>6.1f}" + ('' if same else '  [결과 불일치]'))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
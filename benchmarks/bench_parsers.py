@@ -0,0 +1,335 @@
+# 파서 벤치마크 모음 (네트워크 없음)
+# 크롤러가 남긴 페이지(energy_news_page_source.html, knpnews_page_source.html, kaif_newsletter_debug.html)가
+# 있으면 그대로, 없으면 같은 구조의 합성 페이지로 목록/게시판/상세/뉴스레터 파서를 돌려
+# 케이스별 시간(best-of-N), 처리량(항목/초), tracemalloc 최대 메모리를 출력
+# 각 입력은 항목을 복제해 10배/100배로 키운 변형도 함께 측정 (항목 수가 배수대로 나오는지도 확인)
+#
+# 회귀 검사: benchmarks/parser_baseline.json의 처리량보다 threshold 이상 떨어지면 종료 코드 1
+# (케이스마다 직전에 잰 순수 파이썬 보정 작업 시간으로 환산해 비교 — 기계/부하에 따른 속도 차이 보정)
+# 실행: python benchmarks/bench_parsers.py [--update-baseline] [--threshold 0.3] [--pages DIR]
+
+# -*- coding: utf-8 -*-
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import crawler_energy_news
+import crawler_kaif
+import crawler_knpnews
+from bench_newsletter_sections import synthetic_newsletter
+from kaif_newsletter import KAIFNewsletterParser
+from snapshot_parser import find_list_items, first
+from lxml import html as lxml_html
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parser_baseline.json')
+DEFAULT_THRESHOLD = 0.3   # 처리량이 기준 대비 30% 넘게 떨어지면 실패
+SCALES = (1, 10, 100)
+
+ENERGY_URL = 'https://www.energy-news.co.kr/news/articleList.html?sc_sub_section_code=S2N4&view_type=sm'
+KNP_URL = 'https://www.knpnews.com/news/articleList.html?sc_section_code=S1N1&view_type=sm'
+KAIF_URL = 'https://www.kaif.or.kr/ko/ko/?c=250&s=250'
+KAIF_POST_URL = 'https://www.kaif.or.kr/ko/ko/?c=250&s=250&gbn=viewok&gp=1&ix=12345'
+TODAY = date(2026, 4, 14)
+TARGET_DAY = date(2026, 4, 13)
+NEWSLETTER_DATE = datetime(2026, 4, 13)
+
+_WORDS = ['원전', '수출', '한수원', 'SMR', '정책', '발표', '전력', '수급', '계획', '원자력', '안전',
+          '규제', '사용후핵연료', '처분장', '계속운전', '체코', '두코바니', '계약', '협력', '기술']
+
+
+def _title(rng, n=6):
+    return ' '.join(rng.choice(_WORDS) for _ in range(n))
+
+
+# ---- 합성 페이지 (캡처 파일이 없을 때 같은 구조로 생성) ----
+
+def synthetic_article_list(count=20, seed=1, byline=True):
+    """에너지신문/원자력산업신문 목록 구조 (#section-list ul.type2 li) — byline: type2, 아니면 type1 메타"""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        idx = 100000 + i
+        if byline:
+            meta = ('<span class="byline"><em>전력·원자력</em><em>홍길동 기자</em>'
+                    f'<em>2026.04.13 {9 + i % 9:02d}:{i % 60:02d}</em></span>')
+        else:
+            meta = ('<em class="info category">원자력</em><em class="info name">홍길동 기자</em>'
+                    f'<em class="info dated">04-13 {9 + i % 9:02d}:{i % 60:02d}</em>')
+        items.append(
+            f'<li><a class="thumb" href="/news/articleView.html?idxno={idx}">'
+            f'<img src="/news/thumbnail/{idx}_s.jpg" alt=""></a>'
+            f'<h2 class="titles"><a href="/news/articleView.html?idxno={idx}">{_title(rng)}</a></h2>'
+            f'<p class="lead"><a href="/news/articleView.html?idxno={idx}">{_title(rng, 25)}</a></p>'
+            f'{meta}</li>'
+        )
+    nav = ''.join(f'<li><a href="/news/articleList.html?page={p}">{p}</a></li>' for p in range(1, 6))
+    return (
+        '<html><head><meta charset="utf-8"><title>목록</title><script>var x = 1;</script></head><body>'
+        f'<div id="nav"><ul class="gnb">{nav}</ul></div>'
+        f'<section id="section-list"><ul class="type2">{"".join(items)}</ul></section>'
+        '<footer>copyright</footer></body></html>'
+    )
+
+
+def synthetic_board(count=15, seed=2):
+    """KAIF 게시판 목록 (table tbody tr) — 3행 중 1행이 대상 날짜"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        posted = TARGET_DAY if i % 3 == 0 else date(2026, 4, 10)
+        rows.append(
+            f'<tr><td class="num">{count - i}</td>'
+            f'<td class="subject"><a href="?c=250&s=250&gbn=viewok&gp=1&ix={5000 + i}">원자력 투데이뉴스 {_title(rng, 3)}</a></td>'
+            f'<td class="writer">관리자</td><td class="col-date">{posted.strftime("%Y-%m-%d")}</td></tr>'
+        )
+    return ('<html><body><div class="board-list"><table><thead><tr><th>번호</th><th>제목</th>'
+            f'<th>작성자</th><th>날짜</th></tr></thead><tbody>{"".join(rows)}</tbody></table></div></body></html>')
+
+
+def synthetic_detail(per_section=12, seed=3):
+    """KAIF 상세 페이지 — #bbsContents 안에 섹션 헤더 + '· 제목 언론사' 줄 (제목에 링크)"""
+    rng = random.Random(seed)
+    blocks = []
+    for n, (header, host) in enumerate((('국내기사', 'news.example.co.kr'), ('세계기사', 'world.example.com'),
+                                        ('사설·칼럼', 'opinion.example.co.kr'), ('원자력계 소식', 'org.example.or.kr'))):
+        blocks.append(f'<p><strong>{header}</strong></p>')
+        for i in range(per_section):
+            # 제목에 섹션 헤더 단어가 들어가면 헤더 줄로 인식되므로 번호만 붙임
+            title = f'{_title(rng)} ({n}-{i})'
+            blocks.append(f'<p>· <a href="https://{host}/article/{seed}{i}">{title}</a> 언론사{i}</p>')
+    return (
+        '<html><body><h3 class="bbs-view-tit">원자력 투데이뉴스 (2026.04.13)</h3>'
+        f'<div id="bbsContents"><table><tr><td>{"".join(blocks)}</td></tr></table></div></body></html>'
+    )
+
+
+# ---- 항목 복제로 입력 키우기 ----
+
+def _rewrite_links(elem, copy_no):
+    """복제본 링크를 구분되게 (중복 URL 제거 로직에 걸리지 않도록)"""
+    for a in elem.iter('a'):
+        href = a.get('href')
+        if href and 'neo_reject' not in href:
+            a.set('href', f"{href}{'&' if '?' in href else '?'}copy={copy_no}")
+
+
+def enlarge(html, find_items, factor):
+    """find_items(doc)가 고른 요소들을 factor배로 복제 (같은 부모 안, 원본 뒤에 순서대로)"""
+    if factor == 1:
+        return html
+    doc = lxml_html.document_fromstring(html)
+    items = find_items(doc)
+    for copy_no in range(1, factor):
+        for item in items:
+            clone = copy.deepcopy(item)
+            _rewrite_links(clone, copy_no)
+            item.getparent().append(clone)
+    return lxml_html.tostring(doc, encoding='unicode')
+
+
+def _list_items(selectors, min_count, container):
+    def find(doc):
+        _, items = find_list_items(doc, selectors, min_count, container=container)
+        return items
+    return find
+
+
+def _children(selector):
+    def find(doc):
+        parent = first(doc, selector)
+        return list(parent) if parent is not None else []
+    return find
+
+
+# ---- 케이스 ----
+
+def _newsletter_parser():
+    return KAIFNewsletterParser.__new__(KAIFNewsletterParser)  # Gmail 인증 없이 파서만 사용
+
+
+PARSERS = {
+    # 이름: (파싱 함수(html) → 결과, 결과 → 항목 수, 입력 키우기용 항목 선택 함수)
+    'energy_news.list': (
+        lambda html: crawler_energy_news._parse_list_snapshot(html, ENERGY_URL),
+        len,
+        _list_items(crawler_energy_news.LIST_SELECTORS, crawler_energy_news.MIN_LIST_ITEMS, True),
+    ),
+    'knpnews.list': (
+        lambda html: crawler_knpnews._parse_list_snapshot(html, KNP_URL),
+        len,
+        _list_items(crawler_knpnews.LIST_SELECTORS, crawler_knpnews.MIN_LIST_ITEMS, False),
+    ),
+    'kaif.board': (
+        lambda html: crawler_kaif.collect_targets(html, KAIF_URL, TARGET_DAY, TODAY),
+        len,
+        _list_items(crawler_kaif.BOARD_SELECTORS, crawler_kaif.MIN_BOARD_ITEMS, False),
+    ),
+    # 상세 페이지의 국내외 뉴스 테이블 — match_news_lines로 섹션/링크 매칭
+    'kaif.news_table': (
+        lambda html: crawler_kaif.parse_detail_page(html, KAIF_POST_URL),
+        lambda detail: sum(len(v) for v in detail['news_links'].values()),
+        _children('#bbsContents td'),
+    ),
+    'kaif_newsletter.sections': (
+        lambda html, parser=_newsletter_parser(): parser._parse_sections(html, NEWSLETTER_DATE),
+        len,
+        _children('body'),
+    ),
+}
+
+CAPTURED_PAGES = {
+    'energy_news.list': 'energy_news_page_source.html',
+    'knpnews.list': 'knpnews_page_source.html',
+    'kaif_newsletter.sections': 'kaif_newsletter_debug.html',
+}
+
+
+def base_inputs(pages_dir):
+    """(파서 이름, 입력 종류, HTML) — 캡처 파일이 있으면 captured, 합성은 항상 포함"""
+    inputs = []
+    for name, filename in CAPTURED_PAGES.items():
+        path = os.path.join(pages_dir, filename)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                inputs.append((name, 'captured', f.read()))
+    inputs += [
+        ('energy_news.list', 'synthetic', synthetic_article_list(20, seed=1, byline=True)),
+        ('knpnews.list', 'synthetic', synthetic_article_list(20, seed=4, byline=False)),
+        ('kaif.board', 'synthetic', synthetic_board()),
+        ('kaif.news_table', 'synthetic', synthetic_detail()),
+        ('kaif_newsletter.sections', 'synthetic', synthetic_newsletter(1)),
+    ]
+    return inputs
+
+
+_CALIBRATION_DATA = [random.Random(0).random() for _ in range(50000)]
+
+
+def calibrate(repeat=7):
+    """기계 속도 보정용 순수 파이썬 작업 시간 (ms, 최솟값) — 케이스마다 바로 앞에서 측정해 속도 변동을 따라감"""
+    words = [str(x) for x in _CALIBRATION_DATA[:12000]]
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        sorted(_CALIBRATION_DATA)
+        ' '.join(words).split()
+        {w: len(w) for w in words}
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def measure(func, html, min_runs=5, min_seconds=0.3, max_runs=200):
+    """
+    (최소 시간 ms, 결과, tracemalloc 최대 메모리 KB)
+    시간은 min_runs회 이상, 합계 min_seconds초가 될 때까지 반복한 최솟값 (작은 입력의 측정 잡음 완화)
+    메모리는 시간 측정과 별도로 1회 실행
+    """
+    best = float('inf')
+    result = None
+    total = 0.0
+    runs = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        while runs < min_runs or (total < min_seconds and runs < max_runs):
+            started = time.perf_counter()
+            result = func(html)
+            elapsed = time.perf_counter() - started
+            best = min(best, elapsed)
+            total += elapsed
+            runs += 1
+        tracemalloc.start()
+        try:
+            func(html)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return best * 1000, result, peak / 1024
+
+
+def run(pages_dir, scales=SCALES):
+    """전체 케이스 실행 — 반환: {케이스 이름: 측정값 dict}"""
+    results = {}
+    print(f"{'케이스':<44} {'KB':>7} {'항목':>6} {'ms':>9} {'항목/초':>10} {'peak KB':>9}")
+    for name, kind, html in base_inputs(pages_dir):
+        parse, count, find_items = PARSERS[name]
+        base_count = None
+        for scale in scales:
+            page = enlarge(html, find_items, scale)
+            size_kb = len(page.encode('utf-8')) / 1024
+            calibration_ms = calibrate()
+            ms, result, peak_kb = measure(parse, page)
+            items = count(result) if result is not None else 0
+            if scale == 1:
+                base_count = items
+            case = f'{name} [{kind} x{scale}]'
+            note = '' if items == base_count * scale else f'  [항목 수 {base_count * scale} 예상]'
+            throughput = items / (ms / 1000) if ms else 0
+            results[case] = {
+                'kb': round(size_kb, 1), 'items': items, 'ms': round(ms, 3),
+                'items_per_sec': round(throughput, 1), 'peak_kb': round(peak_kb, 1),
+                'calibration_ms': round(calibration_ms, 3),
+            }
+            print(f"{case:<44} {size_kb:>7.0f} {items:>6} {ms:>9.2f} {throughput:>10.0f} {peak_kb:>9.0f}{note}")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """기준 대비 처리량 회귀 케이스 목록 [(케이스, 현재, 기대치)] — 기대치는 케이스별 보정 시간 비율로 환산"""
+    regressions = []
+    for case, current in results.items():
+        old = baseline['cases'].get(case)
+        if not old or not old['items_per_sec'] or not current['items']:
+            continue
+        speed = old['calibration_ms'] / current['calibration_ms']   # >1이면 지금이 더 빠름
+        expected = old['items_per_sec'] * speed
+        if current['items_per_sec'] < expected * (1 - threshold):
+            regressions.append((case, current['items_per_sec'], expected))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='파서 벤치마크 (네트워크 없음)')
+    parser.add_argument('--pages', default=ROOT, help='캡처 페이지 디렉토리 (기본: 저장소 루트)')
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='허용 처리량 하락 비율 (기본 0.3 = 30%%)')
+    parser.add_argument('--update-baseline', action='store_true', help='이번 결과를 기준값으로 저장')
+    args = parser.parse_args(argv)
+
+    results = run(args.pages)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'cases': results}, f, ensure_ascii=False, indent=2)
+        print(f"\n[OK] 기준값 저장: {args.baseline}")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    mismatched = [case for case, r in results.items()
+                  if case in baseline['cases'] and r['items'] != baseline['cases'][case]['items']]
+    for case in mismatched:
+        print(f"[WARN] {case}: 항목 수 {baseline['cases'][case]['items']} → {results[case]['items']}")
+    if regressions:
+        print(f"\n[FAIL] 처리량이 기준 대비 {args.threshold:.0%} 넘게 떨어진 케이스:")
+        for case, current, expected in regressions:
+            print(f"  {case}: {current:.0f} 항목/초 (기대 {expected:.0f})")
+        return 1
+    print(f"\n[OK] 처리량 회귀 없음 (허용 하락 {args.threshold:.0%}, 기준 {len(baseline['cases'])}개 케이스)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
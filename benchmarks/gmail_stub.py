@@ -0,0 +1,302 @@
+# Gmail REST API 로컬 스텁
+# KAIFNewsletterParser를 실제 계정 없이 돌려 보기 위한 최소 구현:
+#   messages.list (q는 무시, maxResults/pageToken 페이지 처리), messages.get (format=full),
+#   messages.attachments.get, format=metadata, history.list (만료 시 404), getProfile,
+#   fields= 부분 응답, /batch (multipart/mixed)
+# 요청 수(왕복), 배치 요청 수, 배치 안의 호출 수, 응답 바이트를 집계
+# 사용: NEWSBOT_GMAIL_API_ENDPOINT=http://127.0.0.1:<port>/ 로 파서를 이 서버에 연결
+
+# -*- coding: utf-8 -*-
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+import base64
+import json
+import re
+import threading
+import time
+import uuid
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def parse_fields(mask):
+    """fields 마스크 'a,b/c,d(e,f)' → 중첩 dict ({이름: 하위 마스크 또는 None})"""
+    pos = 0
+
+    def parse_list():
+        nonlocal pos
+        tree = {}
+        while pos < len(mask):
+            m = re.match(r'[A-Za-z_*]+', mask[pos:])
+            if not m:
+                break
+            node = tree
+            name = m.group(0)
+            pos += len(name)
+            # a/b/c 경로
+            while pos < len(mask) and mask[pos] == '/':
+                # 이미 통째로 포함된 필드면 하위 경로는 의미 없음 (버리는 dict로 진행)
+                node = node.setdefault(name, {}) if node.get(name) is not None or name not in node else {}
+                pos += 1
+                name = re.match(r'[A-Za-z_*]+', mask[pos:]).group(0)
+                pos += len(name)
+            if pos < len(mask) and mask[pos] == '(':
+                pos += 1
+                sub = parse_list()
+                pos += 1  # ')'
+                _merge(node, name, sub)
+            else:
+                node[name] = None
+            if pos < len(mask) and mask[pos] == ',':
+                pos += 1
+                continue
+            break
+        return tree
+
+    return parse_list()
+
+
+def _merge(node, name, sub):
+    current = node.get(name)
+    if name in node and current is None:
+        return
+    node[name] = {**(current or {}), **sub}
+
+
+def apply_fields(value, tree):
+    """JSON 값에 fields 트리 적용 (리스트는 원소별로)"""
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [apply_fields(v, tree) for v in value]
+    if not isinstance(value, dict):
+        return value
+    out = {}
+    for name, sub in tree.items():
+        if name == '*':
+            return value
+        if name in value:
+            out[name] = apply_fields(value[name], sub)
+    return out
+
+
+class Mailbox:
+    """메일 id → Gmail message 리소스 (format=full 모양) + 첨부 데이터"""
+
+    def __init__(self):
+        self.messages = {}
+        self.attachments = {}
+        self.order = []       # 최신순
+        self.history_id = 1000
+        self.history = []     # [{'id', 'messagesAdded'}] (오래된 순)
+        self.oldest_history_id = 1000  # 이보다 작은 startHistoryId는 만료(404)
+
+    def add_newsletter(self, html, text=None, images=(), message_id=None,
+                       sender='KAIF <news@kaif.or.kr>', subject='[KAIF] 원자력 투데이뉴스', received=None):
+        """multipart/related [alternative [text/plain, text/html], 이미지...] 구조의 메일 추가"""
+        message_id = message_id or uuid.uuid4().hex[:16]
+        alternative = {
+            'partId': '0', 'mimeType': 'multipart/alternative', 'body': {'size': 0},
+            'parts': [
+                {'partId': '0.0', 'mimeType': 'text/plain', 'filename': '',
+                 'headers': [{'name': 'Content-Type', 'value': 'text/plain; charset=UTF-8'}],
+                 'body': self._inline(text or re.sub(r'<[^>]+>', ' ', html))},
+                {'partId': '0.1', 'mimeType': 'text/html', 'filename': '',
+                 'headers': [{'name': 'Content-Type', 'value': 'text/html; charset=UTF-8'}],
+                 'body': self._inline(html)},
+            ],
+        }
+        parts = [alternative]
+        for i, image in enumerate(images, 1):
+            attachment_id = f'att-{message_id}-{i}'
+            self.attachments[(message_id, attachment_id)] = image
+            parts.append({
+                'partId': str(i), 'mimeType': 'image/png', 'filename': f'image{i}.png',
+                'headers': [{'name': 'Content-Disposition', 'value': f'inline; filename="image{i}.png"'}],
+                'body': {'attachmentId': attachment_id, 'size': len(image)},
+            })
+        self.history_id += 1
+        self.messages[message_id] = {
+            'id': message_id,
+            'threadId': message_id,
+            'labelIds': ['INBOX', 'UNREAD'],
+            'snippet': '원자력 투데이뉴스',
+            'historyId': str(self.history_id),
+            'internalDate': str(int((received or 1776000000) * 1000)),
+            'sizeEstimate': len(html) * 2,
+            'payload': {
+                'partId': '', 'mimeType': 'multipart/related', 'filename': '',
+                'headers': [
+                    {'name': 'From', 'value': sender},
+                    {'name': 'Subject', 'value': subject},
+                ] + [{'name': f'X-Header-{i}', 'value': 'x' * 60} for i in range(30)],
+                'body': {'size': 0},
+                'parts': parts,
+            },
+        }
+        self.order.insert(0, message_id)
+        self.history.append({
+            'id': str(self.history_id),
+            'messagesAdded': [{'message': {'id': message_id, 'threadId': message_id, 'labelIds': ['INBOX']}}],
+        })
+        return message_id
+
+    def expire_history(self):
+        """지금까지의 history 기록을 만료 처리 (이전 historyId로 history.list 시 404)"""
+        self.oldest_history_id = self.history_id + 1
+        self.history = []
+
+    @staticmethod
+    def _inline(text):
+        data = text.encode('utf-8')
+        return {'size': len(data), 'data': _b64(data)}
+
+
+class GmailStub:
+    """스레드로 띄우는 스텁 서버 — with 블록 또는 start()/stop()"""
+
+    def __init__(self, mailbox, host='127.0.0.1', port=0, latency=0):
+        """latency: HTTP 요청(배치는 한 번)마다 응답 전에 기다릴 시간 (초, 네트워크 왕복 흉내)"""
+        self.mailbox = mailbox
+        self.latency = latency
+        self.stats = {'requests': 0, 'batches': 0, 'batched_calls': 0, 'bytes': 0}
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                status, body = stub.route('GET', self.path)
+                self._reply(status, 'application/json; charset=UTF-8', body)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = self.rfile.read(length)
+                if urlparse(self.path).path.rstrip('/') == '/batch':
+                    boundary, body = stub.batch(self.headers.get('Content-Type'), payload)
+                    self._reply(200, f'multipart/mixed; boundary={boundary}', body)
+                else:
+                    self._reply(404, 'application/json', b'{}')
+
+            def _reply(self, status, content_type, body):
+                if stub.latency:
+                    time.sleep(stub.latency)
+                with stub._lock:
+                    stub.stats['requests'] += 1
+                    stub.stats['bytes'] += len(body)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.endpoint = f'http://{host}:{self.server.server_port}/'
+        self._thread = None
+
+    def route(self, method, path):
+        """GET 경로 처리 — 반환: (상태 코드, 응답 바이트)"""
+        url = urlparse(path)
+        multi = parse_qs(url.query)
+        query = {k: v[0] for k, v in multi.items()}
+        parts = [unquote(p) for p in url.path.strip('/').split('/')]
+        # gmail/v1/users/{userId}/...
+        if parts[:3] != ['gmail', 'v1', 'users'] or len(parts) < 5:
+            return 404, b'{"error": {"code": 404}}'
+        rest = parts[4:]
+        mailbox = self.mailbox
+
+        if rest == ['messages']:
+            size = int(query.get('maxResults', 100))
+            start = int(query.get('pageToken', 0))
+            ids = mailbox.order[start:start + size]
+            result = {'messages': [{'id': i, 'threadId': i} for i in ids], 'resultSizeEstimate': len(mailbox.order)}
+            if start + size < len(mailbox.order):
+                result['nextPageToken'] = str(start + size)
+        elif len(rest) == 2 and rest[0] == 'messages' and rest[1] in mailbox.messages:
+            result = mailbox.messages[rest[1]]
+            if query.get('format') == 'metadata':
+                wanted = {h.lower() for h in multi.get('metadataHeaders', [])}
+                headers = result['payload']['headers']
+                result = dict(result, payload={
+                    'mimeType': result['payload']['mimeType'],
+                    'headers': [h for h in headers if not wanted or h['name'].lower() in wanted],
+                })
+        elif rest == ['history']:
+            start = int(query.get('startHistoryId', 0))
+            if start < mailbox.oldest_history_id:
+                return 404, b'{"error": {"code": 404, "message": "Requested entity was not found."}}'
+            records = [r for r in mailbox.history if int(r['id']) > start]
+            size = int(query.get('maxResults', 100))
+            offset = int(query.get('pageToken', 0))
+            result = {'history': records[offset:offset + size], 'historyId': str(mailbox.history_id)}
+            if offset + size < len(records):
+                result['nextPageToken'] = str(offset + size)
+        elif rest == ['profile']:
+            result = {'emailAddress': 'me@example.com', 'historyId': str(mailbox.history_id),
+                      'messagesTotal': len(mailbox.order)}
+        elif len(rest) == 4 and rest[0] == 'messages' and rest[2] == 'attachments':
+            data = mailbox.attachments.get((rest[1], rest[3]))
+            if data is None:
+                return 404, b'{"error": {"code": 404}}'
+            result = {'size': len(data), 'data': _b64(data)}
+        else:
+            return self.route_extra(rest, query)
+
+        if 'fields' in query:
+            result = apply_fields(result, parse_fields(query['fields']))
+        return 200, json.dumps(result, ensure_ascii=False).encode('utf-8')
+
+    def route_extra(self, rest, query):
+        """확장용 (기본은 404)"""
+        return 404, b'{"error": {"code": 404}}'
+
+    def batch(self, content_type, payload):
+        """multipart/mixed 배치 요청 → 각 파트를 route()로 처리해 multipart/mixed 응답"""
+        message = BytesParser(policy=HTTP).parsebytes(
+            f'Content-Type: {content_type}\r\n\r\n'.encode('utf-8') + payload
+        )
+        boundary = uuid.uuid4().hex
+        with self._lock:
+            self.stats['batches'] += 1
+        out = []
+        for part in message.iter_parts():
+            inner = part.get_payload(decode=True) or part.get_payload().encode('utf-8')
+            request_line = inner.decode('utf-8').split('\n', 1)[0].strip()
+            method, path, _ = request_line.split(' ', 2)
+            status, body = self.route(method, path)
+            content_id = part['Content-ID'].strip()
+            with self._lock:
+                self.stats['batched_calls'] += 1
+            out.append(
+                f'--{boundary}\r\nContent-Type: application/http\r\n'
+                f'Content-ID: <response-{content_id[1:-1]}>\r\n\r\n'
+                f'HTTP/1.1 {status} OK\r\nContent-Type: application/json; charset=UTF-8\r\n'
+                f'Content-Length: {len(body)}\r\n\r\n'.encode('utf-8') + body + b'\r\n'
+            )
+        return boundary, b''.join(out) + f'--{boundary}--\r\n'.encode('utf-8')
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {'requests': 0, 'batches': 0, 'batched_calls': 0, 'bytes': 0}
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
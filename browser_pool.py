@@ -0,0 +1,191 @@
+# 공유 헤드리스 Chrome 드라이버 풀
+# 크롤러마다 Chrome을 새로 띄우지 않고, 쉬고 있는 드라이버를 새 탭으로 다시 씀
+# (WebDriver 세션은 한 번에 한 창만 조작하므로 동시에 빌리는 크롤러마다 Chrome이 하나씩 뜸 — 최대 max_browsers개)
+
+# -*- coding: utf-8 -*-
+# selenium은 실제로 Chrome을 띄울 때 불러옴 (http_fetch가 USER_AGENT만 쓰는 HTTP/RSS 경로에서는 로드하지 않음)
+from contextlib import contextmanager
+from metrics import instrument_driver, span
+import cassette
+import os
+import shutil
+import tempfile
+import threading
+
+# WebDriver 명령 상한 — 페이지 로딩/스크립트가 멈춰도 driver.get()/execute_script()가 예외로 끝나도록
+# (소스별 타임아웃은 스레드를 멈추지 못하므로 실제 상한은 여기서 걸림)
+PAGE_LOAD_TIMEOUT = int(os.getenv('NEWSBOT_PAGE_LOAD_TIMEOUT', '60'))
+SCRIPT_TIMEOUT = 30
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+def build_chrome_options(profile_dir):
+    """크롤러 공통 헤드리스 Chrome 옵션"""
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_argument(f'--user-data-dir={profile_dir}')
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument(f'user-agent={USER_AGENT}')
+    return chrome_options
+
+
+class PoolClosed(Exception):
+    """close()한 풀에서 탭을 빌리려 함 (타임아웃으로 버려진 크롤러 스레드가 늦게 도착한 경우)"""
+
+
+class DriverPool:
+    """
+    헤드리스 Chrome 드라이버(세션) 풀 — 최대 max_browsers개
+    - 빌릴 때 쉬고 있는 드라이버가 있으면 새 탭을 열어 넘겨주고, 없으면 Chrome을 새로 띄움
+      (탭 재사용은 순차적으로만 — 동시에 빌린 크롤러는 각자 다른 Chrome을 씀)
+    - 동시에 빌려 가는 수는 max_browsers로 제한 (초과 요청은 대기)
+    - 프로필 디렉토리는 하나의 임시 루트 아래에 두고 close()에서 한 번에 정리
+    - close() 이후에는 탭을 빌려주지 않음 (PoolClosed) — 새 Chrome/프로필이 정리 후에 생기지 않도록
+    """
+
+    def __init__(self, max_browsers=2):
+        self.max_browsers = max_browsers
+        self._slots = threading.BoundedSemaphore(max_browsers)
+        self._lock = threading.Lock()
+        self._idle = []      # 사용 가능한 드라이버
+        self._drivers = []   # 풀이 띄운 전체 드라이버
+        self._profile_root = None
+        self._closed = False
+
+    def _launch(self):
+        with self._lock:
+            if self._closed:
+                raise PoolClosed('브라우저 풀이 이미 종료됨')
+            if self._profile_root is None:
+                self._profile_root = tempfile.mkdtemp(prefix='selenium_')
+            profile_root = self._profile_root
+            profile_dir = os.path.join(profile_root, f'profile{len(self._drivers)}')
+
+        # Selenium 4.6+ 자동 드라이버 관리 사용
+        from selenium import webdriver
+
+        with span('browser.launch'):
+            driver = webdriver.Chrome(options=build_chrome_options(profile_dir))
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(SCRIPT_TIMEOUT)
+        # 이 드라이버의 WebDriver 명령별 횟수/지연 기록
+        instrument_driver(driver)
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._drivers.append(driver)
+        if closed:
+            # 실행 중에 풀이 닫힘: 바로 종료하고 (이미 지워진 루트 아래의) 프로필도 정리
+            self._quit(driver)
+            shutil.rmtree(profile_root, ignore_errors=True)
+            raise PoolClosed('브라우저 풀이 이미 종료됨')
+        print(f"[DriverPool] Chrome 실행 ({len(self._drivers)}/{self.max_browsers})")
+        return driver
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except:
+            pass
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        self._quit(driver)
+
+    def _checkout(self):
+        """유휴 브라우저에 새 탭을 열어 반환, 없으면 새로 실행"""
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise PoolClosed('브라우저 풀이 이미 종료됨')
+                driver = self._idle.pop() if self._idle else None
+            if driver is None:
+                return self._launch()
+            try:
+                driver.switch_to.new_window('tab')
+                return driver
+            except Exception:
+                # 죽은 세션은 버리고 다음 후보로
+                self._discard(driver)
+
+    def _checkin(self, driver):
+        """탭을 닫고 첫 탭으로 돌아간 뒤 유휴 목록에 반환"""
+        try:
+            handles = driver.window_handles
+            if len(handles) > 1:
+                driver.close()
+                driver.switch_to.window(handles[0])
+        except Exception:
+            self._discard(driver)
+            return
+        with self._lock:
+            if not self._closed:
+                self._idle.append(driver)
+                return
+        self._quit(driver)
+
+    @contextmanager
+    def tab(self):
+        """브라우저 탭 하나를 빌려 쓰는 컨텍스트"""
+        self._slots.acquire()
+        try:
+            # 카세트 재생 모드: Chrome 없이 녹화된 페이지를 돌려주는 드라이버
+            if cassette.replaying():
+                yield cassette.replay_driver()
+                return
+            driver = self._checkout()
+            try:
+                yield cassette.wrap_driver(driver)
+            finally:
+                self._checkin(driver)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """
+        모든 브라우저 종료 및 프로필 디렉토리 정리
+        타임아웃으로 버려진 스레드가 아직 쓰는 드라이버도 종료 — 그 스레드의 WebDriver 호출은 예외로 끝남
+        """
+        with self._lock:
+            self._closed = True
+            drivers, self._drivers, self._idle = self._drivers, [], []
+            profile_root, self._profile_root = self._profile_root, None
+        for driver in drivers:
+            self._quit(driver)
+        if profile_root:
+            try:
+                shutil.rmtree(profile_root)
+            except:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@contextmanager
+def browser_tab(pool=None):
+    """
+    pool이 주어지면 풀에서 탭을 빌리고,
+    없으면 (단독 실행 시) 전용 브라우저를 띄웠다가 끝나면 정리
+    """
+    if pool is not None:
+        with pool.tab() as driver:
+            yield driver
+        return
+
+    with DriverPool(max_browsers=1) as own_pool:
+        with own_pool.tab() as driver:
+            yield driver
@@ -0,0 +1,354 @@
+# HTTP / Gmail API / 렌더링 페이지 녹화·재생 (카세트)
+# record: requests 세션 응답(RSS, 기사 목록, KAIF, Slack), Gmail API(httplib2) 응답,
+#         Selenium 크롤러가 읽은 page_source를 카세트 디렉토리에 저장
+# replay: 네트워크/Chrome/Gmail 인증 없이 저장된 응답을 돌려줌 (선택: 응답마다 지연 주입)
+# 같은 (메서드, URL) 요청이 여러 번이면 녹화 순서대로 재생 — Slack POST/Gmail 배치처럼 본문이 매번 달라도 순서로 매칭
+# Slack Webhook은 URL(비밀값) 대신 별칭 'slack-webhook'으로 저장
+# 사용: python main.py --record DIR / --replay DIR [--latency MS|recorded]
+#       (단독 실행 시 NEWSBOT_CASSETTE=record|replay, NEWSBOT_CASSETTE_DIR, NEWSBOT_REPLAY_LATENCY)
+
+# -*- coding: utf-8 -*-
+from collections import deque
+import io
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+INDEX_FILE = 'index.json'
+
+# 녹화 시 요청에서 빼는 헤더 — 조건부 GET이 304로 녹화되면 캐시 없는 재생에서 본문이 없으므로
+_CONDITIONAL_HEADERS = ('If-None-Match', 'If-Modified-Since')
+# 재생 응답에 남기지 않는 헤더 (본문은 이미 해제/결합된 상태로 저장)
+_DROP_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'set-cookie'}
+
+
+class CassetteMiss(Exception):
+    """재생할 녹화 응답이 없음"""
+
+
+def _key(method, url):
+    """요청 매칭 키"""
+    return f'{method.upper()} {url}'
+
+
+class Cassette:
+    """
+    카세트 디렉토리 하나 (index.json + 종류별 본문 파일)
+    interactions: [{kind, key, status, headers, body, elapsed_ms, error}] (녹화 순서)
+    kind: http(requests) / gmail(httplib2) / page(Selenium page_source)
+    latency: 재생 시 응답마다 기다릴 시간 — 숫자(ms) 또는 'recorded'(녹화 당시 응답 시간)
+    """
+
+    def __init__(self, directory, mode, latency=0):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f'알 수 없는 카세트 모드: {mode}')
+        self.directory = os.path.abspath(directory)
+        self.mode = mode
+        self.latency = latency if latency == 'recorded' else float(latency or 0)
+        self._lock = threading.Lock()
+        self.meta = {}
+        self.interactions = []
+        self.stats = {'recorded': 0, 'replayed': 0, 'missed': 0}
+        self._queues = {}
+        self._last = {}
+
+        if mode == 'record':
+            os.makedirs(self.directory, exist_ok=True)
+        else:
+            with open(os.path.join(self.directory, INDEX_FILE), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.meta = data.get('meta', {})
+            self.interactions = data.get('interactions', [])
+            for interaction in self.interactions:
+                self._queues.setdefault((interaction['kind'], interaction['key']), deque()).append(interaction)
+
+    # ---- 녹화 ----
+
+    def record(self, kind, key, status=None, headers=None, body=b'', elapsed_ms=0.0, error=None):
+        """응답(또는 연결 오류) 하나 저장 — 본문은 <kind>/<번호>.bin, 목록은 매번 index.json에 반영"""
+        with self._lock:
+            number = len(self.interactions) + 1
+            body_file = None
+            if error is None:
+                body_file = f'{kind}/{number:05d}.bin'
+                path = os.path.join(self.directory, body_file)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(body)
+            self.interactions.append({
+                'kind': kind, 'key': key, 'status': status,
+                'headers': {k: v for k, v in (headers or {}).items() if k.lower() not in _DROP_HEADERS},
+                'body': body_file, 'elapsed_ms': round(elapsed_ms, 1), 'error': error,
+            })
+            self.stats['recorded'] += 1
+            self._save_index()
+
+    def _save_index(self):
+        tmp_path = os.path.join(self.directory, INDEX_FILE + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'meta': self.meta, 'interactions': self.interactions}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, os.path.join(self.directory, INDEX_FILE))
+
+    def set_meta(self, **values):
+        with self._lock:
+            self.meta.update(values)
+            if self.mode == 'record':
+                self._save_index()
+
+    # ---- 재생 ----
+
+    def next(self, kind, key):
+        """
+        같은 키의 다음 녹화 응답 (녹화보다 더 많이 요청하면 마지막 응답을 반복)
+        반환: (interaction, 본문 bytes) — 녹화가 없으면 CassetteMiss
+        """
+        with self._lock:
+            queue = self._queues.get((kind, key))
+            if queue:
+                interaction = queue.popleft()
+                self._last[(kind, key)] = interaction
+            else:
+                interaction = self._last.get((kind, key))
+            if interaction is None:
+                self.stats['missed'] += 1
+                raise CassetteMiss(f'녹화된 응답 없음: {kind} {key}')
+            self.stats['replayed'] += 1
+        body = b''
+        if interaction.get('body'):
+            with open(os.path.join(self.directory, interaction['body']), 'rb') as f:
+                body = f.read()
+        self._wait(interaction)
+        return interaction, body
+
+    def _wait(self, interaction):
+        delay = interaction.get('elapsed_ms', 0) if self.latency == 'recorded' else self.latency
+        if delay:
+            time.sleep(delay / 1000)
+
+    def report(self):
+        print(f"[Cassette] {self.mode} {self.directory}: 녹화 {self.stats['recorded']} / "
+              f"재생 {self.stats['replayed']} / 없음 {self.stats['missed']}")
+
+
+_ACTIVE = None
+_SESSIONS = []   # [(세션, 별칭)]
+
+
+def configure(mode=None, directory=None, latency=None):
+    """
+    카세트 모드 설정 (mode가 비면 해제) — 이미 만들어진 세션에도 어댑터를 붙임
+    반환: Cassette 또는 None
+    """
+    global _ACTIVE
+    _ACTIVE = Cassette(directory, mode, latency or 0) if mode else None
+    for session, alias in _SESSIONS:
+        _mount(session, alias)
+    return _ACTIVE
+
+
+def active():
+    return _ACTIVE
+
+
+def replaying():
+    return _ACTIVE is not None and _ACTIVE.mode == 'replay'
+
+
+# ---- requests ----
+
+class CassetteAdapter(HTTPAdapter):
+    """requests 전송 어댑터 — 녹화는 원래 어댑터로 보내고 저장, 재생은 저장된 응답으로 Response 생성"""
+
+    def __init__(self, cassette, inner, alias=None):
+        super().__init__()
+        self.cassette = cassette
+        self.inner = inner
+        self.alias = alias
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = _key(request.method, self.alias or request.url)
+        if self.cassette.mode == 'replay':
+            try:
+                interaction, body = self.cassette.next('http', key)
+            except CassetteMiss as e:
+                raise requests.ConnectionError(str(e), request=request)
+            if interaction.get('error'):
+                raise requests.ConnectionError(interaction['error'], request=request)
+            return self._build(request, interaction['status'], interaction['headers'], body)
+
+        for header in _CONDITIONAL_HEADERS:
+            request.headers.pop(header, None)
+        started = time.perf_counter()
+        try:
+            resp = self.inner.send(request, stream=False, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+            body = resp.content
+        except requests.RequestException as e:
+            self.cassette.record('http', key, elapsed_ms=(time.perf_counter() - started) * 1000, error=str(e))
+            raise
+        self.cassette.record('http', key, resp.status_code, dict(resp.headers), body,
+                             (time.perf_counter() - started) * 1000)
+        return self._build(request, resp.status_code, dict(resp.headers), body)
+
+    def _build(self, request, status, headers, body):
+        headers = {k: v for k, v in headers.items() if k.lower() not in _DROP_HEADERS}
+        headers['Content-Length'] = str(len(body))
+        raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status,
+                           preload_content=False, decode_content=False)
+        return self.build_response(request, raw)
+
+    def close(self):
+        self.inner.close()
+        super().close()
+
+
+def _mount(session, alias=None):
+    for prefix in ('https://', 'http://'):
+        adapter = session.adapters.get(prefix)
+        inner = adapter.inner if isinstance(adapter, CassetteAdapter) else adapter
+        if _ACTIVE is None:
+            if inner is not adapter:
+                session.mount(prefix, inner)
+        else:
+            session.mount(prefix, CassetteAdapter(_ACTIVE, inner or HTTPAdapter(), alias))
+
+
+def install_session(session, alias=None):
+    """
+    세션 등록 — 카세트 모드면 녹화/재생 어댑터를 붙이고, 나중에 configure()해도 반영
+    alias: URL 대신 매칭 키로 쓸 이름 (Slack Webhook처럼 URL 자체가 비밀값이거나 실행마다 다른 경우)
+    """
+    _SESSIONS.append((session, alias))
+    _mount(session, alias)
+    return session
+
+
+# ---- Gmail API (httplib2) ----
+
+class RecordingHttp:
+    """httplib2 호환 객체 — 실제 요청 후 응답을 녹화 (그 외 속성은 원래 객체로 위임)"""
+
+    def __init__(self, cassette, http):
+        self.cassette = cassette
+        self.http = http
+
+    def request(self, uri, method='GET', body=None, headers=None, *args, **kwargs):
+        started = time.perf_counter()
+        resp, content = self.http.request(uri, method, body=body, headers=headers, *args, **kwargs)
+        headers_out = {k: v for k, v in resp.items() if k != 'status'}
+        self.cassette.record('gmail', _key(method, uri), resp.status, headers_out, content,
+                             (time.perf_counter() - started) * 1000)
+        return resp, content
+
+    def __getattr__(self, name):
+        return getattr(self.http, name)
+
+
+class ReplayHttp:
+    """httplib2 호환 객체 — 녹화된 Gmail API 응답을 순서대로 반환 (인증/네트워크 없음)"""
+
+    def __init__(self, cassette):
+        self.cassette = cassette
+
+    def request(self, uri, method='GET', body=None, headers=None, *args, **kwargs):
+        import httplib2
+        try:
+            interaction, content = self.cassette.next('gmail', _key(method, uri))
+        except CassetteMiss as e:
+            raise httplib2.HttpLib2Error(str(e))
+        return httplib2.Response(dict(interaction['headers'], status=str(interaction['status']))), content
+
+    def close(self):
+        pass
+
+
+def gmail_http(credentials=None, timeout=None):
+    """카세트 모드용 Gmail API http 객체 (모드가 아니면 None — 평소대로 build_from_document가 생성)"""
+    if _ACTIVE is None:
+        return None
+    if _ACTIVE.mode == 'replay':
+        return ReplayHttp(_ACTIVE)
+    import httplib2
+    http = httplib2.Http(timeout=timeout)
+    if credentials is not None:
+        import google_auth_httplib2
+        http = google_auth_httplib2.AuthorizedHttp(credentials, http=http)
+    return RecordingHttp(_ACTIVE, http)
+
+
+# ---- Selenium 렌더링 페이지 ----
+
+class RecordingDriver:
+    """WebDriver 프록시 — get()한 URL별로 읽어 간 page_source를 녹화 (나머지는 원래 드라이버로 위임)"""
+
+    def __init__(self, cassette, driver):
+        self._cassette = cassette
+        self._driver = driver
+        self._url = None
+        self._started = None
+
+    def get(self, url):
+        self._url = url
+        self._started = time.perf_counter()
+        return self._driver.get(url)
+
+    @property
+    def page_source(self):
+        html = self._driver.page_source
+        if self._url:
+            self._cassette.record('page', _key('GET', self._url), 200, {}, html.encode('utf-8'),
+                                  (time.perf_counter() - self._started) * 1000)
+        return html
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+class ReplayDriver:
+    """
+    녹화된 page_source를 돌려주는 가짜 WebDriver (Chrome 없음)
+    readyState 확인 스크립트는 항상 준비 완료, 요소 단위 조회(webdriver 파싱 모드)는 지원하지 않음
+    """
+
+    def __init__(self, cassette):
+        self._cassette = cassette
+        self._html = ''
+        self.current_url = None
+
+    def get(self, url):
+        interaction, body = self._cassette.next('page', _key('GET', url))
+        self.current_url = url
+        self._html = body.decode('utf-8')
+
+    @property
+    def page_source(self):
+        return self._html
+
+    def execute_script(self, script, *args):
+        return True
+
+    def find_element(self, *args, **kwargs):
+        raise CassetteMiss('재생 모드는 snapshot 파싱만 지원합니다 (NEWSBOT_PARSE_MODE=snapshot)')
+
+    find_elements = find_element
+
+
+def wrap_driver(driver):
+    """녹화 모드면 page_source를 녹화하는 프록시, 아니면 그대로"""
+    if _ACTIVE is not None and _ACTIVE.mode == 'record':
+        return RecordingDriver(_ACTIVE, driver)
+    return driver
+
+
+def replay_driver():
+    return ReplayDriver(_ACTIVE)
+
+
+# 단독 실행(크롤러 모듈 직접 실행 등)용 환경 변수 설정
+if os.getenv('NEWSBOT_CASSETTE'):
+    configure(os.getenv('NEWSBOT_CASSETTE'), os.getenv('NEWSBOT_CASSETTE_DIR', 'cassettes/default'),
+              os.getenv('NEWSBOT_REPLAY_LATENCY', '0'))
@@ -0,0 +1,102 @@
+# 크롤링 결과 전달 객체
+# crawl_all_news → create_today_summary / Slack 포맷팅으로 메모리에서 바로 넘김
+# (소스별 JSON 파일을 다시 읽지 않으므로 이번 실행에서 실패한 소스의 지난 파일이 섞이지 않음)
+# 파일에서 읽는 경로(from_files)는 저장된 결과로 전송만 하는 --slack-only 용
+
+# -*- coding: utf-8 -*-
+import json
+
+from news_dates import now_kst
+
+# 소스 키 → (결과 파일, 파일 안의 목록 키)
+SOURCE_FILES = {
+    'energy_news': ('energy_news_data.json', 'news_list'),
+    'knpnews': ('knpnews_data.json', 'news_list'),
+    'kaif': ('kaif_data.json', 'posts'),
+    'kaif_newsletter': ('kaif_newsletter_data.json', 'items'),
+}
+ALL_NEWS_FILE = 'all_news_data.json'
+
+
+class CrawlResult:
+    """
+    한 번의 크롤링 결과
+    energy_news / knp_news: 소스별 기사 리스트 (각 기사에 'source' 필드 보장)
+    kaif_posts: KAIF 게시판 어제 게시물, newsletter_items: KAIF 뉴스레터 항목
+    failed: 실패/타임아웃으로 빈 결과가 된 소스 키
+    """
+
+    def __init__(self, energy_news=None, knp_news=None, kaif_posts=None, newsletter_items=None,
+                 failed=(), crawled_at=None):
+        self.energy_news = _with_source(energy_news, 'energy_news')
+        self.knp_news = _with_source(knp_news, 'knpnews')
+        self.kaif_posts = list(kaif_posts or [])
+        self.newsletter_items = list(newsletter_items or [])
+        self.failed = set(failed)
+        self.crawled_at = crawled_at or now_kst()
+
+    @classmethod
+    def from_sources(cls, results, failed=()):
+        """run_sources() 결과 {소스 키: 리스트} → CrawlResult (없는 소스는 빈 리스트)"""
+        return cls(
+            energy_news=results.get('energy_news'),
+            knp_news=results.get('knpnews'),
+            kaif_posts=results.get('kaif'),
+            newsletter_items=results.get('kaif_newsletter'),
+            failed=failed,
+        )
+
+    @classmethod
+    def from_files(cls):
+        """
+        지난 실행이 저장한 소스별 JSON에서 읽기 (--slack-only)
+        파일이 없거나 깨진 소스는 빈 리스트로 두고 이유를 출력
+        """
+        loaded, failed = {}, []
+        for key, (path, list_key) in SOURCE_FILES.items():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    loaded[key] = json.load(f).get(list_key, [])
+            except FileNotFoundError:
+                print(f"[SKIP] {path} 없음 — {key} 결과 없이 진행")
+                failed.append(key)
+            except (OSError, ValueError, AttributeError) as e:
+                print(f"[SKIP] {path} 읽기 실패 ({e.__class__.__name__}: {e}) — {key} 결과 없이 진행")
+                failed.append(key)
+            else:
+                print(f"[OK] {path}에서 {len(loaded[key])}개 로드")
+        return cls.from_sources(loaded, failed)
+
+    @property
+    def news(self):
+        """일반 기사 (에너지신문 → 한국원자력산업신문 순)"""
+        return self.energy_news + self.knp_news
+
+    def counts(self):
+        return {
+            'energy_news': len(self.energy_news),
+            'knpnews': len(self.knp_news),
+            'kaif': len(self.kaif_posts),
+            'kaif_newsletter': len(self.newsletter_items),
+        }
+
+    def to_dict(self):
+        """all_news_data.json 형식"""
+        news = self.news
+        return {
+            'crawled_at': self.crawled_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'total_count': len(news),
+            'kaif_posts_count': len(self.kaif_posts),
+            'sources': self.counts(),
+            'failed_sources': sorted(self.failed),
+            'news_list': news,
+            'kaif_posts': self.kaif_posts,
+        }
+
+
+def _with_source(items, source):
+    """기사 리스트 복사 + 'source' 필드가 없는 기사에 소스 키 기록 (브라우저 경로 크롤러는 넣지 않음)"""
+    items = list(items or [])
+    for item in items:
+        item.setdefault('source', source)
+    return items
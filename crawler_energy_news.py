@@ -1,179 +1,215 @@
 # 에너지신문 크롤링 파일
 
 # -*- coding: utf-8 -*-
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-import json
-import time
-import tempfile
-import shutil
-
-def crawl_energy_news(url):
+from browser_pool import browser_tab
+from page_wait import wait_for_ready
+from snapshot_parser import PARSE_MODE, parse_article_list, timed_parse
+from http_fetch import fetch_with_fallback, record_path
+from keyword_matcher import get_matcher
+from json_sink import SINK
+from metrics import span
+
+# 뉴스 리스트 선택자 (fallback 포함, 앞에서부터 시도)
+LIST_SELECTORS = [
+    '#section-list ul.type2',
+    '#section-list ul',
+    '.type2',
+    'ul.type2',
+    '#article-list ul',
+    '.article-list ul',
+]
+MIN_LIST_ITEMS = 3
+
+
+def crawl_energy_news(url, pool=None, parse_mode=PARSE_MODE):
     """
     에너지데일리 뉴스 크롤링
+    HTTP로 받은 정적 HTML을 먼저 파싱하고, 목록이 없을 때만 브라우저 사용
+    pool: 공유 DriverPool (없으면 필요할 때 전용 Chrome을 띄웠다가 정리)
+    parse_mode: snapshot / webdriver / compare (snapshot_parser.PARSE_MODE 참고)
     """
-    # 임시 디렉토리 생성
-    temp_dir = tempfile.mkdtemp(prefix='selenium_')
-
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-    chrome_options.add_argument(f'--user-data-dir={temp_dir}')  # 임시 디렉토리 지정
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-
-    # Selenium 4.6+ 자동 드라이버 관리 사용
-    driver = webdriver.Chrome(options=chrome_options)
-
     try:
-        print(f"페이지 로딩 중: {url}")
-        driver.get(url)
-        time.sleep(5)
+        def render():
+            with browser_tab(pool) as driver:
+                return _load_with_browser(driver, url, parse_mode)
+
+        if parse_mode == 'snapshot':
+            page_source, all_news, _ = fetch_with_fallback(
+                'energy_news', url,
+                lambda html: timed_parse('energy_news', parse_mode, lambda: _parse_list_snapshot(html, url), None),
+                render,
+            )
+        else:
+            # webdriver/compare 모드는 브라우저 DOM이 있어야 함
+            page_source, all_news = render()
+            record_path('energy_news', 'selenium')
+
+        with span('energy_news.save'):
+            return _save_results(url, page_source, all_news)
 
-        # 디버그: 페이지 소스 저장
-        with open('energy_news_page_source.html', 'w', encoding='utf-8') as f:
-            f.write(driver.page_source)
-
-        # 뉴스 리스트 찾기 (fallback 선택자 포함)
-        news_list = None
-        possible_selectors = [
-            '#section-list ul.type2',
-            '#section-list ul',
-            '.type2',
-            'ul.type2',
-            '#article-list ul',
-            '.article-list ul',
-        ]
-        for selector in possible_selectors:
-            try:
-                elem = driver.find_element(By.CSS_SELECTOR, selector)
-                items = elem.find_elements(By.TAG_NAME, 'li')
-                if len(items) >= 3:
-                    news_list = elem
-                    print(f"[OK] 선택자 적용: {selector} ({len(items)}개)")
-                    break
-            except:
-                continue
+    except Exception as e:
+        print(f"오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        return []
 
-        if not news_list:
-            raise Exception("뉴스 리스트를 찾을 수 없습니다. energy_news_page_source.html 확인 필요")
 
-        news_items = news_list.find_elements(By.TAG_NAME, 'li')
+def _parse_list_webdriver(driver):
+    """기존 방식: 항목마다 WebDriver 호출로 파싱 (목록을 못 찾으면 None)"""
+    # 뉴스 리스트 찾기 (fallback 선택자 포함)
+    news_list = None
+    for selector in LIST_SELECTORS:
+        try:
+            elem = driver.find_element(By.CSS_SELECTOR, selector)
+            items = elem.find_elements(By.TAG_NAME, 'li')
+            if len(items) >= MIN_LIST_ITEMS:
+                news_list = elem
+                print(f"[OK] 선택자 적용: {selector} ({len(items)}개)")
+                break
+        except:
+            continue
 
-        print(f"\n총 {len(news_items)}개의 뉴스 발견\n")
-        print("="*100)
+    if not news_list:
+        return None
 
-        all_news = []
+    all_news = []
+    for idx, item in enumerate(news_list.find_elements(By.TAG_NAME, 'li'), 1):
+        news_data = {}
 
-        for idx, item in enumerate(news_items, 1):
-            news_data = {}
+        try:
+            # 썸네일 이미지
+            try:
+                img = item.find_element(By.CSS_SELECTOR, 'a.thumb img')
+                news_data['thumbnail'] = img.get_attribute('src')
+            except:
+                news_data['thumbnail'] = None
 
+            # 제목 및 URL
             try:
-                # 썸네일 이미지
-                try:
-                    img = item.find_element(By.CSS_SELECTOR, 'a.thumb img')
-                    news_data['thumbnail'] = img.get_attribute('src')
-                except:
-                    news_data['thumbnail'] = None
+                title_elem = item.find_element(By.CSS_SELECTOR, 'h2.titles a')
+                news_data['title'] = title_elem.text.strip()
+                news_data['url'] = title_elem.get_attribute('href')
+            except:
+                news_data['title'] = None
+                news_data['url'] = None
 
-                # 제목 및 URL
-                try:
-                    title_elem = item.find_element(By.CSS_SELECTOR, 'h2.titles a')
-                    news_data['title'] = title_elem.text.strip()
-                    news_data['url'] = title_elem.get_attribute('href')
-                except:
-                    news_data['title'] = None
-                    news_data['url'] = None
+            # 본문 미리보기
+            try:
+                news_data['preview'] = item.find_element(By.CSS_SELECTOR, 'p.lead a').text.strip()
+            except:
+                news_data['preview'] = None
 
-                # 본문 미리보기
+            # 메타 정보 — type2: span.byline > em [카테고리, 기자, 날짜]
+            #             type1: em.info.category / em.info.name / em.info.dated
+            try:
+                byline = item.find_element(By.CSS_SELECTOR, 'span.byline')
+                ems = byline.find_elements(By.TAG_NAME, 'em')
+                news_data['category'] = ems[0].text.strip() if len(ems) >= 1 else None
+                news_data['reporter'] = ems[1].text.strip() if len(ems) >= 2 else None
+                news_data['date']     = ems[2].text.strip() if len(ems) >= 3 else None
+            except:
+                # type1 fallback
                 try:
-                    news_data['preview'] = item.find_element(By.CSS_SELECTOR, 'p.lead a').text.strip()
+                    news_data['category'] = item.find_element(By.CSS_SELECTOR, 'em.info.category').text.strip()
                 except:
-                    news_data['preview'] = None
-
-                # 메타 정보 — type2: span.byline > em [카테고리, 기자, 날짜]
-                #             type1: em.info.category / em.info.name / em.info.dated
+                    news_data['category'] = None
                 try:
-                    byline = item.find_element(By.CSS_SELECTOR, 'span.byline')
-                    ems = byline.find_elements(By.TAG_NAME, 'em')
-                    news_data['category'] = ems[0].text.strip() if len(ems) >= 1 else None
-                    news_data['reporter'] = ems[1].text.strip() if len(ems) >= 2 else None
-                    news_data['date']     = ems[2].text.strip() if len(ems) >= 3 else None
+                    news_data['reporter'] = item.find_element(By.CSS_SELECTOR, 'em.info.name').text.strip()
                 except:
-                    # type1 fallback
-                    try:
-                        news_data['category'] = item.find_element(By.CSS_SELECTOR, 'em.info.category').text.strip()
-                    except:
-                        news_data['category'] = None
-                    try:
-                        news_data['reporter'] = item.find_element(By.CSS_SELECTOR, 'em.info.name').text.strip()
-                    except:
-                        news_data['reporter'] = None
-                    try:
-                        news_data['date'] = item.find_element(By.CSS_SELECTOR, 'em.info.dated').text.strip()
-                    except:
-                        news_data['date'] = None
-
-                all_news.append(news_data)
-
-                # 출력
+                    news_data['reporter'] = None
                 try:
-                    print(f"[{idx}] {news_data['title']}")
-                    print(f"    URL: {news_data['url']}")
-                    print(f"    카테고리: {news_data['category']}")
-                    print(f"    기자: {news_data['reporter']}")
-                    print(f"    날짜: {news_data['date']}")
-                    print(f"    썸네일: {news_data['thumbnail']}")
-                    print(f"    미리보기: {news_data['preview'][:100]}..." if news_data['preview'] else "    미리보기: None")
-                    print("-"*100)
-                except UnicodeEncodeError:
-                    title_safe = news_data['title'].encode('cp949', errors='replace').decode('cp949')
-                    print(f"[{idx}] {title_safe} (일부 문자 대체)")
-                    print("-"*100)
-
-            except Exception as e:
-                print(f"항목 {idx} 파싱 오류: {e}")
-
-        # 전력·원자력 카테고리만 필터링
-        # (페이지가 JS 클라이언트 필터링 구조라 전체 기사가 로딩됨)
-        nuclear_news = [
-            n for n in all_news
-            if n.get('category') and '원자력' in n['category']
-        ]
-        print(f"\n전력·원자력 필터링: {len(all_news)}개 → {len(nuclear_news)}개")
-
-        # JSON 파일로 저장
-        output_file = 'energy_news_data.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'source': 'energy_news',
-                'url': url,
-                'total_count': len(nuclear_news),
-                'news_list': nuclear_news
-            }, f, ensure_ascii=False, indent=2)
-
-        print("="*100)
-        print(f"[OK] {len(nuclear_news)}개의 뉴스 데이터가 '{output_file}' 파일에 저장되었습니다.")
-
-        return nuclear_news
+                    news_data['date'] = item.find_element(By.CSS_SELECTOR, 'em.info.dated').text.strip()
+                except:
+                    news_data['date'] = None
 
-    except Exception as e:
-        print(f"오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
-        return []
+            all_news.append(news_data)
+
+        except Exception as e:
+            print(f"항목 {idx} 파싱 오류: {e}")
 
-    finally:
-        driver.quit()
-        # 임시 디렉토리 정리
+    return all_news
+
+
+def _parse_list_snapshot(page_source, url):
+    """스냅샷 방식: page_source 한 번으로 lxml 파싱 (목록을 못 찾으면 None)"""
+    selector, all_news = parse_article_list(page_source, url, LIST_SELECTORS, MIN_LIST_ITEMS, container=True)
+    if not selector:
+        return None
+    print(f"[OK] 선택자 적용: {selector} ({len(all_news)}개)")
+    return all_news
+
+
+def _load_with_browser(driver, url, parse_mode):
+    """브라우저로 목록 페이지 로딩 후 파싱 — (page_source, 기사 리스트 또는 None)"""
+    print(f"페이지 로딩 중: {url}")
+    with span('energy_news.load'):
+        driver.get(url)
+        wait_for_ready(driver, 'energy_news', [f'{sel} li' for sel in LIST_SELECTORS], MIN_LIST_ITEMS)
+
+    # 페이지 소스 스냅샷 (파싱 + 디버그 저장에 같이 사용)
+    page_source = driver.page_source
+    all_news = timed_parse(
+        'energy_news', parse_mode,
+        # compare 모드는 webdriver 결과와 비교하므로 전체 목록 파싱
+        lambda: _parse_list_snapshot(page_source, url),
+        lambda: _parse_list_webdriver(driver),
+    )
+    return page_source, all_news
+
+
+def _save_results(url, page_source, all_news):
+    """파싱 결과 출력 + 전력·원자력 필터링 + JSON 저장"""
+    # 디버그: 페이지 소스 저장
+    if page_source is not None:
+        with open('energy_news_page_source.html', 'w', encoding='utf-8') as f:
+            f.write(page_source)
+
+    if all_news is None:
+        raise Exception("뉴스 리스트를 찾을 수 없습니다. energy_news_page_source.html 확인 필요")
+
+    print(f"\n총 {len(all_news)}개의 뉴스 발견\n")
+    print("="*100)
+
+    for idx, news_data in enumerate(all_news, 1):
         try:
-            shutil.rmtree(temp_dir)
-        except:
-            pass
+            print(f"[{idx}] {news_data['title']}")
+            print(f"    URL: {news_data['url']}")
+            print(f"    카테고리: {news_data['category']}")
+            print(f"    기자: {news_data['reporter']}")
+            print(f"    날짜: {news_data['date']}")
+            print(f"    썸네일: {news_data['thumbnail']}")
+            print(f"    미리보기: {news_data['preview'][:100]}..." if news_data['preview'] else "    미리보기: None")
+            print("-"*100)
+        except UnicodeEncodeError:
+            title_safe = news_data['title'].encode('cp949', errors='replace').decode('cp949')
+            print(f"[{idx}] {title_safe} (일부 문자 대체)")
+            print("-"*100)
+
+    # 전력·원자력 카테고리만 필터링
+    # (페이지가 JS 클라이언트 필터링 구조라 전체 기사가 로딩됨)
+    nuclear_news = [
+        n for n in all_news
+        if n.get('category') and '원자력' in n['category']
+    ]
+    # 제목/미리보기에 나온 원자력 키워드 기록
+    get_matcher().tag(nuclear_news)
+    print(f"\n전력·원자력 필터링: {len(all_news)}개 → {len(nuclear_news)}개")
+
+    # JSON 파일로 저장 (백그라운드 기록 — 결과는 반환값으로 바로 다음 단계에 전달)
+    output_file = 'energy_news_data.json'
+    saved = SINK.write(output_file, {
+        'source': 'energy_news',
+        'url': url,
+        'total_count': len(nuclear_news),
+        'news_list': nuclear_news
+    })
+
+    print("="*100)
+    if saved:
+        print(f"[OK] {len(nuclear_news)}개의 뉴스 데이터를 '{output_file}' 파일에 저장합니다.")
+
+    return nuclear_news
 
 
 if __name__ == "__main__":
@@ -1,340 +1,385 @@
 # 한국원자력산업회의 크롤링 파일
 
 # -*- coding: utf-8 -*-
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
+from browser_pool import DriverPool
+from page_wait import wait_for_ready
+from multi_matcher import AhoCorasick
+from snapshot_parser import css, element_text, element_url, find_list_items, first, inner_text, load_html
+from http_fetch import fetch_html, fetch_with_fallback, record_path
+from news_dates import now_kst, parse_news_date
+from seen_store import get_store
+from json_sink import SINK
+from metrics import span
+from concurrent.futures import ThreadPoolExecutor
 import json
-import time
-import tempfile
-import shutil
-from datetime import datetime
+import os
 
-def parse_news_table(driver):
+# 게시판 목록 선택자 (fallback 포함, 앞에서부터 시도)
+BOARD_SELECTORS = [
+    "table tbody tr",
+    "div.board-list table tr",
+    "table.board-list tr",
+    ".list-item",
+    "div.list tbody tr",
+]
+MIN_BOARD_ITEMS = 4  # 3개 초과
+
+# 상세 페이지 선택자
+DETAIL_TITLE_SELECTOR = 'h3.bbs-view-tit, h1, .view-title, .subject'
+# (범용 .content는 JS 렌더링 전 껍데기에도 있어 브라우저 재시도가 막히므로 쓰지 않음)
+DETAIL_CONTENT_SELECTOR = '#bbsContents, .bbs-view-content, .view-content'
+
+# 상세 페이지 병렬 수집 설정
+DETAIL_WORKERS = 4
+DETAIL_CACHE_FILE = 'kaif_detail_cache.json'
+
+
+SECTION_KEYS = ('domestic', 'international', 'editorial', 'nuclear_news')
+
+
+def build_link_index(links):
+    """
+    (링크 텍스트, href) 목록 → 텍스트별 첫 외부 링크 인덱스 + 다중 패턴 매처
+    본문 줄에는 링크 텍스트 뒤에 언론사명이 붙으므로 '포함' 관계로 매칭
+    반환: (패턴 목록 [(문서 내 순서, href)], AhoCorasick)
     """
-    국내외 뉴스 테이블 데이터 파싱
+    index = {}
+    for order, (text, href) in enumerate(links):
+        if not text or not href:
+            continue
+        if 'http://' not in href and 'https://' not in href:
+            continue
+        # 같은 텍스트는 문서상 먼저 나온 링크 우선
+        index.setdefault(text, (order, href))
+    texts = list(index)
+    return [index[t] for t in texts], AhoCorasick(texts)
+
+
+def match_news_lines(full_text, links):
     """
-    news_data = {
-        'domestic': [],
-        'international': [],
-        'editorial': [],
-        'nuclear_news': []
+    본문 텍스트를 줄 단위로 훑어 섹션 구분 + '·' 항목을 링크 인덱스로 매칭
+    한 줄에 여러 링크 텍스트가 포함되면 문서상 먼저 나온 링크 사용 (기존 링크 순회와 같은 결과)
+    """
+    news_data = {key: [] for key in SECTION_KEYS}
+    entries, matcher = build_link_index(links)
+    current_section = None
+
+    for line in full_text.split('\n'):
+        line = line.strip()
+
+        # 섹션 헤더 감지
+        if '국내기사' in line or '국내 기사' in line:
+            current_section = 'domestic'
+            continue
+        elif '세계기사' in line or '세계 기사' in line or '국제기사' in line:
+            current_section = 'international'
+            continue
+        elif '사설' in line or '칼럼' in line or '기고' in line:
+            current_section = 'editorial'
+            continue
+        elif '원자력계 소식' in line:
+            current_section = 'nuclear_news'
+            continue
+
+        # 뉴스 아이템 파싱 (· 로 시작하는 줄)
+        if not line.startswith('·'):
+            continue
+        line = line[1:].strip()
+
+        hits = matcher.matched(line)
+        if not hits:
+            continue
+        _, link_url = min(entries[i] for i in hits)
+
+        # 제목과 언론사 분리
+        parts = line.rsplit(' ', 1)
+        if len(parts) == 2:
+            article_title = parts[0]
+            source = parts[1]
+        else:
+            article_title = line
+            source = None
+
+        if current_section in news_data:
+            news_data[current_section].append({
+                'title': article_title,
+                'source': source,
+                'url': link_url
+            })
+
+    return news_data
+
+
+def _post_meta(doc, post_url):
+    """첨부파일 / 작성자 / 조회수"""
+    return {
+        'attachments': [
+            {'filename': element_text(a), 'url': element_url(a, 'href', post_url)}
+            for a in css('.attach a, .file a, .attachment a')(doc)
+        ],
+        'author': element_text(first(doc, '.author, .writer, .name')),
+        'views': element_text(first(doc, '.views, .hit, .count')),
     }
 
+
+def parse_detail_page(page_source, post_url, require_content=True):
+    """
+    상세 페이지 HTML 파싱 (제목 / 본문 / 국내외 뉴스 테이블)
+    본문 선택자가 없으면 None — JS 렌더링이 필요한 페이지로 보고 브라우저로 재시도
+    require_content=False(브라우저로 렌더링한 페이지)면 본문 없이 content=None으로 게시물 유지
+    """
+    doc = load_html(page_source, post_url)
+    content_elem = first(doc, DETAIL_CONTENT_SELECTOR)
+    detail_title = first(doc, DETAIL_TITLE_SELECTOR)
+    if content_elem is None:
+        if require_content:
+            return None
+        print(f"[SKIP] 본문을 찾지 못해 본문 없이 저장: {post_url}")
+        detail = {
+            'detail_title': element_text(detail_title) if detail_title is not None else None,
+            'content': None,
+            'news_links': {key: [] for key in SECTION_KEYS},
+        }
+        detail.update(_post_meta(doc, post_url))
+        return detail
+
+    detail = {}
     try:
-        # bbsContents 안의 모든 td 찾기
-        content_elem = driver.find_element(By.CSS_SELECTOR, '#bbsContents')
+        # 제목
+        detail['detail_title'] = element_text(detail_title) if detail_title is not None else None
 
-        # 모든 링크 찾기
-        all_links = content_elem.find_elements(By.TAG_NAME, 'a')
+        # 본문 내용
+        detail['content'] = inner_text(content_elem)
 
-        current_section = None
+        # 국내외 뉴스 테이블 파싱
+        bbs_contents = first(doc, '#bbsContents')
+        if bbs_contents is not None:
+            links = [(element_text(a), element_url(a, 'href', post_url)) for a in bbs_contents.iter('a')]
+            detail['news_links'] = match_news_lines(inner_text(bbs_contents), links)
+        else:
+            detail['news_links'] = {key: [] for key in SECTION_KEYS}
 
-        for link in all_links:
-            link_text = link.text.strip()
-            link_url = link.get_attribute('href')
+    except Exception as e:
+        print(f"상세 내용 파싱 오류: {e}")
+        detail.update(_post_meta(doc, post_url))
 
-            # 섹션 구분
-            if not link_url or 'kaif.or.kr' in link_url:
-                continue
+    return detail
 
-            # 빈 텍스트 제외
-            if not link_text:
-                continue
 
-            # 뉴스 기사인지 확인 (외부 링크)
-            if link_url and ('http://' in link_url or 'https://' in link_url):
-                # 텍스트에서 언론사명 분리
-                parts = link_text.split(' ')
-                if len(parts) >= 2:
-                    # 마지막 단어가 언론사명일 가능성
-                    article_title = ' '.join(parts[:-1])
-                    source = parts[-1]
-                else:
-                    article_title = link_text
-                    source = None
-
-                news_item = {
-                    'title': article_title,
-                    'source': source,
-                    'url': link_url
-                }
-
-                # 섹션별로 분류 (content의 앞부분 텍스트로 판단)
-                # 실제로는 td의 앞쪽 텍스트를 봐야 하지만, 간단히 처리
-                news_data['domestic'].append(news_item)
-
-        # content 전체 텍스트로 섹션 구분
-        full_text = content_elem.text
-
-        # 다시 파싱 - 텍스트 기반으로 섹션 구분
-        news_data = {
-            'domestic': [],
-            'international': [],
-            'editorial': [],
-            'nuclear_news': []
-        }
+def fetch_detail_http(post_url):
+    """JS 없이 HTTP로 상세 페이지 수집 (실패 시 None)"""
+    with span('kaif_detail.fetch_http'):
+        page_source = fetch_html(post_url)
+    if page_source is None:
+        return None
+    return parse_detail_page(page_source, post_url)
 
-        # 텍스트를 줄 단위로 분석
-        lines = full_text.split('\n')
-        current_section = None
 
-        for line in lines:
-            line = line.strip()
+def fetch_detail_browser(pool, post_url):
+    """브라우저 탭으로 상세 페이지 수집 (HTTP 결과에 본문이 없을 때)"""
+    with span('kaif_detail.render'), pool.tab() as driver:
+        driver.get(post_url)
+        wait_for_ready(driver, 'kaif_detail', DETAIL_CONTENT_SELECTOR)
+        return parse_detail_page(driver.page_source, post_url, require_content=False)
 
-            # 섹션 헤더 감지
-            if '국내기사' in line or '국내 기사' in line:
-                current_section = 'domestic'
-                continue
-            elif '세계기사' in line or '세계 기사' in line or '국제기사' in line:
-                current_section = 'international'
-                continue
-            elif '사설' in line or '칼럼' in line or '기고' in line:
-                current_section = 'editorial'
-                continue
-            elif '원자력계 소식' in line:
-                current_section = 'nuclear_news'
-                continue
 
-            # 뉴스 아이템 파싱 (· 로 시작하는 줄)
-            if line.startswith('·'):
-                # · 제거
-                line = line[1:].strip()
-
-                # 링크에서 실제 데이터 찾기
-                for link in all_links:
-                    if link.text.strip() and link.text.strip() in line:
-                        link_url = link.get_attribute('href')
-                        if link_url and ('http://' in link_url or 'https://' in link_url):
-                            # 제목과 언론사 분리
-                            parts = line.rsplit(' ', 1)
-                            if len(parts) == 2:
-                                article_title = parts[0]
-                                source = parts[1]
-                            else:
-                                article_title = line
-                                source = None
-
-                            news_item = {
-                                'title': article_title,
-                                'source': source,
-                                'url': link_url
-                            }
-
-                            if current_section == 'domestic':
-                                news_data['domestic'].append(news_item)
-                            elif current_section == 'international':
-                                news_data['international'].append(news_item)
-                            elif current_section == 'editorial':
-                                news_data['editorial'].append(news_item)
-                            elif current_section == 'nuclear_news':
-                                news_data['nuclear_news'].append(news_item)
-                            break
-
-        return news_data
+def fetch_detail(pool, target):
+    """게시물 하나의 상세 내용 수집: HTTP 우선, 필요할 때만 브라우저"""
+    post_url = target['list_url']
+    print(f"상세 페이지 접근 중: {target['title']}")
+    detail = fetch_detail_http(post_url)
+    if detail is not None:
+        record_path('kaif_detail', 'http')
+        return detail
+    print(f"[Browser] JS 렌더링 필요, 브라우저로 재시도: {post_url}")
+    record_path('kaif_detail', 'selenium')
+    return fetch_detail_browser(pool, post_url)
 
-    except Exception as e:
-        print(f"뉴스 테이블 파싱 오류: {e}")
-        return news_data
+
+class DetailCache:
+    """
+    상세 페이지 파싱 결과 캐시 (URL 키, kaif_detail_cache.json)
+    같은 날 재실행 시 이미 파싱한 페이지는 건너뜀 — 다른 날짜 항목은 저장 시 정리
+    """
+
+    def __init__(self, path=DETAIL_CACHE_FILE, day=None):
+        self.path = path
+        self.day = day or now_kst().strftime('%Y-%m-%d')
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.entries = {
+                        url: entry for url, entry in json.load(f).items()
+                        if entry.get('day') == self.day
+                    }
+            except (OSError, ValueError) as e:
+                print(f"[Cache] {path} 읽기 실패, 새로 시작: {e}")
+
+    def get(self, url):
+        entry = self.entries.get(url)
+        return entry['detail'] if entry else None
+
+    def put(self, url, detail):
+        self.entries[url] = {'day': self.day, 'detail': detail}
+
+    def save(self):
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"[Cache] {self.path} 저장 실패: {e}")
 
 
-def crawl_kaif(url):
+def collect_targets(page_source, url, target_day, today=None):
+    """
+    게시판 목록 스냅샷에서 대상 날짜(target_day, date) 게시물의 (제목, URL, 날짜)를 미리 수집
+    (상세 페이지 이동 전에 모두 뽑아 두므로 stale element 문제 없음)
+    today: 연도 없는 날짜/'오늘' 표기 해석 기준일
+    """
+    doc = load_html(page_source, url)
+    selector, board_items = find_list_items(doc, BOARD_SELECTORS, MIN_BOARD_ITEMS)
+    if not selector:
+        return None
+    print(f"[OK] 발견된 선택자: {selector} ({len(board_items)}개 항목)")
+    print(f"\n총 {len(board_items)}개의 게시물 발견")
+    print("="*100)
+
+    targets = []
+    for item in board_items:
+        # 날짜 확인
+        date_text = element_text(first(item, 'td.col-date, td.date, .date, td:last-child'))
+        if not date_text:
+            continue
+
+        # 날짜 형식과 상관없이 KST 날짜로 해석해 비교
+        # ('오늘'/'today' 표기는 기존 동작대로 대상 게시물로 포함)
+        relative_today = '오늘' in date_text or 'today' in date_text.lower()
+        posted = parse_news_date(date_text, today)
+        if not relative_today and (posted is None or posted.date() != target_day):
+            continue
+
+        # 제목 및 링크
+        title_elem = first(item, 'td.subject a, .title a, td a')
+        post_url = element_url(title_elem, 'href', url)
+        if not post_url:
+            continue
+
+        print(f"\n[어제 게시물 발견] 날짜: {date_text}")
+        targets.append({
+            'title': element_text(title_elem),
+            'list_url': post_url,
+            'date': date_text,
+        })
+    return targets
+
+
+def crawl_kaif(url, pool=None):
     """
     한국원자력산업회의 크롤링
     어제 날짜의 게시물만 상세 내용까지 수집
+    pool: 공유 DriverPool (없으면 전용 Chrome을 띄웠다가 정리)
     """
-    # 임시 디렉토리 생성
-    temp_dir = tempfile.mkdtemp(prefix='selenium_')
-
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-    chrome_options.add_argument(f'--user-data-dir={temp_dir}')
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-
-    # Selenium 4.6+ 자동 드라이버 관리 사용
-    driver = webdriver.Chrome(options=chrome_options)
+    if pool is not None:
+        return _crawl_kaif(pool, url)
+    with DriverPool(max_browsers=1) as own_pool:
+        return _crawl_kaif(own_pool, url)
 
-    try:
-        print(f"페이지 로딩 중: {url}")
-        driver.get(url)
-        time.sleep(5)
 
-        # 어제 날짜 확인
+def _crawl_kaif(pool, url):
+    try:
+        # 어제 날짜 확인 (한국 시간 기준)
         from datetime import timedelta
-        yesterday = datetime.now() - timedelta(days=1)
+        today = now_kst().date()
+        yesterday = today - timedelta(days=1)
         today_str = yesterday.strftime('%Y-%m-%d')  # 2026-01-12
-        today_str_alt = yesterday.strftime('%Y.%m.%d')  # 2026.01.12
-        today_str_alt2 = yesterday.strftime('%m.%d')  # 01.12
 
         print(f"\n어제 날짜: {today_str}")
         print("어제 날짜의 게시물만 수집합니다.\n")
 
-        # 여러 가능한 선택자 시도
-        possible_selectors = [
-            "table tbody tr",
-            "div.board-list table tr",
-            "table.board-list tr",
-            ".list-item",
-            "div.list tbody tr",
-        ]
-
-        board_items = []
-        used_selector = None
-
-        for selector in possible_selectors:
-            try:
-                items = driver.find_elements(By.CSS_SELECTOR, selector)
-                if items and len(items) > 3:
-                    print(f"[OK] 발견된 선택자: {selector} ({len(items)}개 항목)")
-                    board_items = items
-                    used_selector = selector
-                    break
-            except:
-                continue
-
-        if not board_items:
+        # 1. 목록 페이지에서 대상 게시물 URL을 먼저 모두 수집
+        #    HTTP 우선, 게시판 목록이 없을 때만 브라우저 (탭은 바로 반환)
+        def render_list():
+            with pool.tab() as driver:
+                print(f"페이지 로딩 중: {url}")
+                with span('kaif.load'):
+                    driver.get(url)
+                    wait_for_ready(driver, 'kaif_list', BOARD_SELECTORS, MIN_BOARD_ITEMS)
+                page_source = driver.page_source
+            return page_source, collect_targets(page_source, url, yesterday, today)
+
+        _, targets, _ = fetch_with_fallback(
+            'kaif', url, lambda html: collect_targets(html, url, yesterday, today), render_list
+        )
+        if targets is None:
             print("게시물 항목을 찾을 수 없습니다. 수동으로 HTML을 확인해주세요.")
             return []
 
-        print(f"\n총 {len(board_items)}개의 게시물 발견")
-        print("="*100)
-
-        today_posts = []
-
-        for idx, item in enumerate(board_items, 1):
-            try:
-                # 날짜 확인
-                date_text = None
-                try:
-                    date_elem = item.find_element(By.CSS_SELECTOR, 'td.col-date, td.date, .date, td:last-child')
-                    date_text = date_elem.text.strip()
-                except:
-                    continue
-
-                # 오늘 날짜인지 확인
-                is_today = False
-                if date_text:
-                    # 다양한 날짜 형식 체크
-                    if today_str in date_text or today_str_alt in date_text or today_str_alt2 in date_text:
-                        is_today = True
-                    # "오늘" 텍스트 체크
-                    elif "오늘" in date_text or "today" in date_text.lower():
-                        is_today = True
-
-                if not is_today:
-                    continue
-
-                print(f"\n[어제 게시물 발견] 날짜: {date_text}")
-
-                # 제목 및 링크
-                post_data = {}
-                try:
-                    title_elem = item.find_element(By.CSS_SELECTOR, 'td.subject a, .title a, td a')
-                    post_data['title'] = title_elem.text.strip()
-                    post_url = title_elem.get_attribute('href')
-                    post_data['list_url'] = post_url
-                    post_data['date'] = date_text
-                except:
-                    continue
-
-                # 상세 페이지로 이동
-                print(f"상세 페이지 접근 중: {post_data['title']}")
-                driver.get(post_url)
-                time.sleep(3)
-
-                # 상세 내용 파싱
-                try:
-                    # 제목
-                    try:
-                        detail_title = driver.find_element(By.CSS_SELECTOR, 'h3.bbs-view-tit, h1, .view-title, .subject')
-                        post_data['detail_title'] = detail_title.text.strip()
-                    except:
-                        post_data['detail_title'] = post_data['title']
-
-                    # 본문 내용
+        # 2. 상세 페이지 병렬 수집 (같은 날 이미 파싱한 페이지는 캐시 사용)
+        #    이미 Slack으로 보낸 게시물은 상세 페이지를 열지 않음 (목록 정보만으로 결과에 유지, 전송 시 제외)
+        cache = DetailCache()
+        sent = get_store().sent_urls('kaif', [t['list_url'] for t in targets])
+        pending = [t for t in targets if cache.get(t['list_url']) is None and t['list_url'] not in sent]
+        cached = sum(1 for t in targets if cache.get(t['list_url']) is not None)
+        if cached:
+            print(f"[Cache] {cached}개 게시물은 캐시 사용")
+        if sent:
+            print(f"[SEEN] 이미 보낸 게시물 {len(sent)}개 — 캐시에 없으면 상세 페이지 생략")
+
+        if pending:
+            with span('kaif.details'), ThreadPoolExecutor(max_workers=DETAIL_WORKERS, thread_name_prefix='kaif_detail') as executor:
+                futures = {t['list_url']: executor.submit(fetch_detail, pool, t) for t in pending}
+                for post_url, future in futures.items():
                     try:
-                        content_elem = driver.find_element(By.CSS_SELECTOR, '#bbsContents, .bbs-view-content, .view-content, .content')
-                        post_data['content'] = content_elem.text.strip()
-                    except:
-                        post_data['content'] = None
+                        detail = future.result()
+                    except Exception as e:
+                        print(f"게시물 처리 오류: {e}")
+                        continue
+                    if detail is not None:
+                        cache.put(post_url, detail)
+            cache.save()
 
-                    # 국내외 뉴스 테이블 파싱
-                    post_data['news_links'] = parse_news_table(driver)
-
-                except Exception as e:
-                    print(f"상세 내용 파싱 오류: {e}")
-
-                    # 첨부파일
-                    try:
-                        attachments = []
-                        attach_elems = driver.find_elements(By.CSS_SELECTOR, '.attach a, .file a, .attachment a')
-                        for attach in attach_elems:
-                            attachments.append({
-                                'filename': attach.text.strip(),
-                                'url': attach.get_attribute('href')
-                            })
-                        post_data['attachments'] = attachments
-                    except:
-                        post_data['attachments'] = []
-
-                    # 작성자
-                    try:
-                        author_elem = driver.find_element(By.CSS_SELECTOR, '.author, .writer, .name')
-                        post_data['author'] = author_elem.text.strip()
-                    except:
-                        post_data['author'] = None
-
-                    # 조회수
-                    try:
-                        views_elem = driver.find_element(By.CSS_SELECTOR, '.views, .hit, .count')
-                        post_data['views'] = views_elem.text.strip()
-                    except:
-                        post_data['views'] = None
-
-                except Exception as e:
-                    print(f"상세 내용 파싱 오류: {e}")
-
-                today_posts.append(post_data)
-
-                print(f"[OK] 수집 완료: {post_data['title']}")
-                print(f"     내용 길이: {len(post_data.get('content', '')) if post_data.get('content') else 0}자")
-                print(f"     첨부파일: {len(post_data.get('attachments', []))}개")
-
-                # 뉴스 링크 통계
-                news_links = post_data.get('news_links', {})
-                print(f"     국내기사: {len(news_links.get('domestic', []))}개")
-                print(f"     세계기사: {len(news_links.get('international', []))}개")
-                print(f"     사설/칼럼: {len(news_links.get('editorial', []))}개")
-                print(f"     원자력계 소식: {len(news_links.get('nuclear_news', []))}개")
-                print("-"*100)
-
-                # 다시 목록 페이지로 돌아가기
-                driver.back()
-                time.sleep(2)
-
-            except Exception as e:
-                print(f"게시물 처리 오류: {e}")
+        today_posts = []
+        for target in targets:
+            detail = cache.get(target['list_url'])
+            if detail is None and target['list_url'] in sent:
+                detail = {}  # 이미 보낸 게시물: 상세 생략
+            if detail is None:
+                print(f"게시물 처리 오류: 상세 내용 없음 ({target['list_url']})")
                 continue
 
-        # JSON 파일로 저장
+            post_data = dict(target)
+            post_data.update(detail)
+            if not post_data.get('detail_title'):
+                post_data['detail_title'] = post_data['title']
+            today_posts.append(post_data)
+
+            print(f"[OK] 수집 완료: {post_data['title']}")
+            print(f"     내용 길이: {len(post_data.get('content', '')) if post_data.get('content') else 0}자")
+            print(f"     첨부파일: {len(post_data.get('attachments', []))}개")
+
+            # 뉴스 링크 통계
+            news_links = post_data.get('news_links', {})
+            print(f"     국내기사: {len(news_links.get('domestic', []))}개")
+            print(f"     세계기사: {len(news_links.get('international', []))}개")
+            print(f"     사설/칼럼: {len(news_links.get('editorial', []))}개")
+            print(f"     원자력계 소식: {len(news_links.get('nuclear_news', []))}개")
+            print("-"*100)
+
+        # JSON 파일로 저장 (백그라운드 기록 — 결과는 반환값으로 바로 다음 단계에 전달)
         output_file = 'kaif_data.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'source': 'kaif',
-                'url': url,
-                'crawled_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'target_date': today_str,
-                'total_count': len(today_posts),
-                'posts': today_posts
-            }, f, ensure_ascii=False, indent=2)
+        saved = SINK.write(output_file, {
+            'source': 'kaif',
+            'url': url,
+            'crawled_at': now_kst().strftime('%Y-%m-%d %H:%M:%S'),
+            'target_date': today_str,
+            'total_count': len(today_posts),
+            'posts': today_posts
+        })
 
         print("\n" + "="*100)
-        print(f"[OK] 어제 날짜 게시물 {len(today_posts)}개가 '{output_file}' 파일에 저장되었습니다.")
+        if saved:
+            print(f"[OK] 어제 날짜 게시물 {len(today_posts)}개를 '{output_file}' 파일에 저장합니다.")
 
         return today_posts
 
@@ -344,14 +389,6 @@ def crawl_kaif(url):
         traceback.print_exc()
         return []
 
-    finally:
-        driver.quit()
-        # 임시 디렉토리 정리
-        try:
-            shutil.rmtree(temp_dir)
-        except:
-            pass
-
 
 if __name__ == "__main__":
     url = "https://www.kaif.or.kr/ko/ko/?c=250&s=250"
@@ -1,173 +1,214 @@
 # 한국원자력산업신문 크롤링 파일
 
 # -*- coding: utf-8 -*-
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-import json
-import time
-import tempfile
-import shutil
-
-def crawl_knpnews(url):
+from browser_pool import browser_tab
+from page_wait import wait_for_ready
+from snapshot_parser import PARSE_MODE, parse_article_list, timed_parse
+from http_fetch import fetch_with_fallback, record_path
+from keyword_matcher import get_matcher
+from json_sink import SINK
+from metrics import span
+
+# 뉴스 항목 선택자 (fallback 포함, 앞에서부터 시도)
+LIST_SELECTORS = [
+    "#section-list ul li",
+    "#section-list .type2 li",
+    "section.section-list ul li",
+    "div.article-list li",
+    "ul.article-list li",
+    ".news-list li",
+]
+MIN_LIST_ITEMS = 6  # 최소 6개(5개 초과) 이상의 아이템이 있어야 유효
+
+
+def crawl_knpnews(url, pool=None, parse_mode=PARSE_MODE):
     """
     한국원자력산업신문 크롤링
+    HTTP로 받은 정적 HTML을 먼저 파싱하고, 항목이 없을 때만 브라우저 사용
+    pool: 공유 DriverPool (없으면 필요할 때 전용 Chrome을 띄웠다가 정리)
+    parse_mode: snapshot / webdriver / compare (snapshot_parser.PARSE_MODE 참고)
     """
-    # 임시 디렉토리 생성
-    temp_dir = tempfile.mkdtemp(prefix='selenium_')
-
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
-    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-    chrome_options.add_argument(f'--user-data-dir={temp_dir}')
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option('useAutomationExtension', False)
-    chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-
-    # Selenium 4.6+ 자동 드라이버 관리 사용
-    driver = webdriver.Chrome(options=chrome_options)
-
     try:
-        print(f"페이지 로딩 중: {url}")
-        driver.get(url)
-        time.sleep(5)
+        def render():
+            with browser_tab(pool) as driver:
+                return _load_with_browser(driver, url, parse_mode)
+
+        if parse_mode == 'snapshot':
+            page_source, parsed, _ = fetch_with_fallback(
+                'knpnews', url,
+                lambda html: timed_parse('knpnews', parse_mode, lambda: _parse_list_snapshot(html, url), None),
+                render,
+            )
+        else:
+            # webdriver/compare 모드는 브라우저 DOM이 있어야 함
+            page_source, parsed = render()
+            record_path('knpnews', 'selenium')
+
+        with span('knpnews.save'):
+            return _save_results(url, page_source, parsed)
 
-        # 페이지 소스 저장 (디버깅용)
-        with open('knpnews_page_source.html', 'w', encoding='utf-8') as f:
-            f.write(driver.page_source)
-        print("[DEBUG] 페이지 소스가 'knpnews_page_source.html'에 저장되었습니다.")
+    except Exception as e:
+        print(f"오류 발생: {e}")
+        import traceback
+        traceback.print_exc()
+        return []
 
-        # 여러 가능한 선택자 시도
-        possible_selectors = [
-            "#section-list ul li",
-            "#section-list .type2 li",
-            "section.section-list ul li",
-            "div.article-list li",
-            "ul.article-list li",
-            ".news-list li",
-        ]
 
-        news_items = []
-        used_selector = None
+def _parse_list_webdriver(driver):
+    """기존 방식: 항목마다 WebDriver 호출로 파싱 (항목을 못 찾으면 None)"""
+    # 여러 가능한 선택자 시도
+    news_items = []
 
-        for selector in possible_selectors:
-            try:
-                items = driver.find_elements(By.CSS_SELECTOR, selector)
-                if items and len(items) > 5:  # 최소 5개 이상의 아이템이 있어야 유효
-                    print(f"[OK] 발견된 선택자: {selector} ({len(items)}개 항목)")
-                    news_items = items
-                    used_selector = selector
-                    break
-            except:
-                continue
+    for selector in LIST_SELECTORS:
+        try:
+            items = driver.find_elements(By.CSS_SELECTOR, selector)
+            if items and len(items) >= MIN_LIST_ITEMS:
+                print(f"[OK] 발견된 선택자: {selector} ({len(items)}개 항목)")
+                news_items = items
+                break
+        except:
+            continue
 
-        if not news_items:
-            print("뉴스 항목을 찾을 수 없습니다. 수동으로 HTML을 확인해주세요.")
-            return []
+    if not news_items:
+        return None
 
-        print(f"\n총 {len(news_items)}개의 뉴스 발견\n")
-        print("="*100)
+    parsed = []
+    for idx, item in enumerate(news_items, 1):
+        news_data = {}
 
-        all_news = []
+        try:
+            # 썸네일 이미지
+            try:
+                img = item.find_element(By.CSS_SELECTOR, 'a.thumb img')
+                news_data['thumbnail'] = img.get_attribute('src')
+            except:
+                news_data['thumbnail'] = None
 
-        for idx, item in enumerate(news_items, 1):
-            news_data = {}
+            # 제목 및 링크
+            try:
+                title_elem = item.find_element(By.CSS_SELECTOR, 'h2.titles a')
+                news_data['title'] = title_elem.text.strip()
+                news_data['url'] = title_elem.get_attribute('href')
+            except:
+                news_data['title'] = None
+                news_data['url'] = None
 
+            # 본문 미리보기
             try:
-                # 썸네일 이미지
-                try:
-                    img = item.find_element(By.CSS_SELECTOR, 'a.thumb img')
-                    news_data['thumbnail'] = img.get_attribute('src')
-                except:
-                    news_data['thumbnail'] = None
+                lead_elem = item.find_element(By.CSS_SELECTOR, 'p.lead a')
+                news_data['preview'] = lead_elem.text.strip()
+            except:
+                news_data['preview'] = None
 
-                # 제목 및 링크
+            # 메타 정보 — type2: span.byline > em [카테고리, 기자, 날짜]
+            #             type1: em.info.category / em.info.name / em.info.dated
+            try:
+                byline = item.find_element(By.CSS_SELECTOR, 'span.byline')
+                ems = byline.find_elements(By.TAG_NAME, 'em')
+                news_data['category'] = ems[0].text.strip() if len(ems) >= 1 else None
+                news_data['reporter'] = ems[1].text.strip() if len(ems) >= 2 else None
+                news_data['date']     = ems[2].text.strip() if len(ems) >= 3 else None
+            except:
+                # type1 fallback
                 try:
-                    title_elem = item.find_element(By.CSS_SELECTOR, 'h2.titles a')
-                    news_data['title'] = title_elem.text.strip()
-                    news_data['url'] = title_elem.get_attribute('href')
+                    news_data['category'] = item.find_element(By.CSS_SELECTOR, 'em.info.category').text.strip()
                 except:
-                    news_data['title'] = None
-                    news_data['url'] = None
-
-                # 본문 미리보기
+                    news_data['category'] = None
                 try:
-                    lead_elem = item.find_element(By.CSS_SELECTOR, 'p.lead a')
-                    news_data['preview'] = lead_elem.text.strip()
+                    news_data['reporter'] = item.find_element(By.CSS_SELECTOR, 'em.info.name').text.strip()
                 except:
-                    news_data['preview'] = None
-
-                # 메타 정보 — type2: span.byline > em [카테고리, 기자, 날짜]
-                #             type1: em.info.category / em.info.name / em.info.dated
+                    news_data['reporter'] = None
                 try:
-                    byline = item.find_element(By.CSS_SELECTOR, 'span.byline')
-                    ems = byline.find_elements(By.TAG_NAME, 'em')
-                    news_data['category'] = ems[0].text.strip() if len(ems) >= 1 else None
-                    news_data['reporter'] = ems[1].text.strip() if len(ems) >= 2 else None
-                    news_data['date']     = ems[2].text.strip() if len(ems) >= 3 else None
+                    news_data['date'] = item.find_element(By.CSS_SELECTOR, 'em.info.dated').text.strip()
                 except:
-                    # type1 fallback
-                    try:
-                        news_data['category'] = item.find_element(By.CSS_SELECTOR, 'em.info.category').text.strip()
-                    except:
-                        news_data['category'] = None
-                    try:
-                        news_data['reporter'] = item.find_element(By.CSS_SELECTOR, 'em.info.name').text.strip()
-                    except:
-                        news_data['reporter'] = None
-                    try:
-                        news_data['date'] = item.find_element(By.CSS_SELECTOR, 'em.info.dated').text.strip()
-                    except:
-                        news_data['date'] = None
-
-                # 유효한 데이터가 있는 경우만 추가
-                if news_data['title'] and news_data['url']:
-                    all_news.append(news_data)
-
-                    # 출력 (처음 5개만)
-                    if idx <= 5:
-                        print(f"[{idx}] {news_data['title']}")
-                        print(f"    URL: {news_data['url']}")
-                        print(f"    카테고리: {news_data['category']}")
-                        print(f"    기자: {news_data['reporter']}")
-                        print(f"    날짜: {news_data['date']}")
-                        print(f"    썸네일: {news_data['thumbnail']}")
-                        print(f"    미리보기: {news_data['preview'][:100]}..." if news_data['preview'] else "    미리보기: None")
-                        print("-"*100)
-
-            except Exception as e:
-                print(f"항목 {idx} 파싱 오류: {e}")
-
-        # JSON 파일로 저장
-        output_file = 'knpnews_data.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'source': 'knpnews',
-                'url': url,
-                'total_count': len(all_news),
-                'news_list': all_news
-            }, f, ensure_ascii=False, indent=2)
-
-        print("\n" + "="*100)
-        print(f"[OK] {len(all_news)}개의 뉴스 데이터가 '{output_file}' 파일에 저장되었습니다.")
-
-        return all_news
+                    news_data['date'] = None
 
-    except Exception as e:
-        print(f"오류 발생: {e}")
-        import traceback
-        traceback.print_exc()
+            parsed.append(news_data)
+
+        except Exception as e:
+            print(f"항목 {idx} 파싱 오류: {e}")
+
+    return parsed
+
+
+def _parse_list_snapshot(page_source, url):
+    """스냅샷 방식: page_source 한 번으로 lxml 파싱 (항목을 못 찾으면 None)"""
+    selector, parsed = parse_article_list(page_source, url, LIST_SELECTORS, MIN_LIST_ITEMS)
+    if not selector:
+        return None
+    print(f"[OK] 발견된 선택자: {selector} ({len(parsed)}개 항목)")
+    return parsed
+
+
+def _load_with_browser(driver, url, parse_mode):
+    """브라우저로 목록 페이지 로딩 후 파싱 — (page_source, 항목 리스트 또는 None)"""
+    print(f"페이지 로딩 중: {url}")
+    with span('knpnews.load'):
+        driver.get(url)
+        wait_for_ready(driver, 'knpnews', LIST_SELECTORS, MIN_LIST_ITEMS)
+
+    # 페이지 소스 스냅샷 (파싱 + 디버그 저장에 같이 사용)
+    page_source = driver.page_source
+    parsed = timed_parse(
+        'knpnews', parse_mode,
+        # compare 모드는 webdriver 결과와 비교하므로 전체 목록 파싱
+        lambda: _parse_list_snapshot(page_source, url),
+        lambda: _parse_list_webdriver(driver),
+    )
+    return page_source, parsed
+
+
+def _save_results(url, page_source, parsed):
+    """유효 항목 추림 + 출력 + JSON 저장"""
+    # 페이지 소스 저장 (디버깅용)
+    if page_source is not None:
+        with open('knpnews_page_source.html', 'w', encoding='utf-8') as f:
+            f.write(page_source)
+        print("[DEBUG] 페이지 소스가 'knpnews_page_source.html'에 저장되었습니다.")
+
+    if parsed is None:
+        print("뉴스 항목을 찾을 수 없습니다. 수동으로 HTML을 확인해주세요.")
         return []
 
-    finally:
-        driver.quit()
-        # 임시 디렉토리 정리
-        try:
-            shutil.rmtree(temp_dir)
-        except:
-            pass
+    print(f"\n총 {len(parsed)}개의 뉴스 발견\n")
+    print("="*100)
+
+    all_news = []
+
+    for idx, news_data in enumerate(parsed, 1):
+        # 유효한 데이터가 있는 경우만 추가
+        if news_data['title'] and news_data['url']:
+            all_news.append(news_data)
+
+            # 출력 (처음 5개만)
+            if idx <= 5:
+                print(f"[{idx}] {news_data['title']}")
+                print(f"    URL: {news_data['url']}")
+                print(f"    카테고리: {news_data['category']}")
+                print(f"    기자: {news_data['reporter']}")
+                print(f"    날짜: {news_data['date']}")
+                print(f"    썸네일: {news_data['thumbnail']}")
+                print(f"    미리보기: {news_data['preview'][:100]}..." if news_data['preview'] else "    미리보기: None")
+                print("-"*100)
+
+    # 제목/미리보기에 나온 원자력 키워드 기록
+    get_matcher().tag(all_news)
+
+    # JSON 파일로 저장 (백그라운드 기록 — 결과는 반환값으로 바로 다음 단계에 전달)
+    output_file = 'knpnews_data.json'
+    saved = SINK.write(output_file, {
+        'source': 'knpnews',
+        'url': url,
+        'total_count': len(all_news),
+        'news_list': all_news
+    })
+
+    print("\n" + "="*100)
+    if saved:
+        print(f"[OK] {len(all_news)}개의 뉴스 데이터를 '{output_file}' 파일에 저장합니다.")
+
+    return all_news
 
 
 if __name__ == "__main__":
@@ -0,0 +1,208 @@
+# RSS 피드 통합 엔진
+# 피드 레지스트리(URL, 소스, 카테고리, 키워드 필터) + 공용 파싱 경로 + 동시 수집
+# 새 피드는 FEEDS에 항목만 추가하면 됨
+
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone, timedelta
+from email.utils import parsedate_to_datetime
+from http_cache import conditional_fetch
+from keyword_matcher import NUCLEAR_KEYWORDS, get_matcher
+from rss_stream import filter_since, iter_rss_items
+import threading
+import xml.etree.ElementTree as ET
+
+KST = timezone(timedelta(hours=9))
+
+# 피드 레지스트리
+# - url: RSS 주소
+# - source: 결과 기사에 붙는 소스 id
+# - category: 기사 카테고리 (None이면 채널 <title> 사용)
+# - keywords: 키워드 필터 — 제목/미리보기/본문 중 하나라도 나오면 수집 (None이면 전체 수집)
+FEEDS = {
+    'energy_news': {
+        'url': 'https://cdn.energy-news.co.kr/rss/gns_allArticle.xml',
+        'source': 'energy_news',
+        'category': '전력·원자력',
+        'keywords': NUCLEAR_KEYWORDS,
+    },
+    'knpnews': {
+        'url': 'https://www.knpnews.com/rss/gns_allArticle.xml',
+        'source': 'knpnews',
+        'category': '뉴스',
+        'keywords': None,
+    },
+    # 에너지신문 섹션 피드 (check_rss.py에서 확인한 주소)
+    'energy_news_s2n3': {
+        'url': 'https://www.energy-news.co.kr/rss/S2N3.xml',
+        'source': 'energy_news',
+        'category': None,
+        'keywords': NUCLEAR_KEYWORDS,
+    },
+    'energy_news_s2n4': {
+        'url': 'https://www.energy-news.co.kr/rss/S2N4.xml',
+        'source': 'energy_news',
+        'category': None,
+        'keywords': None,
+    },
+}
+
+
+def parse_item(item, feed, channel_title=None):
+    """RSS <item> 요소 → 기사 dict (모든 피드 공용)"""
+    def txt(tag):
+        el = item.find(tag)
+        if el is None:
+            return None
+        # CDATA는 .text로 그냥 읽힘
+        return (el.text or '').strip()
+
+    title    = txt('title')
+    url      = txt('link') or txt('guid')
+    date_raw = txt('pubDate')
+    author_raw = txt('author') or ''
+
+    # 날짜 파싱 — RFC 2822 형식
+    try:
+        dt = parsedate_to_datetime(date_raw).astimezone(KST)
+        date_str = dt.strftime('%Y.%m.%d %H:%M')
+    except Exception:
+        date_str = date_raw
+
+    # 기자명 파싱 — "email (이름)" 형식
+    reporter = author_raw
+    if '(' in author_raw and ')' in author_raw:
+        reporter = author_raw[author_raw.index('(')+1:author_raw.index(')')]
+
+    return {
+        'title':    title,
+        'url':      url,
+        'date':     date_str,
+        'reporter': reporter,
+        'category': feed['category'] or channel_title or '뉴스',
+        'thumbnail': None,
+        'preview':  None,
+        'source':   feed['source'],
+    }
+
+
+def _parse_full(content, feed):
+    """RSS XML 전체를 한 번에 파싱"""
+    channel = ET.fromstring(content).find('channel')
+    items = channel.findall('item')
+    print(f'[OK] {feed["name"]}: 전체 기사 {len(items)}개 수신')
+    channel_title = (channel.findtext('title') or '').strip()
+    return [parse_item(item, feed, channel_title) for item in items]
+
+
+def _parse_stream(resp, feed, since):
+    """응답 스트림을 item 단위로 파싱, since보다 오래된 구간에서 중단"""
+    resp.raw.decode_content = True  # gzip 응답도 스트림에서 바로 해제
+    channel_info = {}
+    news = [
+        parse_item(item, feed, channel_info.get('title'))
+        for item in iter_rss_items(resp.raw, since, channel_info=channel_info)
+    ]
+    cutoff = f" ({since.astimezone(KST).strftime('%Y.%m.%d %H:%M')} 이후)" if since else ''
+    print(f'[OK] {feed["name"]}: 기사 {len(news)}개 수신{cutoff}')
+    return news
+
+
+def apply_keywords(news_list, keywords):
+    """
+    키워드 필터 (keywords가 없으면 전체 유지)
+    어느 경우든 기사마다 원자력 키워드 매칭 결과를 'keywords' 필드로 기록
+    """
+    if not keywords:
+        return get_matcher().tag(news_list)
+    return get_matcher(keywords).filter(news_list)
+
+
+def fetch_feed(name, since=None, stream=True):
+    """
+    레지스트리의 피드 하나 수집 → 키워드 필터까지 적용한 기사 리스트
+    since: 이 시각(aware datetime) 이후 기사만 — 피드가 최신순이라 그 이전 구간은 읽지 않음
+    stream: True면 iterparse 스트리밍 파싱, False면 전체 XML을 한 번에 파싱
+    """
+    feed = dict(FEEDS[name], name=name)
+    print(f'RSS 로딩 중: {feed["url"]}')
+    # ETag/Last-Modified 조건부 GET — 304면 캐시된 파싱 결과 재사용
+    if stream:
+        news, _ = conditional_fetch(
+            feed['url'], lambda resp: _parse_stream(resp, feed, since),
+            coverage=since.astimezone(KST).isoformat() if since else None, stream=True,
+        )
+    else:
+        news, _ = conditional_fetch(feed['url'], lambda resp: _parse_full(resp.content, feed))
+    news = filter_since(news, since)
+
+    filtered = apply_keywords(news, feed['keywords'])
+    if feed['keywords']:
+        print(f'{name} 키워드 필터링: {len(news)}개 → {len(filtered)}개')
+    return filtered
+
+
+def fetch_feeds(names=None, since=None, stream=True, max_workers=None):
+    """
+    여러 피드를 공용 커넥션 풀(http_fetch.SESSION)로 동시에 수집
+    피드 하나의 실패는 해당 피드만 빈 결과로 처리
+    반환: {피드 이름: 기사 리스트}
+    """
+    names = list(names or FEEDS)
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(names), thread_name_prefix='feed') as executor:
+        futures = {name: executor.submit(fetch_feed, name, since, stream) for name in names}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f'[SKIP] {name} 피드 수집 실패: {e}')
+                results[name] = []
+    return results
+
+
+def merge_by_source(results):
+    """피드별 결과를 소스 id별로 합침 (같은 소스 안에서 URL 중복 제거, 레지스트리 순서 유지)"""
+    merged = {}
+    seen = set()
+    for name, news_list in results.items():
+        for news in news_list:
+            key = (news['source'], news['url'])
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.setdefault(news['source'], []).append(news)
+    return merged
+
+
+def feeds_for(source):
+    """소스 id에 속한 피드 이름 (레지스트리 순서)"""
+    return [name for name, feed in FEEDS.items() if feed['source'] == source]
+
+
+class FeedBatch:
+    """
+    등록된 피드를 한 번에 동시 수집(fetch_feeds)해 소스별로 나눠 주는 묶음
+    소스별 크롤러가 같은 묶음을 공유하면 처음 요청한 쪽이 전체를 수집하고 나머지는 그 결과를 기다림
+    """
+
+    def __init__(self, names=None, since=None, stream=True):
+        self.names = list(names or FEEDS)
+        self.since = since
+        self.stream = stream
+        self._lock = threading.Lock()
+        self._merged = None
+
+    def source(self, source):
+        """소스 id의 기사 리스트 (여러 피드 합침, URL 중복 제거)"""
+        with self._lock:
+            if self._merged is None:
+                self._merged = merge_by_source(fetch_feeds(self.names, self.since, self.stream))
+        return self._merged.get(source, [])
+
+
+if __name__ == '__main__':
+    results = fetch_feeds()
+    print('='*80)
+    for source, news_list in merge_by_source(results).items():
+        print(f'{source}: {len(news_list)}개')
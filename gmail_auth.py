@@ -8,14 +8,18 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 
 SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
+# 토큰/클라이언트 비밀 파일 위치 (기본: 현재 디렉토리)
+TOKEN_FILE = os.getenv('NEWSBOT_GMAIL_TOKEN', 'token.json')
+CREDENTIALS_FILE = os.getenv('NEWSBOT_GMAIL_CREDENTIALS', 'credentials.json')
+
 
 def setup_gmail_auth():
     """Gmail API 인증 설정 (최초 1회 브라우저 인증 필요)"""
     creds = None
 
     # 기존 토큰 파일 확인
-    if os.path.exists('token.json'):
-        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+    if os.path.exists(TOKEN_FILE):
+        creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
 
     # 토큰이 없거나 만료된 경우
     if not creds or not creds.valid:
@@ -24,11 +28,11 @@ def setup_gmail_auth():
         else:
             # 최초 인증 (브라우저 열림)
             flow = InstalledAppFlow.from_client_secrets_file(
-                'credentials.json', SCOPES)
+                CREDENTIALS_FILE, SCOPES)
             creds = flow.run_local_server(port=0)
 
         # 토큰 저장
-        with open('token.json', 'w') as token:
+        with open(TOKEN_FILE, 'w') as token:
             token.write(creds.to_json())
 
     return creds
@@ -0,0 +1,107 @@
+# 조건부 GET 캐시 (RSS 피드용)
+# URL별 ETag/Last-Modified와 파싱 결과를 저장해 두고,
+# 서버가 304 Not Modified를 주면 다운로드/파싱 없이 캐시 결과 반환
+
+# -*- coding: utf-8 -*-
+from datetime import datetime
+from http_fetch import HTTP_TIMEOUT, SESSION
+import json
+import os
+import threading
+
+CACHE_FILE = 'http_cache.json'
+
+
+class ConditionalCache:
+    """URL → {etag, last_modified, coverage, fetched_at, items} (http_cache.json에 영속)"""
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[Cache] {path} 읽기 실패, 새로 시작: {e}")
+
+    def get(self, url):
+        with self._lock:
+            return self._entries.get(url)
+
+    def put(self, url, etag, last_modified, items, coverage=None):
+        with self._lock:
+            self._entries[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'coverage': coverage,
+                'fetched_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'items': items,
+            }
+            self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+        # 중간에 끊겨도 기존 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f'{self.path}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[Cache] {self.path} 저장 실패: {e}")
+
+
+FEED_CACHE = ConditionalCache()
+
+
+def _covers(entry, coverage):
+    """캐시 항목이 요청 범위를 포함하는지 (coverage=None은 전체 피드, 문자열은 시작 시각 ISO)"""
+    cached = entry.get('coverage')
+    if cached is None:
+        return True
+    return coverage is not None and cached <= coverage
+
+
+def conditional_fetch(url, parse, cache=None, session=None, timeout=HTTP_TIMEOUT,
+                      coverage=None, stream=False):
+    """
+    캐시된 검증자로 조건부 GET
+    - 304: 캐시된 items 그대로 반환
+    - 200: parse(resp)로 파싱 후 검증자와 함께 캐시 갱신
+    coverage: 파싱 범위 (since 기준으로 잘라 파싱하는 경우 그 시작 시각) —
+              캐시가 더 좁은 범위로 파싱된 것이면 조건부 헤더를 보내지 않음
+    stream: 응답 본문을 스트림으로 받음 (parse가 resp.raw를 읽는 경우)
+    반환: (items, 캐시 사용 여부)
+    """
+    cache = cache or FEED_CACHE
+    entry = cache.get(url)
+    if entry and not _covers(entry, coverage):
+        entry = None
+
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    resp = (session or SESSION).get(url, headers=headers, timeout=timeout, stream=stream)
+    try:
+        if resp.status_code == 304 and entry:
+            print(f"[304] 변경 없음 — 캐시된 {len(entry['items'])}개 사용 ({entry['fetched_at']} 수신분)")
+            return entry['items'], True
+        resp.raise_for_status()
+
+        items = parse(resp)
+    finally:
+        # 스트리밍 중 조기 종료한 경우 남은 본문은 받지 않고 연결 정리
+        resp.close()
+
+    etag = resp.headers.get('ETag')
+    last_modified = resp.headers.get('Last-Modified')
+    if etag or last_modified:
+        cache.put(url, etag, last_modified, items, coverage=coverage)
+    return items, False
@@ -0,0 +1,94 @@
+# HTTP 우선 페이지 수집
+# 서버 렌더링 페이지는 keep-alive 세션으로 바로 받아 파싱하고,
+# 기대한 선택자가 없을 때만 Selenium(브라우저)으로 escalate
+
+# -*- coding: utf-8 -*-
+from collections import Counter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from browser_pool import USER_AGENT
+from cassette import install_session
+from metrics import instrument_session, span
+from snapshot_parser import decode_html
+import requests
+import threading
+
+HTTP_TIMEOUT = 15
+
+
+def build_session(pool_maxsize=16):
+    """커넥션 풀 + 재시도 + 압축 응답을 쓰는 공용 세션"""
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504),
+                  allowed_methods=('GET', 'HEAD'))
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
+        'Accept-Encoding': 'gzip, deflate',
+    })
+    return session
+
+
+# 응답 훅으로 호스트별 요청 수/지연을 run_metrics.json에 기록
+SESSION = install_session(instrument_session(build_session()))
+
+# 소스별 수집 경로 기록: {소스: Counter({'http': n, 'selenium': m})}
+FETCH_PATHS = {}
+_paths_lock = threading.Lock()
+
+
+def record_path(source, path):
+    with _paths_lock:
+        FETCH_PATHS.setdefault(source, Counter())[path] += 1
+
+
+def reset_paths():
+    with _paths_lock:
+        FETCH_PATHS.clear()
+
+
+def report_paths():
+    """소스별 사용 경로 출력 + dict 반환"""
+    with _paths_lock:
+        report = {source: dict(counter) for source, counter in FETCH_PATHS.items()}
+    for source, counts in report.items():
+        summary = ', '.join(f"{path} {n}" for path, n in counts.items())
+        print(f"수집 경로 [{source}] {summary}")
+    return report
+
+
+def fetch_html(url, timeout=HTTP_TIMEOUT, session=None):
+    """GET 후 디코딩한 HTML 반환 (실패 시 None)"""
+    try:
+        resp = (session or SESSION).get(url, timeout=timeout)
+        resp.raise_for_status()
+    except requests.RequestException as e:
+        print(f"[HTTP] 요청 실패: {url} ({e})")
+        return None
+    return decode_html(resp.content, resp.headers.get('Content-Type'))
+
+
+def fetch_with_fallback(source, url, parse, render):
+    """
+    HTTP로 받은 HTML을 parse(html)로 파싱해 결과가 있으면 사용,
+    없으면(None) render()로 브라우저 수집 — render는 (page_source, 결과) 반환
+    반환: (page_source, 결과, 사용 경로)
+    """
+    with span(f'{source}.fetch_http'):
+        page_source = fetch_html(url)
+    if page_source is not None:
+        result = parse(page_source)
+        if result is not None:
+            print(f"[HTTP] {source}: 정적 HTML에서 파싱 완료")
+            record_path(source, 'http')
+            return page_source, result, 'http'
+        print(f"[HTTP] {source}: 기대한 선택자가 없어 브라우저로 전환")
+
+    with span(f'{source}.render'):
+        page_source, result = render()
+    record_path(source, 'selenium')
+    return page_source, result, 'selenium'
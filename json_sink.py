@@ -0,0 +1,86 @@
+# 결과 JSON 파일 비동기 저장
+# 크롤러/요약 단계는 파일을 직접 쓰지 않고 SINK.write()로 넘기고 바로 다음 단계로 진행
+# 백그라운드 스레드 하나가 받은 순서대로 기록 (같은 파일에 여러 번 쓰면 마지막 내용이 남음)
+# 실행 끝에 SINK.close()로 남은 기록을 기다림 (단독 실행 시에도 종료 시 자동으로 기다림)
+# 타임아웃으로 버린 크롤러 스레드(abandon)가 늦게 예약하는 기록은 버림
+#   NEWSBOT_JSON_OUTPUT=0 또는 main.py --no-json: 파일 저장 생략
+
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+import atexit
+import json
+import os
+import threading
+
+from metrics import span
+
+
+def _snapshot(value):
+    """dict/list 구조만 복사 — 넘긴 뒤에 원본이 바뀌어도(예: 중복 묶음 표시) 기록 내용은 넘긴 시점 그대로"""
+    if isinstance(value, dict):
+        return {k: _snapshot(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_snapshot(v) for v in value]
+    return value
+
+
+class JsonSink:
+    """JSON 파일 저장 큐 (기록 스레드 1개, 처음 쓸 때 시작)"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = []
+        self._abandoned = set()   # 결과를 버린 스레드 (Thread 객체 — ident는 재사용되므로)
+
+    def abandon(self, thread):
+        """thread가 앞으로 예약하는 기록은 버림 (늦게 끝난 크롤러가 이번 실행 결과 파일을 덮어쓰지 않도록)"""
+        with self._lock:
+            self._abandoned.add(thread)
+
+    def write(self, path, data, indent=2):
+        """path에 data를 JSON으로 저장하도록 예약 — 반환: 예약 여부 (저장이 꺼져 있거나 버린 스레드면 False)"""
+        if not self.enabled:
+            return False
+        if threading.current_thread() in self._abandoned:
+            print(f"[SKIP] 시간 초과로 버린 작업의 {path} 저장 생략")
+            return False
+        data = _snapshot(data)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='json-sink')
+            self._pending.append((path, self._executor.submit(self._dump, path, data, indent)))
+        return True
+
+    @staticmethod
+    def _dump(path, data, indent):
+        with span('json_sink.write'):
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=indent)
+            os.replace(tmp_path, path)
+
+    def flush(self):
+        """예약된 기록을 모두 기다림 — 반환: 실패한 파일 목록 [(경로, 예외)]"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        failed = []
+        for path, future in pending:
+            error = future.exception()
+            if error is not None:
+                print(f"[SKIP] {path} 저장 실패: {error}")
+                failed.append((path, error))
+        return failed
+
+    def close(self):
+        failed = self.flush()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        return failed
+
+
+SINK = JsonSink(enabled=os.getenv('NEWSBOT_JSON_OUTPUT', '1') != '0')
+atexit.register(SINK.close)
@@ -4,13 +4,247 @@
 # -*- coding: utf-8 -*-
 import base64
 import json
+import os
+import re
 from datetime import datetime, timedelta, timezone
-from bs4 import BeautifulSoup
-from googleapiclient.discovery import build
-from gmail_auth import setup_gmail_auth
+from lxml import etree
+import cassette
+from json_sink import SINK
+from metrics import METRICS, span
+from news_dates import now_kst
+
+# googleapiclient / google-auth는 import만으로 0.2~0.3초가 걸려서 실제로 Gmail에 접속할 때 불러옴
+# (main.py의 Slack 전송만/RSS만 실행에서는 로드하지 않음)
 
 KST = timezone(timedelta(hours=9))
 
+# Gmail REST 주소 (로컬 스텁 서버 등으로 바꿀 때만 지정, 예: http://127.0.0.1:8765/)
+GMAIL_API_ENDPOINT = os.getenv('NEWSBOT_GMAIL_API_ENDPOINT')
+
+# 수집 방식: search(날짜 검색, 기본) / history(historyId 증분 동기화 — 새로 도착한 메일만)
+SYNC_MODE = os.getenv('NEWSBOT_GMAIL_SYNC', 'search')
+SYNC_STATE_FILE = 'gmail_sync_state.json'
+
+# Gmail API 요청 하나의 상한 (초) — 응답이 멈춰도 수집 스레드가 끝나도록
+GMAIL_TIMEOUT = 30
+
+LIST_PAGE_SIZE = 100   # messages.list 한 페이지 크기 (nextPageToken으로 이어 받음)
+BATCH_SIZE = 50        # 배치 요청 하나에 넣을 호출 수 (Gmail 권장 상한)
+# 메일이 이 수 이하면 배치(구조 조회 + 본문 조회 2왕복) 대신 메일마다 1왕복으로 직접 조회
+# (평소 하루 1~2통 — 배치 요청/응답 처리 비용이 왕복을 아끼는 것보다 큼)
+DIRECT_FETCH_MAX = 3
+
+# 부분 응답 필드 — 목록은 id만, 메일은 파트 구조만 (본문 데이터/헤더 제외)
+LIST_FIELDS = 'messages/id,nextPageToken'
+_PART_FIELDS = 'partId,mimeType,body/attachmentId,body/size'
+STRUCTURE_FIELDS = (
+    f'id,payload({_PART_FIELDS},parts({_PART_FIELDS},parts({_PART_FIELDS},parts({_PART_FIELDS}))))'
+)
+# 직접 조회 — 파트 구조 + 본문 데이터 (헤더 제외, attachmentId로 오는 큰 첨부는 데이터 없음)
+_BODY_PART_FIELDS = f'{_PART_FIELDS},body/data'
+BODY_FIELDS = (
+    f'id,payload({_BODY_PART_FIELDS},parts({_BODY_PART_FIELDS},parts({_BODY_PART_FIELDS},'
+    f'parts({_BODY_PART_FIELDS}))))'
+)
+# 증분 동기화 — 추가된 메일 id와 현재 historyId만, 발신자/제목 확인용 헤더만
+HISTORY_FIELDS = 'history/messagesAdded/message/id,nextPageToken,historyId'
+METADATA_FIELDS = 'id,internalDate,payload/headers'
+
+
+# 사용하는 메서드만 남긴 discovery 문서 (저장소에 포함, 없으면 라이브러리 포함 문서에서 만들어 저장)
+# DISCOVERY_METHODS를 바꾸면 파일을 지우고 다시 만들어 커밋할 것
+DISCOVERY_CACHE_FILE = os.getenv('NEWSBOT_GMAIL_DISCOVERY', 'gmail_discovery_v1.json')
+DISCOVERY_METHODS = {
+    'users': ['getProfile'],
+    'users.history': ['list'],
+    'users.messages': ['list', 'get'],
+    'users.messages.attachments': ['get'],
+}
+
+
+def _schema_refs(node, found):
+    """discovery 노드 안의 $ref 스키마 이름 수집"""
+    if isinstance(node, dict):
+        ref = node.get('$ref')
+        if ref:
+            found.add(ref)
+        for value in node.values():
+            _schema_refs(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            _schema_refs(value, found)
+
+
+def trim_discovery_doc(doc, methods=DISCOVERY_METHODS):
+    """discovery 문서에서 methods에 있는 메서드와 그 메서드가 참조하는 스키마만 남김"""
+    trimmed = {k: v for k, v in doc.items() if k not in ('resources', 'schemas')}
+    trimmed['resources'] = {}
+    for path, names in methods.items():
+        source, target = doc, trimmed
+        for name in path.split('.'):
+            source = source['resources'][name]
+            target = target.setdefault('resources', {}).setdefault(name, {})
+        target['methods'] = {name: source['methods'][name] for name in names}
+
+    schemas = doc.get('schemas', {})
+    wanted = set()
+    _schema_refs(trimmed['resources'], wanted)
+    pending = list(wanted)
+    while pending:
+        found = set()
+        _schema_refs(schemas.get(pending.pop(), {}), found)
+        pending.extend(found - wanted)
+        wanted |= found
+    trimmed['schemas'] = {name: schemas[name] for name in sorted(wanted) if name in schemas}
+    return trimmed
+
+
+def load_discovery_doc(cache_path=DISCOVERY_CACHE_FILE):
+    """
+    Gmail v1 discovery 문서 (사용 메서드만)
+    캐시 파일이 있으면 그대로 읽고, 없으면 라이브러리에 포함된 정적 문서를 줄여서 캐시에 저장
+    정적 문서가 없는 구버전 라이브러리면 None (build()가 네트워크로 받아 옴)
+    """
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f'[KAIF Newsletter] {cache_path} 읽기 실패, 다시 생성: {e}')
+
+    try:
+        from googleapiclient.discovery_cache import get_static_doc
+    except ImportError:
+        return None
+    content = get_static_doc('gmail', 'v1')
+    if not content:
+        return None
+
+    doc = trim_discovery_doc(json.loads(content))
+    if cache_path:
+        try:
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump(doc, f, ensure_ascii=False)
+        except OSError:
+            pass
+    return doc
+
+
+def build_gmail_service(credentials=None, api_endpoint=GMAIL_API_ENDPOINT):
+    """
+    Gmail API 서비스 생성 — 캐시된 discovery 문서로 build_from_document (discovery 요청 없음)
+    api_endpoint를 주면 문서의 rootUrl을 바꿔서 생성
+    (client_options만 바꾸면 배치 요청은 여전히 googleapis.com으로 가므로)
+    """
+    from googleapiclient.discovery import build, build_from_document
+
+    doc = load_discovery_doc()
+    if doc is None:
+        if api_endpoint:
+            raise RuntimeError('discovery 문서가 없어 Gmail API 주소를 바꿀 수 없습니다')
+        return build('gmail', 'v1', credentials=credentials)
+
+    if api_endpoint:
+        doc = dict(doc, rootUrl=api_endpoint.rstrip('/') + '/')
+        doc['baseUrl'] = doc['rootUrl'] + doc.get('servicePath', '')
+    # 카세트 녹화/재생 모드면 Gmail API 응답을 녹화하거나 녹화본에서 돌려주는 http 사용
+    http = cassette.gmail_http(credentials, timeout=GMAIL_TIMEOUT)
+    if http is not None:
+        return build_from_document(doc, http=http)
+    import httplib2
+    http = httplib2.Http(timeout=GMAIL_TIMEOUT)
+    if credentials is not None:
+        import google_auth_httplib2
+        http = google_auth_httplib2.AuthorizedHttp(credentials, http=http)
+    return build_from_document(doc, http=http)
+
+
+_WS = re.compile(r'\s+')
+
+# 섹션 헤더로 볼 수 있는 태그와 최대 텍스트 길이
+HEADER_TAGS = ('div', 'td', 'span')
+HEADER_MAX_LEN = 30
+
+
+def _clean(text):
+    """\xa0 정규화 + 줄바꿈/연속공백 정리"""
+    return _WS.sub(' ', text.replace('\xa0', ' ')).strip()
+
+
+def _decode_body(data):
+    """Gmail 본문 데이터 (base64url, 패딩 없음) → 문자열"""
+    return base64.urlsafe_b64decode(data + '==').decode('utf-8', errors='replace')
+
+
+class _SectionCollector:
+    """
+    lxml HTMLParser target — 문서를 한 번만 훑으면서 섹션 헤더 후보와 링크를 문서 순서대로 기록
+    텍스트는 한 버퍼에 이어 붙이고 요소마다 시작/끝 위치만 기억 (요소별 하위 트리 재탐색 없음)
+    헤더 후보는 비공백 글자 수 누적값으로 길이를 먼저 판정해 짧은 것만 실제 텍스트를 만듦
+    """
+
+    SKIP_TEXT_TAGS = ('script', 'style')
+
+    def __init__(self):
+        self.chunks = []          # 텍스트 조각
+        self.solid = [0]          # 조각별 비공백 글자 수 누적 (solid[i] = chunks[:i]의 합)
+        self.stack = []           # 열린 요소 프레임
+        self.events = []          # 문서 순서: ('header', frame) / ('link', frame)
+        self._skip_depth = 0
+
+    def _text(self, frame):
+        return _clean(''.join(self.chunks[frame['start']:frame['end']]))
+
+    def start(self, tag, attrib):
+        parent = self.stack[-1] if self.stack else None
+        frame = {'tag': tag, 'start': len(self.chunks), 'end': None}
+        if tag in self.SKIP_TEXT_TAGS:
+            self._skip_depth += 1
+        if tag in HEADER_TAGS:
+            frame['header'] = None
+            self.events.append(('header', frame))
+        if tag == 'a':
+            frame['href'] = attrib.get('href', '')
+            frame['spans'] = []
+            frame['tr'] = next((f for f in reversed(self.stack) if f['tag'] == 'tr'), None)
+            if frame['tr'] is not None:
+                frame['tr']['has_link'] = True
+            self.events.append(('link', frame))
+        elif tag == 'tr':
+            frame['tds'] = []
+        elif tag == 'span' and parent is not None and parent['tag'] == 'a':
+            parent['spans'].append(frame)
+        elif tag == 'td' and parent is not None and parent['tag'] == 'tr':
+            parent['tds'].append(frame)
+        self.stack.append(frame)
+
+    def end(self, tag):
+        frame = self.stack.pop()
+        frame['end'] = len(self.chunks)
+        if tag in self.SKIP_TEXT_TAGS:
+            self._skip_depth -= 1
+        if 'header' in frame:
+            # 비공백 글자가 이미 30자 이상이면 정리한 텍스트도 30자 이상 → 텍스트 생성 생략
+            if self.solid[frame['end']] - self.solid[frame['start']] < HEADER_MAX_LEN:
+                text = self._text(frame)
+                if len(text) < HEADER_MAX_LEN:
+                    frame['header'] = text
+        if tag == 'a':
+            frame['text'] = self._text(frame)
+            frame['spans'] = [self._text(span) for span in frame['spans'][:2]]
+        elif tag == 'tr' and frame.get('has_link'):
+            # 소식의 단체명: 같은 <tr>의 마지막 직계 <td> (직계 td가 3개 이상일 때)
+            frame['org'] = self._text(frame['tds'][-1]) if len(frame['tds']) >= 3 else ''
+
+    def data(self, data):
+        if self._skip_depth:
+            return
+        self.chunks.append(data)
+        self.solid.append(self.solid[-1] + len(''.join(data.split())))
+
+    def close(self):
+        return self.events
+
 
 class KAIFNewsletterParser:
     SENDER = 'news@kaif.or.kr'
@@ -25,13 +259,29 @@ class KAIFNewsletterParser:
     # 건너뛸 섹션 (crawler_kaif.py 웹 크롤러가 이미 수집 중)
     SKIP_SECTIONS = {'국내기사', '세계기사', '사설', '칼럼', '기고'}
 
-    def __init__(self):
-        creds = setup_gmail_auth()
-        self.service = build('gmail', 'v1', credentials=creds)
+    def __init__(self, service=None, state_path=SYNC_STATE_FILE):
+        """
+        service: 미리 만든 Gmail 서비스 (스텁 테스트용) — 없으면 OAuth 인증 후 생성
+        state_path: 증분 동기화용 historyId 저장 파일
+        """
+        if service is None:
+            from gmail_auth import setup_gmail_auth
+            with span('kaif_newsletter.auth'):
+                # 스텁 주소가 있거나 카세트 재생 중이면 OAuth 인증 생략
+                creds = None if GMAIL_API_ENDPOINT or cassette.replaying() else setup_gmail_auth()
+                service = build_gmail_service(creds)
+        self.service = service
+        self.state_path = state_path
+
+    def fetch(self, mode=None):
+        """SYNC_MODE(NEWSBOT_GMAIL_SYNC)에 따라 날짜 검색 또는 증분 동기화"""
+        if (mode or SYNC_MODE) == 'history':
+            return self.fetch_new_newsletters()
+        return self.fetch_latest_newsletter()
 
     def fetch_latest_newsletter(self):
         """어제 날짜 KAIF 뉴스레터에서 원자력계 소식/이벤트 추출 (날짜 기반)"""
-        now = datetime.now(KST)
+        now = now_kst()
         yesterday = now - timedelta(days=1)
         after = yesterday.strftime('%Y/%m/%d')
         before = now.strftime('%Y/%m/%d')
@@ -39,23 +289,98 @@ class KAIFNewsletterParser:
         query = f'from:{self.SENDER} subject:"{self.SUBJECT_KEYWORD}" after:{after} before:{before}'
         print(f'[KAIF Newsletter] Gmail 검색 쿼리: {query}')
 
-        result = self.service.users().messages().list(
-            userId='me', q=query, maxResults=10
-        ).execute()
-
-        messages = result.get('messages', [])
-        if not messages:
+        message_ids = self._list_message_ids(query)
+        if not message_ids:
             print('[KAIF Newsletter] 해당 날짜 뉴스레터 없음')
             return []
 
-        print(f'[KAIF Newsletter] {len(messages)}개 메일 발견')
-        items = []
-        for i, m in enumerate(messages):
-            msg = self.service.users().messages().get(
-                userId='me', id=m['id'], format='full'
-            ).execute()
+        print(f'[KAIF Newsletter] {len(message_ids)}개 메일 발견')
+        items = self._collect_items([(mid, yesterday) for mid in message_ids])
+        self._save_items(items, yesterday)
+        return items
 
-            html_content = self._extract_html(msg)
+    def fetch_new_newsletters(self):
+        """
+        historyId 증분 동기화: 지난 실행 이후 새로 도착한 KAIF 뉴스레터만 처리
+        저장된 historyId가 없거나 만료(404)됐으면 날짜 검색으로 대신하고 현재 historyId부터 다시 시작
+        """
+        from googleapiclient.errors import HttpError
+
+        start_id = self._load_sync_state().get('history_id')
+        if not start_id:
+            print('[KAIF Newsletter] 저장된 historyId 없음 — 날짜 검색으로 시작')
+            return self._full_sync()
+
+        try:
+            message_ids, latest_id = self._history_message_ids(start_id)
+        except HttpError as e:
+            if e.resp.status != 404:
+                raise
+            print(f'[KAIF Newsletter] historyId {start_id} 만료 — 날짜 검색으로 전환')
+            return self._full_sync()
+
+        newsletters = self._filter_newsletters(message_ids)
+        print(f'[KAIF Newsletter] historyId {start_id} 이후 새 메일 {len(message_ids)}개 중 뉴스레터 {len(newsletters)}개')
+        items = self._collect_items(newsletters) if newsletters else []
+        # 새 뉴스레터가 없어도 빈 결과로 덮어씀 — 지난 실행의 파일이 이번 결과로 읽히지 않도록
+        self._save_items(items, max((received for _, received in newsletters), default=None))
+        # 처리가 끝난 뒤에 저장 — 중간에 실패하면 다음 실행에서 같은 범위를 다시 처리
+        self._save_sync_state(latest_id)
+        return items
+
+    def _full_sync(self):
+        # 검색 전에 historyId를 받아 둬야 검색 도중 도착한 메일도 다음 증분 동기화에 포함됨
+        latest_id = self.service.users().getProfile(userId='me', fields='historyId').execute()['historyId']
+        items = self.fetch_latest_newsletter()
+        self._save_sync_state(latest_id)
+        return items
+
+    def _history_message_ids(self, start_id):
+        """startHistoryId 이후 받은편지함에 추가된 메일 id (순서 유지, 중복 제거) + 현재 historyId"""
+        history = self.service.users().history()
+        request = history.list(
+            userId='me', startHistoryId=start_id, historyTypes='messageAdded',
+            labelId='INBOX', maxResults=LIST_PAGE_SIZE, fields=HISTORY_FIELDS,
+        )
+        ids = {}
+        latest_id = start_id
+        while request is not None:
+            with span('gmail.history'):
+                result = request.execute()
+            latest_id = result.get('historyId', latest_id)
+            for record in result.get('history', []):
+                for added in record.get('messagesAdded', []):
+                    ids.setdefault(added['message']['id'], None)
+            request = history.list_next(request, result)
+        return list(ids), latest_id
+
+    def _filter_newsletters(self, message_ids):
+        """From/Subject 헤더만 배치로 받아 KAIF 뉴스레터만 추림 — 반환: [(메일 id, 수신 시각 KST)]"""
+        messages = self.service.users().messages()
+        metadata = self._batch_execute([
+            (mid, messages.get(userId='me', id=mid, format='metadata',
+                               metadataHeaders=['From', 'Subject'], fields=METADATA_FIELDS))
+            for mid in message_ids
+        ])
+        newsletters = []
+        for mid in message_ids:
+            msg = metadata.get(mid)
+            if not msg:
+                continue
+            headers = {h['name'].lower(): h['value'] for h in msg.get('payload', {}).get('headers', [])}
+            if self.SENDER not in headers.get('from', '') or self.SUBJECT_KEYWORD not in headers.get('subject', ''):
+                continue
+            received = datetime.fromtimestamp(int(msg.get('internalDate', 0)) / 1000, KST)
+            newsletters.append((mid, received))
+        return newsletters
+
+    def _collect_items(self, messages):
+        """[(메일 id, 뉴스레터 날짜)] → HTML 본문을 받아 섹션 항목 추출"""
+        dates = dict(messages)
+        items = []
+        with span('kaif_newsletter.bodies'):
+            bodies = self._fetch_html_bodies(list(dates))
+        for i, (message_id, html_content) in enumerate(bodies):
             if not html_content:
                 print(f'[KAIF Newsletter] 메일 {i+1}: HTML 파트 추출 실패, 스킵')
                 continue
@@ -66,19 +391,182 @@ class KAIFNewsletterParser:
                     f.write(html_content)
                 print('[KAIF Newsletter] HTML 저장됨: kaif_newsletter_debug.html')
 
-            items.extend(self._parse_sections(html_content, yesterday))
+            with span('kaif_newsletter.parse'):
+                items.extend(self._parse_sections(html_content, dates[message_id]))
+        return items
 
-        # 별도 JSON 파일로 저장 (날짜 필터 없이 그대로)
-        with open('kaif_newsletter_data.json', 'w', encoding='utf-8') as f:
+    def _save_items(self, items, newsletter_date):
+        # 별도 JSON 파일로 저장 (날짜 필터 없이 그대로, 백그라운드 기록, 뉴스레터가 없으면 날짜 None)
+        if SINK.write('kaif_newsletter_data.json', {
+            'fetched_at': now_kst().strftime('%Y-%m-%d %H:%M:%S'),
+            'newsletter_date': newsletter_date.strftime('%Y.%m.%d') if newsletter_date else None,
+            'total_count': len(items),
+            'items': items
+        }):
+            print(f'[KAIF Newsletter] kaif_newsletter_data.json 저장 ({len(items)}개)')
+
+    def _load_sync_state(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f'[KAIF Newsletter] {self.state_path} 읽기 실패, 새로 시작: {e}')
+            return {}
+
+    def _save_sync_state(self, history_id):
+        if not self.state_path:
+            return
+        with open(self.state_path, 'w', encoding='utf-8') as f:
             json.dump({
-                'fetched_at': datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S'),
-                'newsletter_date': yesterday.strftime('%Y.%m.%d'),
-                'total_count': len(items),
-                'items': items
+                'history_id': str(history_id),
+                'synced_at': now_kst().strftime('%Y-%m-%d %H:%M:%S'),
             }, f, ensure_ascii=False, indent=2)
-        print(f'[KAIF Newsletter] kaif_newsletter_data.json 저장 완료 ({len(items)}개)')
+        print(f'[KAIF Newsletter] historyId {history_id} 저장')
+
+    def _list_message_ids(self, query):
+        """검색 결과 메일 id 전체 (nextPageToken을 따라 모든 페이지, 응답은 id만)"""
+        messages = self.service.users().messages()
+        request = messages.list(userId='me', q=query, maxResults=LIST_PAGE_SIZE, fields=LIST_FIELDS)
+        ids = []
+        while request is not None:
+            with span('gmail.list'):
+                result = request.execute()
+            ids.extend(m['id'] for m in result.get('messages', []))
+            request = messages.list_next(request, result)
+        return ids
+
+    def _batch_execute(self, requests):
+        """
+        [(key, HttpRequest)]를 BATCH_SIZE개씩 배치 요청으로 실행
+        반환: {key: 응답} — 실패한 호출은 빠짐 (로그만 출력)
+        """
+        responses = {}
+
+        def callback(request_id, response, exception):
+            if exception is not None:
+                print(f'[KAIF Newsletter] 배치 요청 실패 ({request_id}): {exception}')
+            else:
+                responses[request_id] = response
+
+        for start in range(0, len(requests), BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=callback)
+            for key, request in requests[start:start + BATCH_SIZE]:
+                batch.add(request, request_id=key)
+            METRICS.count('gmail.batched_calls', len(requests[start:start + BATCH_SIZE]))
+            with span('gmail.batch'):
+                batch.execute()
+        return responses
+
+    def _fetch_html_bodies(self, message_ids):
+        """
+        메일별 text/html 본문만 가져오기 — 반환: [(메일 id, HTML 또는 None)] (목록 순서)
+        DIRECT_FETCH_MAX통 이하: 메일마다 파트 구조 + 본문 데이터를 한 번에 직접 조회
+        그보다 많으면 배치 2단계
+        1) 배치 + 부분 응답으로 파트 구조만 조회 (본문 데이터 없음)
+        2) HTML 파트의 데이터만 배치로 조회 (첨부 id가 있으면 attachments.get, 없으면 해당 깊이의 body/data)
+        """
+        if len(message_ids) <= DIRECT_FETCH_MAX:
+            return [(mid, self._fetch_html_direct(mid)) for mid in message_ids]
+
+        messages = self.service.users().messages()
+        structures = self._batch_execute([
+            (mid, messages.get(userId='me', id=mid, format='full', fields=STRUCTURE_FIELDS))
+            for mid in message_ids
+        ])
+
+        html_parts = {}
+        data_requests = []
+        for mid in message_ids:
+            structure = structures.get(mid)
+            found = self._find_html_part(structure['payload']) if structure else None
+            if found is None:
+                continue
+            path, part = found
+            html_parts[mid] = part.get('partId')
+            attachment_id = part.get('body', {}).get('attachmentId')
+            if attachment_id:
+                request = messages.attachments().get(
+                    userId='me', messageId=mid, id=attachment_id, fields='data'
+                )
+            else:
+                # 같은 깊이의 파트 데이터만 — 부분 응답은 파트를 골라 받을 수 없으므로
+                # 같은 깊이에 있는 다른 인라인 파트(text/plain 대체 본문, attachmentId 없는 작은 이미지 등)의
+                # 데이터도 같이 옴 (attachmentId가 있는 첨부만 빠짐), 응답에서는 partId로 HTML 파트를 찾음
+                mask = 'payload' + '/parts' * len(path) + '(partId,body/data)'
+                request = messages.get(userId='me', id=mid, format='full', fields=mask)
+            data_requests.append((mid, request))
+
+        bodies = self._batch_execute(data_requests)
+
+        results = []
+        for mid in message_ids:
+            body = bodies.get(mid)
+            html = None
+            if body is not None:
+                if 'payload' in body:
+                    part = self._part_by_id(body['payload'], html_parts[mid]) or {}
+                    data = part.get('body', {}).get('data')
+                else:
+                    data = body.get('data')
+                if data:
+                    html = _decode_body(data)
+            elif mid in structures and mid not in html_parts:
+                # 구조에서 HTML 파트를 못 찾은 경우 (4단계보다 깊은 구조 등) — 전체 메일에서 탐색
+                msg = messages.get(userId='me', id=mid, format='full').execute()
+                html = self._extract_html(msg)
+            results.append((mid, html))
+        return results
+
+    def _fetch_html_direct(self, mid):
+        """메일 하나의 HTML 본문 — 부분 응답으로 파트 구조 + 본문 데이터를 한 번에 (실패하면 None)"""
+        messages = self.service.users().messages()
+        try:
+            with span('gmail.get'):
+                msg = messages.get(userId='me', id=mid, format='full', fields=BODY_FIELDS).execute()
+            found = self._find_html_part(msg['payload'])
+            if found is None:
+                # 4단계보다 깊은 구조 등 — 전체 메일에서 탐색
+                with span('gmail.get'):
+                    msg = messages.get(userId='me', id=mid, format='full').execute()
+                return self._extract_html(msg)
+            body = found[1].get('body', {})
+            data = body.get('data')
+            if not data and body.get('attachmentId'):
+                with span('gmail.get'):
+                    data = messages.attachments().get(
+                        userId='me', messageId=mid, id=body['attachmentId'], fields='data'
+                    ).execute().get('data')
+        except Exception as e:
+            print(f'[KAIF Newsletter] 메일 조회 실패 ({mid}): {e}')
+            return None
+        return _decode_body(data) if data else None
 
-        return items
+    def _find_html_part(self, payload, path=()):
+        """
+        파트 구조에서 내용이 있는 첫 text/html 파트 — 반환: (파트 인덱스 경로, 파트) 또는 None
+        빈 HTML 파트(크기 0, 첨부 id 없음)는 건너뛰고 다음 후보를 찾음
+        """
+        if payload.get('mimeType') == 'text/html':
+            body = payload.get('body', {})
+            if body.get('size') or body.get('data') or body.get('attachmentId'):
+                return path, payload
+        for index, part in enumerate(payload.get('parts', [])):
+            found = self._find_html_part(part, path + (index,))
+            if found:
+                return found
+        return None
+
+    def _part_by_id(self, payload, part_id):
+        """부분 응답 payload에서 partId가 같은 파트 (없으면 None)"""
+        if payload.get('partId') == part_id:
+            return payload
+        for part in payload.get('parts', []):
+            found = self._part_by_id(part, part_id)
+            if found is not None:
+                return found
+        return None
 
     def _extract_html(self, msg):
         """메일 payload에서 text/html 파트를 재귀 탐색 후 base64url 디코딩"""
@@ -86,7 +574,7 @@ class KAIFNewsletterParser:
             if payload.get('mimeType') == 'text/html':
                 data = payload.get('body', {}).get('data', '')
                 if data:
-                    return base64.urlsafe_b64decode(data + '==').decode('utf-8', errors='replace')
+                    return _decode_body(data)
             for part in payload.get('parts', []):
                 result = find_html(part)
                 if result:
@@ -95,34 +583,26 @@ class KAIFNewsletterParser:
 
         return find_html(msg['payload'])
 
-    def _get_text(self, tag):
-        """태그 텍스트 추출: \xa0 정규화 + 줄바꿈/연속공백 정리"""
-        import re
-        text = tag.get_text(strip=False).replace('\xa0', ' ')
-        return re.sub(r'\s+', ' ', text).strip()
-
     def _parse_sections(self, html, date):
         """HTML에서 원자력계 소식/이벤트 섹션의 링크만 추출.
 
-        전략: html.parser로 파싱 후 모든 태그를 document order로 순차 스캔.
+        전략: lxml HTMLParser target으로 한 번만 훑어 헤더 후보/링크를 문서 순서로 기록한 뒤 순서대로 재생.
         - div/td/span의 짧은 텍스트(30자 미만)로 섹션 진입/이탈 감지
         - 섹션 헤더와 링크가 다른 <table>에 있으므로 조상 기반 탐색은 불가
-        - find_all(True)로 depth-first 전체 순회
+        - 헤더 판정은 요소가 닫힐 때 확정되지만 효과는 요소 시작 위치부터 적용 (기존 순회 순서와 동일)
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        events = []
+        if html and html.strip():
+            events = etree.fromstring(html, etree.HTMLParser(target=_SectionCollector()))
         date_str = date.strftime('%Y.%m.%d')
         items = []
         seen_urls = set()
         current_section = None
 
-        for tag in soup.find_all(True):
-            if tag.name in ('script', 'style', 'head', 'meta', 'link'):
-                continue
-
-            # 섹션 헤더 감지: div/td/span 중 30자 미만 텍스트
-            if tag.name in ('div', 'td', 'span'):
-                text = self._get_text(tag)
-                if 0 < len(text) < 30:
+        for kind, frame in events:
+            if kind == 'header':
+                text = frame['header']
+                if text:
                     matched = False
                     for keyword, category in self.TARGET_SECTIONS.items():
                         if keyword in text:
@@ -134,51 +614,43 @@ class KAIFNewsletterParser:
                             if skip in text:
                                 current_section = None
                                 break
+                continue
 
             # 링크 수집: 수집 대상 섹션 안의 <a> 태그만
-            if tag.name == 'a' and current_section:
-                href = tag.get('href', '')
-                # 수신거부·내비게이션 링크 제외
-                if 'neo_reject' in href:
-                    continue
-
-                if current_section == 'nuclear_events':
-                    # 이벤트: <a> 안의 직계 <span> 2개 — 첫째=제목(초록), 둘째=날짜/장소
-                    spans = tag.find_all('span', recursive=False)
-                    if len(spans) >= 2:
-                        event_title = self._get_text(spans[0])
-                        date_loc = self._get_text(spans[1])
-                        display_title = f"{event_title} / {date_loc}" if date_loc else event_title
-                    else:
-                        display_title = self._get_text(tag)
-                else:
-                    display_title = self._get_text(tag)
-
-                if '수신거부' in display_title or '>' in display_title:
-                    continue
-
-                if not href.startswith('http') or len(display_title) <= 3 or href in seen_urls:
-                    continue
-
-                # 소식: 같은 <tr>의 3번째 <td>에서 단체명 추출
-                if current_section == 'nuclear_news':
-                    org = ''
-                    tr = tag.find_parent('tr')
-                    if tr:
-                        tds = tr.find_all('td', recursive=False)
-                        if len(tds) >= 3:
-                            org = self._get_text(tds[-1])
-                    if org:
-                        display_title = f"{display_title} - {org}"
-
-                seen_urls.add(href)
-                items.append({
-                    'title': display_title,
-                    'url': href,
-                    'source': 'kaif_newsletter',
-                    'date': date_str,
-                    'category': current_section,
-                })
+            if not current_section:
+                continue
+            href = frame['href']
+            # 수신거부·내비게이션 링크 제외
+            if 'neo_reject' in href:
+                continue
+
+            if current_section == 'nuclear_events' and len(frame['spans']) >= 2:
+                # 이벤트: <a> 안의 직계 <span> 2개 — 첫째=제목(초록), 둘째=날짜/장소
+                event_title, date_loc = frame['spans']
+                display_title = f"{event_title} / {date_loc}" if date_loc else event_title
+            else:
+                display_title = frame['text']
+
+            if '수신거부' in display_title or '>' in display_title:
+                continue
+
+            if not href.startswith('http') or len(display_title) <= 3 or href in seen_urls:
+                continue
+
+            # 소식: 같은 <tr>의 3번째 <td>에서 단체명 추출
+            if current_section == 'nuclear_news':
+                org = frame['tr'].get('org', '') if frame['tr'] is not None else ''
+                if org:
+                    display_title = f"{display_title} - {org}"
+
+            seen_urls.add(href)
+            items.append({
+                'title': display_title,
+                'url': href,
+                'source': 'kaif_newsletter',
+                'date': date_str,
+                'category': current_section,
+            })
 
         nuclear_news_count = sum(1 for i in items if i['category'] == 'nuclear_news')
         nuclear_events_count = sum(1 for i in items if i['category'] == 'nuclear_events')
@@ -189,6 +661,6 @@ class KAIFNewsletterParser:
 
 if __name__ == '__main__':
     parser = KAIFNewsletterParser()
-    items = parser.fetch_latest_newsletter()
+    items = parser.fetch()
     for item in items:
         print(f"[{item['category']}] {item['title']} → {item['url']}")
@@ -0,0 +1,81 @@
+# 원자력 키워드 매칭 엔진
+# 키워드 목록을 한 번 컴파일해 모든 크롤러가 공유
+# 키워드가 많으면 Aho-Corasick 오토마톤 — 항목당 비용은 텍스트 길이에만 비례 (키워드 수가 늘어도 거의 일정)
+
+# -*- coding: utf-8 -*-
+from multi_matcher import AhoCorasick
+
+# 전력·원자력 관련 키워드 (S2N4 섹션 대체)
+NUCLEAR_KEYWORDS = [
+    '원자력', '원전', '한수원', '핵연료', '방사선', 'SMR', '핵발전',
+    '우라늄', '체코 원전', '두코바니', '한전기술', '한전원자력',
+    '전력거래소', '한전KDN', '한전KPS', '방사성', 'IAEA'
+]
+
+# 이보다 키워드가 적으면 오토마톤 대신 str 포함 검사 (C 구현이라 수십 개까지는 더 빠름)
+SCAN_MAX_KEYWORDS = 48
+
+# 기본 매칭 대상 필드
+DEFAULT_FIELDS = ('title', 'preview', 'content')
+
+
+class KeywordMatcher:
+    """
+    키워드 목록을 한 번 컴파일해 재사용하는 매처
+    ignore_case=True면 영문 키워드를 대소문자 구분 없이 매칭
+    """
+
+    def __init__(self, keywords, ignore_case=False):
+        # 중복 제거 (순서 유지)
+        self.keywords = list(dict.fromkeys(kw for kw in keywords if kw))
+        self.ignore_case = ignore_case
+        self._patterns = [kw.lower() for kw in self.keywords] if ignore_case else self.keywords
+        self._automaton = AhoCorasick(self._patterns) if len(self.keywords) >= SCAN_MAX_KEYWORDS else None
+
+    def _collect(self, text, found):
+        """텍스트에 나온 키워드 번호를 found에 추가"""
+        if self.ignore_case:
+            text = text.lower()
+        if self._automaton is not None:
+            return self._automaton.matched(text, found)
+        for i, pattern in enumerate(self._patterns):
+            if pattern in text:
+                found.add(i)
+        return found
+
+    def find(self, text):
+        """텍스트에 나온 키워드 목록 (사전 순서, 중복 없음)"""
+        if not text:
+            return []
+        return [self.keywords[i] for i in sorted(self._collect(text, set()))]
+
+    def match_item(self, item, fields=DEFAULT_FIELDS):
+        """기사 dict의 여러 필드를 합쳐 매칭한 키워드 목록 (번호를 모아 마지막에 한 번만 정렬)"""
+        found = set()
+        for field in fields:
+            value = item.get(field)
+            if value:
+                self._collect(value, found)
+        return [self.keywords[i] for i in sorted(found)]
+
+    def tag(self, items, fields=DEFAULT_FIELDS):
+        """각 기사에 'keywords' 필드로 매칭 결과 기록 후 그대로 반환"""
+        for item in items:
+            item['keywords'] = self.match_item(item, fields)
+        return items
+
+    def filter(self, items, fields=DEFAULT_FIELDS):
+        """키워드가 하나라도 나온 기사만 ('keywords' 필드 기록)"""
+        return [item for item in self.tag(items, fields) if item['keywords']]
+
+
+_matchers = {}
+
+
+def get_matcher(keywords=None, ignore_case=False):
+    """키워드 목록별로 컴파일된 매처를 캐시해 공유 (기본: NUCLEAR_KEYWORDS)"""
+    key = (tuple(keywords or NUCLEAR_KEYWORDS), ignore_case)
+    matcher = _matchers.get(key)
+    if matcher is None:
+        matcher = _matchers[key] = KeywordMatcher(key[0], ignore_case=ignore_case)
+    return matcher
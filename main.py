@@ -2,95 +2,320 @@
 # 여러 크롤러를 통합 관리
 
 # -*- coding: utf-8 -*-
-from crawler_energy_news import crawl_energy_news
-from crawler_knpnews import crawl_knpnews
-from crawler_kaif import crawl_kaif
-from kaif_newsletter import KAIFNewsletterParser
-import json
-from datetime import datetime
-
-def crawl_all_news():
+# 크롤러/Selenium/Gmail 모듈은 실제로 쓰는 경로에서만 불러옴 (lazy_import)
+#   python main.py               전체 크롤링 + Slack 전송
+#   python main.py --rss         RSS 피드만 수집 (Chrome/Gmail 없이) + Slack 전송
+#   python main.py --slack-only  저장된 결과로 Slack 전송만
+#   --no-slack: 전송 생략, --no-json: 결과 JSON 파일 저장 생략, --import-report: 모듈별 import 시간 출력
+# 크롤링 결과는 CrawlResult로 요약/Slack 단계에 바로 넘기고, JSON 파일은 백그라운드로 저장 (json_sink.py)
+#   --record DIR [--record-webhook URL] / --replay DIR [--latency MS|recorded]: HTTP·Gmail·렌더링 페이지 녹화/오프라인 재생 (cassette.py)
+#   (녹화는 빈 전송 이력으로 시작하므로 SLACK_WEBHOOK_URL로는 보내지 않음 — 테스트용 --record-webhook 또는 --no-slack)
+import time
+
+_STARTED = time.perf_counter()
+
+from datetime import datetime, timedelta
+import argparse
+import importlib
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+from crawl_result import ALL_NEWS_FILE, CrawlResult
+from json_sink import SINK
+from metrics import METRICS, span
+
+ENERGY_NEWS_URL = "https://www.energy-news.co.kr/news/articleList.html?sc_sub_section_code=S2N4&view_type=sm"
+KNPNEWS_URL = "https://www.knpnews.com/news/articleList.html?sc_section_code=S1N1&view_type=sm"
+KAIF_URL = "https://www.kaif.or.kr/ko/ko/?c=250&s=250"
+
+# 병렬 크롤링 시 동시에 띄울 Chrome 최대 개수
+MAX_BROWSERS = int(os.getenv('NEWSBOT_MAX_BROWSERS', '2'))
+
+# lazy_import로 불러온 모듈별 import 시간 (초, 하위 모듈 포함)
+IMPORT_TIMES = {}
+
+
+def lazy_import(module_name):
+    """모듈을 처음 쓸 때 import하고 걸린 시간을 IMPORT_TIMES에 기록"""
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    IMPORT_TIMES[module_name] = time.perf_counter() - started
+    return module
+
+
+def report_imports(ready_at):
+    """import 시간 보고 — 느린 모듈순"""
+    print(f"[IMPORT] 시작 → 작업 시작까지 {ready_at * 1000:.0f}ms")
+    for name, seconds in sorted(IMPORT_TIMES.items(), key=lambda kv: -kv[1]):
+        print(f"[IMPORT] {name:<24} {seconds * 1000:>7.1f}ms")
+    heavy = [name for name in ('selenium', 'googleapiclient', 'google_auth_oauthlib') if name in sys.modules]
+    print(f"[IMPORT] 로드된 무거운 패키지: {', '.join(heavy) if heavy else '없음'}")
+
+
+def crawl_newsletter():
+    """KAIF 뉴스레터 (Gmail) - 원자력계 소식/이벤트 파싱"""
+    # all_news에 추가하지 않음 — CrawlResult.newsletter_items로 따로 전달
+    return lazy_import('kaif_newsletter').KAIFNewsletterParser().fetch()
+
+
+def build_sources(pool):
+    """크롤링 소스 목록: (키, 표시명, 실행 함수, 타임아웃(초))"""
+    # 워커 스레드끼리 import가 겹치지 않도록 제출 전에 불러 둠
+    energy = lazy_import('crawler_energy_news')
+    knp = lazy_import('crawler_knpnews')
+    kaif = lazy_import('crawler_kaif')
+    return [
+        ('energy_news', '에너지신문', lambda: energy.crawl_energy_news(ENERGY_NEWS_URL, pool=pool), 180),
+        ('knpnews', '한국원자력산업신문', lambda: knp.crawl_knpnews(KNPNEWS_URL, pool=pool), 180),
+        ('kaif', '한국원자력산업회의 (어제 날짜 게시물)', lambda: kaif.crawl_kaif(KAIF_URL, pool=pool), 300),
+        ('kaif_newsletter', 'KAIF 뉴스레터 (원자력계 소식/이벤트)', crawl_newsletter, 120),
+    ]
+
+
+def rss_cutoff():
+    """RSS 수집 기준 시각: 어제 00:00 (KST) — 요약 대상(어제/오늘) 이전 구간은 피드를 끝까지 읽지 않음"""
+    now = lazy_import('news_dates').now_kst()
+    return (now - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def build_rss_sources():
     """
-    모든 뉴스 사이트에서 크롤링
+    RSS 전용 소스 목록 — Chrome/Gmail 없이 에너지신문·원자력산업신문 피드만
+    등록된 피드 전체를 한 FeedBatch로 동시에 수집하고 소스별 크롤러는 자기 몫만 받아 저장
+    """
+    energy = lazy_import('crawler_energy_news_rss')
+    knp = lazy_import('crawler_knpnews_rss')
+    batch = lazy_import('feed_engine').FeedBatch(since=rss_cutoff())
+    return [
+        ('energy_news', '에너지신문 (RSS)', lambda: energy.crawl_energy_news_rss(batch=batch), 60),
+        ('knpnews', '한국원자력산업신문 (RSS)', lambda: knp.crawl_knpnews_rss(batch=batch), 60),
+    ]
+
+
+def _run_source(key, func, box):
+    """소스 하나 실행 — 결과/예외를 box에 담고, 전체 소요 시간을 '<키>.total' 구간으로 기록"""
+    try:
+        with span(f'{key}.total'):
+            box['result'] = func()
+    except Exception as e:
+        box['error'] = e
+
+
+def run_sources(sources, failed=None):
+    """
+    소스별 크롤러를 각자의 스레드에서 병렬 실행
+    - 소스마다 개별 타임아웃 적용 (모든 소스가 동시에 시작하므로 시작 시각 기준)
+    - 한 소스의 예외/타임아웃은 해당 소스만 빈 결과로 처리 (failed 리스트가 주어지면 키 추가)
+    - 타임아웃은 스레드를 멈추지 못함: 실제 상한은 I/O 계층(HTTP/Gmail 요청, WebDriver 페이지 로딩)에서 걸고,
+      여기서는 기다림을 끝내고 늦게 나오는 결과/JSON 기록을 버림
+      (데몬 스레드라 멈춘 크롤러가 있어도 프로세스 종료를 막지 않음)
+    반환: {키: 결과 리스트}
+    """
+    results = {}
+    started = time.monotonic()
+    running = []
+    for key, label, func, timeout in sources:
+        print(f"[START] {label} 크롤링 시작")
+        box = {}
+        thread = threading.Thread(target=_run_source, args=(key, func, box),
+                                  name=f'crawler-{key}', daemon=True)
+        thread.start()
+        running.append((key, label, timeout, thread, box))
+
+    for key, label, timeout, thread, box in running:
+        thread.join(max(0, timeout - (time.monotonic() - started)))
+        if thread.is_alive():
+            SINK.abandon(thread)
+            print(f"[TIMEOUT] {label}: {timeout}초 초과, 결과 없이 진행")
+            METRICS.count(f'{key}.timeouts')
+        elif 'error' in box:
+            print(f"[SKIP] {label} 수집 실패: {box['error']}")
+            METRICS.count(f'{key}.failures')
+        else:
+            results[key] = box.get('result') or []
+            print(f"[OK] {label}: {len(results[key])}개 수집 ({time.monotonic() - started:.1f}초)")
+        if key not in results:
+            results[key] = []
+            if failed is not None:
+                failed.append(key)
+
+    return results
+
+
+def update_search_index(result):
+    """전문 검색 색인에 이번 수집분 반영 (새 기사/내용이 바뀐 기사만, 실패해도 요약/전송은 계속)"""
+    try:
+        with span('search.index'):
+            counts = lazy_import('article_search').get_search().index_result(result)
+    except sqlite3.Error as e:
+        print(f"[SKIP] 검색 색인 갱신 실패: {e}")
+        return
+    added = sum(n for n, _ in counts.values())
+    updated = sum(n for _, n in counts.values())
+    print(f"[OK] 검색 색인: 새 문서 {added}개, 재색인 {updated}개")
+
+
+def crawl_all_news(rss_only=False):
+    """
+    모든 뉴스 사이트에서 병렬 크롤링
+    rss_only: RSS 피드만 수집 (KAIF 게시판/뉴스레터 제외, Selenium/Gmail 모듈을 불러오지 않음)
+    반환: CrawlResult (실패한 소스는 빈 결과 — 지난 실행 파일로 채우지 않음)
     """
     print("="*100)
-    print("원자력 뉴스 크롤링 시작")
+    print("원자력 뉴스 크롤링 시작" + (" (RSS 전용)" if rss_only else ""))
     print(f"시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*100)
 
-    all_news = []
-    kaif_posts = []
-
-    # 1. 에너지신문 크롤링
-    print("\n[1/3] 에너지신문 크롤링 중...")
-    print("-"*100)
-    energy_news_url = "https://www.energy-news.co.kr/news/articleList.html?sc_sub_section_code=S2N4&view_type=sm"
-    energy_news = crawl_energy_news(energy_news_url)
-    all_news.extend(energy_news)
-
-    # 2. 한국원자력산업신문 크롤링
-    print("\n[2/3] 한국원자력산업신문 크롤링 중...")
-    print("-"*100)
-    knpnews_url = "https://www.knpnews.com/news/articleList.html?sc_section_code=S1N1&view_type=sm"
-    knp_news = crawl_knpnews(knpnews_url)
-    all_news.extend(knp_news)
-
-    # 3. 한국원자력산업회의 크롤링 (오늘 날짜만)
-    print("\n[3/4] 한국원자력산업회의 크롤링 중 (오늘 날짜 게시물)...")
-    print("-"*100)
-    kaif_url = "https://www.kaif.or.kr/ko/ko/?c=250&s=250"
-    kaif_posts = crawl_kaif(kaif_url)
-
-    # 4. KAIF 뉴스레터 (Gmail) - 원자력계 소식/이벤트 파싱
-    print("\n[4/4] KAIF 뉴스레터 파싱 중 (원자력계 소식/이벤트)...")
-    print("-"*100)
-    newsletter_items = []
-    try:
-        newsletter_items = KAIFNewsletterParser().fetch_latest_newsletter()
-        # all_news에 추가하지 않음 — kaif_newsletter_data.json에 별도 저장됨
-        print(f"[OK] 뉴스레터 항목 {len(newsletter_items)}개 수집")
-    except Exception as e:
-        print(f"[SKIP] KAIF 뉴스레터 수집 실패 (Gmail 미설정?): {e}")
-
-    # 전체 결과 저장
-    output_file = 'all_news_data.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump({
-            'crawled_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'total_count': len(all_news),
-            'kaif_posts_count': len(kaif_posts),
-            'sources': {
-                'energy_news': len(energy_news),
-                'knpnews': len(knp_news),
-                'kaif': len(kaif_posts),
-                'kaif_newsletter': len(newsletter_items)
-            },
-            'news_list': all_news,
-            'kaif_posts': kaif_posts
-        }, f, ensure_ascii=False, indent=2)
+    http_fetch = lazy_import('http_fetch')
+    http_fetch.reset_paths()
+    failed = []
+    with span('crawl'):
+        if rss_only:
+            results = run_sources(build_rss_sources(), failed=failed)
+        else:
+            # HTTP 우선 수집, Selenium이 필요한 소스만 Chrome 풀을 공유
+            # (Chrome은 처음 필요할 때만 실행, 종료 시 브라우저/프로필 한 번에 정리)
+            browser_pool = lazy_import('browser_pool')
+            with browser_pool.DriverPool(max_browsers=MAX_BROWSERS) as pool:
+                results = run_sources(build_sources(pool), failed=failed)
+
+    result = CrawlResult.from_sources(results, failed)
+
+    # 전체 결과 저장 (백그라운드 기록) + 전문 검색 색인 갱신
+    saved = SINK.write(ALL_NEWS_FILE, result.to_dict())
+    update_search_index(result)
 
     print("\n" + "="*100)
     print("크롤링 완료!")
-    print(f"뉴스 기사: {len(all_news)}개 (에너지신문: {len(energy_news)}, 한국원자력산업신문: {len(knp_news)}, 뉴스레터: {len(newsletter_items)})")
-    print(f"KAIF 오늘 게시물: {len(kaif_posts)}개")
-    print(f"결과 파일: {output_file}")
+    print(f"뉴스 기사: {len(result.news)}개 (에너지신문: {len(result.energy_news)}, 한국원자력산업신문: {len(result.knp_news)}, 뉴스레터: {len(result.newsletter_items)})")
+    print(f"KAIF 오늘 게시물: {len(result.kaif_posts)}개")
+    if result.failed:
+        print(f"[SKIP] 수집 실패 소스: {', '.join(sorted(result.failed))}")
+    print(f"결과 파일: {ALL_NEWS_FILE if saved else '저장 안 함'}")
+    http_fetch.report_paths()
+    # 페이지 준비 시간은 Selenium 경로를 탄 경우에만 (RSS 전용 실행에서는 page_wait를 불러오지 않음)
+    page_wait = sys.modules.get('page_wait')
+    for site, stat in (page_wait.STATS.summary().items() if page_wait else ()):
+        print(f"페이지 준비 시간 [{site}] p50 {stat['p50'] or '-'}초 / p95 {stat['p95'] or '-'}초 / 타임아웃 {stat['timeouts']}회 (다음 타임아웃 {stat['timeout']:.1f}초)")
+    if page_wait:
+        page_wait.STATS.save()
     print(f"종료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*100)
 
-    return all_news, kaif_posts
+    return result
 
 
-if __name__ == "__main__":
-    import os
+def write_run_metrics(args, ready_at):
+    """run_metrics.json에 실행 모드/수집 경로/import 시간을 함께 기록"""
+    http_fetch = sys.modules.get('http_fetch')
+    page_wait = sys.modules.get('page_wait')
+    mode = 'slack_only' if args.slack_only else 'rss' if args.rss else 'full'
+    return METRICS.write(extra={
+        'mode': mode,
+        'startup_ms': round(ready_at * 1000, 1),
+        'imports_ms': {name: round(seconds * 1000, 1) for name, seconds in IMPORT_TIMES.items()},
+        'fetch_paths': {source: dict(counter) for source, counter in http_fetch.FETCH_PATHS.items()} if http_fetch else {},
+        'page_load': page_wait.STATS.summary() if page_wait else {},
+    })
+
+
+def setup_cassette(args):
+    """
+    --record/--replay 준비 — 카세트 모듈 설정을 다른 모듈 import보다 먼저 해 둠
+    실행은 <카세트>/work 에서 빈 상태(본 기사 DB, 피드 캐시, 동기화 상태 없음)로 시작해
+    녹화와 재생이 같은 요청 순서를 밟도록 함
+    재생 시 시계는 녹화 시각으로 고정 (NEWSBOT_NOW가 이미 있으면 그대로)
+    """
+    mode = 'record' if args.record else 'replay'
+    directory = os.path.abspath(args.record or args.replay)
+    # 작업 디렉토리를 옮기기 전에 Gmail 인증 파일 경로를 절대 경로로 고정
+    for name, default in (('NEWSBOT_GMAIL_TOKEN', 'token.json'), ('NEWSBOT_GMAIL_CREDENTIALS', 'credentials.json')):
+        os.environ[name] = os.path.abspath(os.getenv(name, default))
+
+    cassette = lazy_import('cassette')
+    tape = cassette.configure(mode, directory, args.latency)
+    if mode == 'record':
+        # 녹화는 빈 전송 이력으로 시작하므로 Slack 전송은 --record-webhook으로 준 주소로만
+        if args.record_webhook:
+            os.environ['SLACK_WEBHOOK_URL'] = args.record_webhook
+        tape.set_meta(recorded_at=lazy_import('news_dates').now_kst().isoformat(), argv=sys.argv[1:])
+    else:
+        if tape.meta.get('recorded_at'):
+            os.environ.setdefault('NEWSBOT_NOW', tape.meta['recorded_at'])
+        # 녹화본에 Slack 전송이 있으면 Webhook 없이도 같은 전송 경로를 재생
+        if any(i['key'] == 'POST slack-webhook' for i in tape.interactions):
+            os.environ.setdefault('SLACK_WEBHOOK_URL', 'https://hooks.slack.com/services/replay')
+
+    work_dir = os.path.join(directory, 'work')
+    shutil.rmtree(work_dir, ignore_errors=True)
+    os.makedirs(work_dir)
+    os.chdir(work_dir)
+    os.environ['NEWSBOT_SEEN_DB'] = 'seen_articles.db'
+    print(f"[Cassette] {'녹화' if mode == 'record' else '재생'} 모드: {directory} (작업 디렉토리 {work_dir})")
+    return tape
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='원자력 뉴스봇')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--rss', action='store_true', help='RSS 피드만 수집 (Chrome/Gmail 사용 안 함)')
+    mode.add_argument('--slack-only', action='store_true', help='크롤링 없이 저장된 결과로 Slack 전송만')
+    parser.add_argument('--no-slack', action='store_true', help='크롤링만 하고 Slack 전송 안 함')
+    parser.add_argument('--no-json', action='store_true', help='결과 JSON 파일 저장 안 함 (--slack-only용 파일도 남지 않음)')
+    parser.add_argument('--import-report', action='store_true', help='모듈별 import 시간 출력')
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument('--record', metavar='DIR', help='HTTP/Gmail/렌더링 페이지 응답을 카세트 디렉토리에 녹화')
+    cassette.add_argument('--replay', metavar='DIR', help='녹화한 카세트로 네트워크/Chrome 없이 재실행')
+    parser.add_argument('--record-webhook', metavar='URL',
+                        help='녹화 중 Slack 전송에 쓸 Webhook (테스트 채널 등, SLACK_WEBHOOK_URL 대신 사용)')
+    parser.add_argument('--latency', default='0',
+                        help="재생 시 응답마다 넣을 지연 (ms, 또는 'recorded' = 녹화 당시 응답 시간)")
+    args = parser.parse_args(argv)
+    if args.slack_only and (args.record or args.replay):
+        parser.error('--slack-only는 카세트 모드와 함께 쓸 수 없습니다 (카세트 실행은 빈 작업 디렉토리에서 시작)')
+    if args.record_webhook and not args.record:
+        parser.error('--record-webhook은 --record와 함께만 쓸 수 있습니다')
+    if args.record and not args.no_slack and not args.record_webhook and os.getenv('SLACK_WEBHOOK_URL'):
+        # 녹화는 빈 전송 이력에서 시작 — 운영 채널에 요약 전체가 다시 올라가지 않도록 거부
+        parser.error('--record는 전송 이력 없이 시작하므로 SLACK_WEBHOOK_URL 채널에 요약 전체를 다시 보냅니다 '
+                     '(테스트용 --record-webhook URL을 주거나 --no-slack 사용)')
+    return args
 
-    # 1. 모든 뉴스 크롤링
-    crawl_all_news()
 
-    # 2. 어제의 뉴스 요약 및 Slack 전송
-    print("\n")
-    from slack_formatter import main_with_slack
+def main(argv=None):
+    args = parse_args(argv)
+    tape = setup_cassette(args) if args.record or args.replay else None
+    ready_at = time.perf_counter() - _STARTED
+    METRICS.reset()
 
-    # Slack Webhook URL (환경 변수에서 가져옴)
-    SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
+    if args.no_json:
+        SINK.enabled = False
 
-    main_with_slack(SLACK_WEBHOOK_URL)
+    try:
+        # 1. 뉴스 크롤링 (--slack-only면 결과 없음 → 저장된 파일에서 읽음)
+        result = None if args.slack_only else crawl_all_news(rss_only=args.rss)
+
+        # 2. 어제의 뉴스 요약 및 Slack 전송 (크롤링 결과를 파일 대신 메모리로 전달)
+        if not args.no_slack:
+            print("\n")
+            slack_formatter = lazy_import('slack_formatter')
+            # Slack Webhook URL (환경 변수에서 가져옴)
+            slack_formatter.main_with_slack(os.getenv("SLACK_WEBHOOK_URL"), result=result)
+    finally:
+        # 남은 JSON 기록 마무리 후 실행별 계측 저장 (run_metrics.json — 이전 실행보다 크게 느려진 구간은 [SLOWER] 표시)
+        SINK.close()
+        write_run_metrics(args, ready_at)
+        if tape is not None:
+            tape.report()
+
+    if args.import_report:
+        report_imports(ready_at)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# 실행 계측
+# 크롤러/단계별 구간(span) 시간, WebDriver 명령·HTTP 요청 수와 지연 히스토그램을 모아
+# 실행이 끝나면 run_metrics.json으로 저장 (이전 실행 파일과 비교해 느려진 구간 출력)
+#   span 이름: '<소스>.<단계>' (예: energy_news.load, kaif_newsletter.bodies, browser.launch, slack.send)
+#   webdriver: 명령별 (get, executeScript, findElements ...)
+#   http: 호스트별 (requests 공용 세션 응답 훅 — 헤더 수신까지의 시간)
+
+# -*- coding: utf-8 -*-
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlsplit
+import json
+import os
+import threading
+import time
+
+METRICS_FILE = 'run_metrics.json'
+
+# 히스토그램 버킷 상한 (ms) — 마지막 버킷은 그 이상 전부
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+MAX_SAMPLES = 2000          # 백분위 계산용으로 보관할 최근 표본 수 (키별)
+REGRESSION_FACTOR = 1.5     # 이전 실행 대비 이 배수 이상 느려지면 보고
+REGRESSION_MIN_MS = 50      # 너무 짧은 구간은 비교에서 제외
+
+
+class Histogram:
+    """지연 시간 히스토그램 (ms) — 횟수/합계/최소/최대 + 버킷 + 최근 표본 백분위"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.samples = []
+
+    def observe(self, ms):
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+        self.buckets[bisect_left(BUCKETS_MS, ms)] += 1
+        self.samples.append(ms)
+        if len(self.samples) > MAX_SAMPLES:
+            del self.samples[:-MAX_SAMPLES]
+
+    def percentile(self, q):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def to_dict(self):
+        labels = [f'<={b}' for b in BUCKETS_MS] + [f'>{BUCKETS_MS[-1]}']
+        return {
+            'count': self.count,
+            'total_ms': round(self.total, 1),
+            'min_ms': round(self.min, 1) if self.min is not None else None,
+            'max_ms': round(self.max, 1) if self.max is not None else None,
+            'p50_ms': _round(self.percentile(0.5)),
+            'p95_ms': _round(self.percentile(0.95)),
+            'buckets': {label: n for label, n in zip(labels, self.buckets) if n},
+        }
+
+
+def _round(value):
+    return round(value, 1) if value is not None else None
+
+
+class Metrics:
+    """
+    실행 단위 계측 저장소 (스레드 안전)
+    kind별로 이름 → Histogram: 'span'(구간), 'webdriver'(명령), 'http'(호스트)
+    """
+
+    KINDS = ('span', 'webdriver', 'http')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now()
+            self._started = time.perf_counter()
+            self.timings = {kind: {} for kind in self.KINDS}
+            self.counters = Counter()
+
+    def observe(self, kind, name, ms):
+        with self._lock:
+            hist = self.timings[kind].get(name)
+            if hist is None:
+                hist = self.timings[kind][name] = Histogram()
+            hist.observe(ms)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    @contextmanager
+    def span(self, name):
+        """with METRICS.span('energy_news.load'): ... — 예외가 나도 시간은 기록 (+ '<name>.errors' 카운터)"""
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.count(f'{name}.errors')
+            raise
+        finally:
+            self.observe('span', name, (time.perf_counter() - started) * 1000)
+
+    def snapshot(self):
+        """현재까지의 계측값 dict (JSON 저장용)"""
+        with self._lock:
+            timings = {kind: {name: hist.to_dict() for name, hist in sorted(items.items())}
+                       for kind, items in self.timings.items()}
+            counters = dict(sorted(self.counters.items()))
+            wall = time.perf_counter() - self._started
+            started_at = self.started_at
+
+        def totals(items, unit):
+            return {
+                unit: sum(h['count'] for h in items.values()),
+                'total_ms': round(sum(h['total_ms'] for h in items.values()), 1),
+            }
+
+        return {
+            'started_at': started_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'finished_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'wall_seconds': round(wall, 3),
+            'spans': timings['span'],
+            'webdriver': {**totals(timings['webdriver'], 'commands'), 'by_command': timings['webdriver']},
+            'http': {**totals(timings['http'], 'requests'), 'by_host': timings['http']},
+            'counters': counters,
+        }
+
+    def write(self, path=METRICS_FILE, extra=None):
+        """
+        run_metrics.json 저장 — 덮어쓰기 전에 이전 실행과 비교해 느려진 구간 출력
+        extra: 함께 기록할 값 (실행 모드, 수집 경로 등)
+        """
+        data = self.snapshot()
+        if extra:
+            data.update(extra)
+        previous = None
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    previous = json.load(f)
+            except (OSError, ValueError):
+                previous = None
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+        self.report(data, previous)
+        return data
+
+    @staticmethod
+    def report(data, previous=None, top=8):
+        """오래 걸린 구간 상위 top개 + WebDriver/HTTP 합계 출력, 이전 실행보다 크게 느려진 구간 표시"""
+        spans = data['spans']
+        before = (previous or {}).get('spans', {})
+        print(f"[METRICS] 전체 {data['wall_seconds']:.1f}초 | WebDriver 명령 {data['webdriver']['commands']}회 "
+              f"({data['webdriver']['total_ms'] / 1000:.1f}초) | HTTP 요청 {data['http']['requests']}회 "
+              f"({data['http']['total_ms'] / 1000:.1f}초)")
+        for name, stat in sorted(spans.items(), key=lambda kv: -kv[1]['total_ms'])[:top]:
+            line = f"[METRICS] {name:<32} {stat['total_ms']:>9.1f}ms ({stat['count']}회)"
+            old = before.get(name)
+            if old and old['total_ms'] >= REGRESSION_MIN_MS and stat['total_ms'] >= old['total_ms'] * REGRESSION_FACTOR:
+                line += f"  [SLOWER] 이전 {old['total_ms']:.1f}ms"
+            print(line)
+
+
+METRICS = Metrics()
+
+
+def span(name):
+    """공용 METRICS의 구간 타이머"""
+    return METRICS.span(name)
+
+
+def instrument_driver(driver, metrics=None):
+    """
+    WebDriver 인스턴스의 execute()를 감싸 명령별 횟수/지연 기록
+    (find_element, get, execute_script, page_source 등 모든 명령이 execute를 거침)
+    """
+    metrics = metrics or METRICS
+    execute = driver.execute
+
+    def timed_execute(driver_command, params=None):
+        started = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        finally:
+            metrics.observe('webdriver', driver_command, (time.perf_counter() - started) * 1000)
+
+    driver.execute = timed_execute
+    return driver
+
+
+def instrument_session(session, metrics=None):
+    """requests 세션에 응답 훅을 달아 호스트별 요청 수/지연, 상태 코드별 횟수 기록"""
+    metrics = metrics or METRICS
+
+    def on_response(response, *args, **kwargs):
+        host = urlsplit(response.url).netloc or 'unknown'
+        metrics.observe('http', host, response.elapsed.total_seconds() * 1000)
+        metrics.count(f'http.status.{response.status_code}')
+        return response
+
+    session.hooks.setdefault('response', []).append(on_response)
+    return session
@@ -0,0 +1,77 @@
+# 다중 패턴 문자열 매칭 (Aho-Corasick)
+# 여러 패턴을 한 번에 컴파일해, 텍스트를 한 번만 훑어 모든 출현을 찾음
+
+# -*- coding: utf-8 -*-
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    패턴 집합을 오토마톤으로 컴파일 (구축 O(패턴 길이 합), 검색 O(텍스트 길이 + 매칭 수))
+    patterns의 순서가 곧 패턴 번호 — 매칭 결과는 패턴 번호로 반환
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self._goto = [{}]     # 상태별 전이 (문자 → 다음 상태)
+        self._fail = [0]      # 실패 링크
+        self._out = [()]      # 상태에서 끝나는 패턴 번호들
+        self._alphabet = set()  # 패턴에 쓰인 문자 (그 밖의 문자는 바로 시작 상태로)
+
+        for index, pattern in enumerate(self.patterns):
+            if not pattern:
+                continue
+            self._alphabet.update(pattern)
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (index,)
+
+        # BFS로 실패 링크 계산 + 출력 병합
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def iter_matches(self, text):
+        """(끝 위치, 패턴 번호) 순회 — 겹치는 출현도 모두 포함"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in out[state]:
+                yield pos, index
+
+    def matched(self, text, found=None):
+        """
+        텍스트에 한 번 이상 나온 패턴 번호 집합
+        found: 결과를 더할 집합 (여러 필드를 한 집합에 모을 때)
+        """
+        found = set() if found is None else found
+        goto, fail, out, alphabet = self._goto, self._fail, self._out, self._alphabet
+        state = 0
+        for ch in text:
+            if ch not in alphabet:
+                state = 0
+                continue
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
@@ -0,0 +1,136 @@
+# 헤드라인 유사 중복 탐지 (MinHash + LSH)
+# 같은 기사가 에너지신문 / 원자력산업신문 / KAIF 국내기사 링크로 겹쳐 올라오는 경우를 묶어 대표 1건만 남김
+# 제목을 한글 글자 2-gram 집합으로 보고, MinHash 서명의 밴드별 버킷으로 후보만 골라 실제 Jaccard로 확인
+# 항목당 비용은 밴드 수에 비례 — 하루 100건이든 몇 주치 아카이브든 전체 쌍 비교 없이 선형
+
+# -*- coding: utf-8 -*-
+import random
+import re
+import zlib
+
+# 제목 정규화: 말머리([단독], (종합) 등), 문장부호, 공백 제거
+_PREFIX = re.compile(r'^\s*(\[[^\]]{1,10}\]|\([^)]{1,10}\)|【[^】]{1,10}】)\s*')
+_NON_WORD = re.compile(r'[\W_]+')
+
+SHINGLE_SIZE = 2
+NUM_PERM = 32
+BANDS = 16            # 밴드당 2행 → Jaccard 0.25 이상이면 대부분 후보로 잡힘 (확인은 실제 Jaccard로)
+THRESHOLD = 0.62      # 이 이상이면 같은 기사로 판단 (후속 보도 "신청"→"심사 착수" 정도가 0.6)
+
+_MERSENNE = (1 << 61) - 1
+
+
+def normalize_title(title):
+    """비교용 제목 (말머리·문장부호·공백 제거, 영문 소문자)"""
+    if not title:
+        return ''
+    text = title
+    while True:
+        stripped = _PREFIX.sub('', text, count=1)
+        if stripped == text:
+            break
+        text = stripped
+    return _NON_WORD.sub('', text).lower()
+
+
+def title_shingles(title, size=SHINGLE_SIZE):
+    """정규화한 제목의 글자 n-gram 집합 (제목이 n보다 짧으면 제목 전체 1개)"""
+    text = normalize_title(title)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """고정 시드의 (a·x + b) mod p 해시 num_perm개로 MinHash 서명 계산 (실행마다 같은 서명)"""
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = random.Random(seed)
+        self.params = [(rng.randrange(1, _MERSENNE), rng.randrange(0, _MERSENNE)) for _ in range(num_perm)]
+
+    def signature(self, shingles):
+        values = [zlib.crc32(s.encode('utf-8')) for s in shingles]
+        return tuple(min((a * v + b) % _MERSENNE for v in values) for a, b in self.params)
+
+
+class NearDuplicateIndex:
+    """
+    제목 MinHash 서명을 밴드별 버킷에 넣어 두는 LSH 인덱스
+    add()로 항목을 넣으면 이미 있는 유사 항목 그룹에 합류하거나 새 그룹이 됨
+    """
+
+    def __init__(self, threshold=THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+        if num_perm % bands:
+            raise ValueError('num_perm은 bands의 배수여야 합니다')
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self._buckets = [{} for _ in range(bands)]
+        self._shingles = []   # 항목 번호 → shingle 집합
+        self._group = []      # 항목 번호 → 그룹 번호 (그룹 대표 항목 번호)
+
+    def _band_keys(self, signature):
+        r = self.rows
+        return [signature[i * r:(i + 1) * r] for i in range(self.bands)]
+
+    def add(self, title):
+        """
+        제목 하나 추가 — 반환: (항목 번호, 그룹 대표 항목 번호)
+        유사 후보 중 Jaccard가 가장 높은 항목의 그룹에 합류
+        """
+        shingles = title_shingles(title)
+        index = len(self._shingles)
+        self._shingles.append(shingles)
+
+        group = index
+        if shingles:
+            keys = self._band_keys(self.hasher.signature(shingles))
+            candidates = set()
+            for band, key in enumerate(keys):
+                candidates.update(self._buckets[band].get(key, ()))
+
+            best = 0.0
+            for other in candidates:
+                score = jaccard(shingles, self._shingles[other])
+                if score >= self.threshold and score > best:
+                    best, group = score, self._group[other]
+
+            for band, key in enumerate(keys):
+                self._buckets[band].setdefault(key, []).append(index)
+
+        self._group.append(group)
+        return index, group
+
+    def __len__(self):
+        return len(self._shingles)
+
+
+def group_near_duplicates(items, title_key='title', threshold=THRESHOLD):
+    """유사 제목끼리 묶은 그룹 리스트 (입력 순서 유지, 그룹의 첫 항목이 대표)"""
+    index = NearDuplicateIndex(threshold=threshold)
+    groups = {}
+    for item in items:
+        _, group = index.add(item.get(title_key))
+        groups.setdefault(group, []).append(item)
+    return list(groups.values())
+
+
+def dedupe_near_duplicates(items, title_key='title', threshold=THRESHOLD):
+    """
+    그룹별 대표(먼저 나온 항목)만 남긴 리스트
+    대표 항목에는 묶인 다른 항목 수를 'duplicates' 필드로 기록
+    """
+    kept = []
+    for group in group_near_duplicates(items, title_key, threshold):
+        representative = group[0]
+        if len(group) > 1:
+            representative['duplicates'] = len(group) - 1
+        kept.append(representative)
+    return kept
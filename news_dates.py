@@ -0,0 +1,153 @@
+# 기사 날짜 정규화
+# 소스마다 다른 날짜 문자열을 한 번만 해석해 KST aware datetime으로 통일하고,
+# 기사를 날짜별 버킷으로 묶어 특정 날짜/기간 조회를 문자열 비교 없이 인덱스로 처리
+
+# -*- coding: utf-8 -*-
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+import os
+import re
+
+KST = timezone(timedelta(hours=9))
+
+# 2026.04.13 09:01 / 2026-04-13 / 2026/4/13 / 2026년 4월 13일 (월) 09:01
+_FULL_DATE = re.compile(
+    r'(\d{4})\s*[.\-/년]\s*(\d{1,2})\s*[.\-/월]\s*(\d{1,2})\s*일?\.?'
+    r'(?:\s*\([^)]*\))?(?:\s*(\d{1,2}):(\d{2})(?::(\d{2}))?)?'
+)
+# 04.13 09:01 / 4-13 (연도 없음)
+_SHORT_DATE = re.compile(r'^\s*(\d{1,2})[.\-/](\d{1,2})\.?(?:\s+(\d{1,2}):(\d{2}))?\s*$')
+# 오늘 / 어제 / today / yesterday (뒤에 시각이 붙을 수 있음)
+_RELATIVE_DAY = re.compile(r'^\s*(오늘|어제|today|yesterday)\s*(?:(\d{1,2}):(\d{2}))?', re.IGNORECASE)
+_RELATIVE_DAY_OFFSET = {'오늘': 0, 'today': 0, '어제': 1, 'yesterday': 1}
+
+
+def now_kst():
+    """
+    현재 KST 시각 — NEWSBOT_NOW(ISO 8601)가 있으면 그 시각으로 고정
+    ('어제' 기준이 실행 날짜에 따라 바뀌지 않도록, 녹화 재생 시 녹화 시각을 넣음)
+    """
+    fixed = os.getenv('NEWSBOT_NOW')
+    if fixed:
+        dt = datetime.fromisoformat(fixed)
+        return dt.replace(tzinfo=KST) if dt.tzinfo is None else dt.astimezone(KST)
+    return datetime.now(KST)
+
+
+def _kst(year, month, day, hour=0, minute=0, second=0):
+    try:
+        return datetime(year, month, day, hour, minute, second, tzinfo=KST)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=8192)
+def _parse_cached(text, today_ordinal):
+    """(날짜 문자열, 기준일) → KST datetime — 같은 문자열은 기준일이 같으면 다시 해석하지 않음"""
+    today = date.fromordinal(today_ordinal)
+
+    # ISO 8601 (2026-04-13T09:01:00+09:00) — 시각/시간대까지 살리기 위해 정규식보다 먼저
+    try:
+        dt = datetime.fromisoformat(text)
+    except ValueError:
+        dt = None
+    if dt is not None:
+        return dt.replace(tzinfo=KST) if dt.tzinfo is None else dt.astimezone(KST)
+
+    m = _FULL_DATE.search(text)
+    if m:
+        year, month, day = int(m.group(1)), int(m.group(2)), int(m.group(3))
+        return _kst(year, month, day, int(m.group(4) or 0), int(m.group(5) or 0), int(m.group(6) or 0))
+
+    m = _SHORT_DATE.match(text)
+    if m:
+        # 연도 없는 형식: 기준일 이후(미래)가 되지 않는 가장 가까운 해로 판단 (1월에 보는 12.31 → 작년)
+        month, day = int(m.group(1)), int(m.group(2))
+        hour, minute = int(m.group(3) or 0), int(m.group(4) or 0)
+        for year in (today.year, today.year - 1):
+            dt = _kst(year, month, day, hour, minute)
+            if dt is not None and dt.date() <= today + timedelta(days=1):
+                return dt
+        return None
+
+    m = _RELATIVE_DAY.match(text)
+    if m:
+        day = today - timedelta(days=_RELATIVE_DAY_OFFSET[m.group(1).lower()])
+        return _kst(day.year, day.month, day.day, int(m.group(2) or 0), int(m.group(3) or 0))
+
+    # RFC 2822 (RSS pubDate)
+    try:
+        dt = parsedate_to_datetime(text)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=KST)
+    return dt.astimezone(KST)
+
+
+def parse_news_date(text, today=None):
+    """
+    기사 날짜 문자열 → KST aware datetime (해석 불가 시 None)
+    today: 연도 없는 형식/'오늘'·'어제' 해석 기준일 (기본: 현재 KST 날짜)
+    """
+    if not text or not isinstance(text, str):
+        return None
+    today = today or now_kst().date()
+    return _parse_cached(text.strip(), today.toordinal())
+
+
+def news_day(item, date_key='date', today=None):
+    """기사 dict의 KST 날짜 (date 객체, 해석 불가 시 None)"""
+    dt = parse_news_date(item.get(date_key), today)
+    return dt.date() if dt else None
+
+
+class DayIndex:
+    """
+    기사를 KST 날짜별 버킷으로 묶은 인덱스
+    day(d): 하루치, between(start, end): 기간 (양 끝 포함) — 정렬된 날짜 키에서 이분 탐색
+    날짜를 해석할 수 없는 기사는 undated에 모음
+    """
+
+    def __init__(self, items=(), date_key='date', today=None):
+        self.date_key = date_key
+        self.today = today
+        self.buckets = {}
+        self.undated = []
+        self._days = None
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        day = news_day(item, self.date_key, self.today)
+        if day is None:
+            self.undated.append(item)
+            return
+        bucket = self.buckets.get(day)
+        if bucket is None:
+            bucket = self.buckets[day] = []
+            self._days = None
+        bucket.append(item)
+
+    def _sorted_days(self):
+        if self._days is None:
+            self._days = sorted(self.buckets)
+        return self._days
+
+    def day(self, day):
+        """해당 날짜(date 또는 datetime) 기사 리스트"""
+        if isinstance(day, datetime):
+            day = day.astimezone(KST).date() if day.tzinfo else day.date()
+        return list(self.buckets.get(day, ()))
+
+    def between(self, start, end):
+        """start ~ end (date, 양 끝 포함) 기사 리스트, 날짜순"""
+        days = self._sorted_days()
+        lo, hi = bisect_left(days, start), bisect_right(days, end)
+        return [item for day in days[lo:hi] for item in self.buckets[day]]
+
+    def counts(self):
+        """{날짜: 기사 수} (날짜순)"""
+        return {day: len(self.buckets[day]) for day in self._sorted_days()}
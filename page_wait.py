@@ -0,0 +1,152 @@
+# 페이지 준비 대기 유틸
+# 고정 time.sleep 대신 readyState/선택자 조건으로 대기하고,
+# 사이트별 로딩 시간을 기록해 타임아웃을 관측 지연에 맞춰 조정
+# 통계 파일은 실행 끝에 한 번 저장 (STATS.save — 종료 시 자동)
+
+# -*- coding: utf-8 -*-
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+import atexit
+import json
+import os
+import threading
+import time
+
+STATS_FILE = 'page_load_stats.json'
+
+DEFAULT_TIMEOUT = 15   # 표본이 부족할 때 타임아웃 (초)
+MIN_TIMEOUT = 3
+MAX_TIMEOUT = 30
+TIMEOUT_FACTOR = 3     # p95 로딩 시간의 몇 배까지 기다릴지
+MIN_SAMPLES = 3
+MAX_SAMPLES = 50       # 사이트별 보관할 최근 표본 수
+POLL_INTERVAL = 0.1
+
+# 한 번의 JS 호출로 readyState + 선택자 개수 확인 (폴링당 WebDriver 왕복 1회)
+_READY_SCRIPT = """
+if (document.readyState !== 'complete') return false;
+var selectors = arguments[0], minCount = arguments[1];
+if (!selectors.length) return true;
+for (var i = 0; i < selectors.length; i++) {
+    try {
+        if (document.querySelectorAll(selectors[i]).length >= minCount) return true;
+    } catch (e) {}
+}
+return false;
+"""
+
+
+class LoadStats:
+    """
+    사이트별 페이지 준비 시간 기록 (page_load_stats.json에 누적)
+    준비 조건을 못 채운 대기(타임아웃)는 표본에 넣지 않고 따로 셈
+    (타임아웃 값을 표본으로 넣으면 p95가 오르고 다음 타임아웃도 올라가는 식으로 계속 커짐)
+    """
+
+    def __init__(self, path=STATS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._timeouts = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if 'samples' in data:
+                    self._samples = data['samples']
+                    self._timeouts = data.get('timeouts', {})
+                else:
+                    # 예전 형식 ({사이트: 표본}) — 타임아웃 값이 섞여 있을 수 있어 표본을 버리고 새로 시작
+                    self._samples = {}
+            except:
+                self._samples = {}
+
+    def record(self, site, seconds):
+        with self._lock:
+            samples = self._samples.setdefault(site, [])
+            samples.append(round(seconds, 3))
+            del samples[:-MAX_SAMPLES]
+            self._dirty = True
+
+    def record_timeout(self, site):
+        with self._lock:
+            self._timeouts[site] = self._timeouts.get(site, 0) + 1
+            self._dirty = True
+
+    def save(self):
+        """바뀐 내용이 있으면 파일에 저장 (실행 끝에 한 번)"""
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            try:
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    json.dump({'samples': self._samples, 'timeouts': self._timeouts}, f, ensure_ascii=False, indent=2)
+                self._dirty = False
+            except OSError as e:
+                print(f"[WAIT] {self.path} 저장 실패: {e}")
+
+    def percentile(self, site, q):
+        with self._lock:
+            samples = sorted(self._samples.get(site, []))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def timeout_for(self, site):
+        """관측된 p95의 TIMEOUT_FACTOR배 (MIN~MAX 범위), 표본 부족 시 기본값"""
+        with self._lock:
+            count = len(self._samples.get(site, []))
+        if count < MIN_SAMPLES:
+            return DEFAULT_TIMEOUT
+        p95 = self.percentile(site, 0.95)
+        return max(MIN_TIMEOUT, min(MAX_TIMEOUT, p95 * TIMEOUT_FACTOR))
+
+    def summary(self):
+        with self._lock:
+            sites = list(dict.fromkeys([*self._samples, *self._timeouts]))
+        return {
+            site: {
+                'samples': len(self._samples.get(site, [])),
+                'timeouts': self._timeouts.get(site, 0),
+                'p50': self.percentile(site, 0.5),
+                'p95': self.percentile(site, 0.95),
+                'timeout': self.timeout_for(site),
+            }
+            for site in sites
+        }
+
+
+STATS = LoadStats()
+atexit.register(STATS.save)
+
+
+def wait_for_ready(driver, site, selectors=(), min_count=1, timeout=None, stats=None):
+    """
+    페이지가 준비될 때까지 대기
+    - document.readyState == 'complete'
+    - selectors 중 하나라도 min_count개 이상 존재 (selectors가 비면 readyState만 확인)
+    timeout이 없으면 사이트별 통계로 정한 값을 사용
+    반환: 조건 충족 여부 (타임아웃 시 False — 호출부의 기존 fallback 로직으로 진행)
+    """
+    stats = stats or STATS
+    if isinstance(selectors, str):
+        selectors = [selectors]
+    timeout = timeout or stats.timeout_for(site)
+
+    started = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL).until(
+            lambda d: d.execute_script(_READY_SCRIPT, list(selectors), min_count)
+        )
+    except TimeoutException:
+        print(f"[WAIT] {site}: {timeout:.1f}초 내 준비 조건 미충족, 현재 상태로 진행")
+        stats.record_timeout(site)
+        return False
+    except WebDriverException as e:
+        print(f"[WAIT] {site}: 준비 상태 확인 실패 ({e.__class__.__name__}), 현재 상태로 진행")
+        return False
+
+    elapsed = time.monotonic() - started
+    stats.record(site, elapsed)
+    return True
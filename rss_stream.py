@@ -0,0 +1,78 @@
+# RSS 스트리밍 파서
+# 응답 바이트 스트림을 iterparse로 <item> 단위 처리하고 처리한 요소는 바로 해제,
+# 피드가 최신순이므로 기준 시각보다 오래된 항목이 나오면 파싱 중단
+
+# -*- coding: utf-8 -*-
+from datetime import timedelta, timezone
+from email.utils import parsedate_to_datetime
+from news_dates import parse_news_date
+import xml.etree.ElementTree as ET
+
+KST = timezone(timedelta(hours=9))
+
+# 오래된 항목이 연속 몇 개 나오면 중단할지 (고정글/수정글로 순서가 살짝 어긋나는 경우 대비)
+STOP_AFTER_OLD = 3
+
+
+def item_datetime(item):
+    """<pubDate> (RFC 2822) → aware datetime, 파싱 실패 시 None"""
+    raw = item.findtext('pubDate')
+    if not raw:
+        return None
+    try:
+        return parsedate_to_datetime(raw.strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_rss_items(stream, since=None, stop_after_old=STOP_AFTER_OLD, channel_info=None):
+    """
+    <item> 요소를 하나씩 yield (다음 항목으로 넘어갈 때 해제)
+    since(aware datetime)가 주어지면 그보다 오래된 항목은 건너뛰고,
+    연속 stop_after_old개가 오래된 항목이면 나머지 피드는 읽지 않음
+    channel_info(dict)를 넘기면 채널 <title>을 'title' 키로 채움
+    """
+    channel = None
+    in_item = False
+    old_streak = 0
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == 'channel':
+                channel = elem
+            elif elem.tag == 'item':
+                in_item = True
+            continue
+        if elem.tag == 'title' and not in_item and channel_info is not None:
+            channel_info.setdefault('title', (elem.text or '').strip())
+        if elem.tag != 'item':
+            continue
+        in_item = False
+
+        dt = item_datetime(elem) if since is not None else None
+        if dt is not None and dt < since:
+            old_streak += 1
+            if old_streak >= stop_after_old:
+                return
+        else:
+            old_streak = 0
+            yield elem
+
+        # 처리한 항목 해제 (channel에 붙은 빈 요소까지 제거)
+        elem.clear()
+        if channel is not None:
+            channel.clear()
+
+
+def filter_since(news_list, since):
+    """
+    기사 dict의 'date'(news_dates로 해석, KST)가 since 이후인 것만
+    (304 응답으로 더 넓은 범위의 캐시를 재사용한 경우 범위를 맞추기 위함, 날짜 해석 불가 항목은 유지)
+    """
+    if since is None:
+        return news_list
+    kept = []
+    for news in news_list:
+        dt = parse_news_date(news.get('date'))
+        if dt is None or dt >= since:
+            kept.append(news)
+    return kept
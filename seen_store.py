@@ -0,0 +1,162 @@
+# 전송 이력 저장소 (SQLite)
+# 소스별 기사 URL + 내용 해시를 기록해 두고,
+# 수집 결과(JSON/아카이브)에는 모든 기사를 그대로 두고, Slack에는 새 기사만 전송 (drop_sent)
+# 크롤러는 이미 보낸 게시물의 비싼 작업(KAIF 상세 페이지)만 건너뜀
+
+# -*- coding: utf-8 -*-
+from datetime import datetime
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+
+SEEN_DB = os.getenv('NEWSBOT_SEEN_DB', 'seen_articles.db')
+
+# IN (...) 조회 한 번에 넣을 URL 수 (SQLite 변수 개수 제한 대비)
+QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_articles (
+    source       TEXT NOT NULL,
+    url          TEXT NOT NULL,
+    content_hash TEXT,
+    title        TEXT,
+    first_seen   TEXT NOT NULL,
+    sent_at      TEXT,
+    PRIMARY KEY (source, url)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_seen_hash ON seen_articles (source, content_hash);
+"""
+
+_WS = re.compile(r'\s+')
+
+
+def normalize_url(url):
+    """비교용 URL (앞뒤 공백, #fragment 제거)"""
+    if not url:
+        return None
+    return url.strip().split('#', 1)[0] or None
+
+
+def content_hash(title):
+    """공백을 정리한 제목의 SHA-1 — 같은 기사가 URL만 바뀌어 다시 올라온 경우 판별용"""
+    if not title:
+        return None
+    normalized = _WS.sub(' ', title).strip()
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest() if normalized else None
+
+
+def _chunks(values, size=QUERY_CHUNK):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+class SeenStore:
+    """
+    (source, url) 기본 키 + (source, content_hash) 인덱스 — 수십만 건이어도 조회는 인덱스 탐색
+    sent_at이 채워진 기사 = Slack으로 이미 보낸 기사
+    여러 크롤러 스레드가 같이 쓰므로 연결 하나를 lock으로 보호
+    """
+
+    def __init__(self, path=SEEN_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # 저널은 기본(rollback) 모드 — CI 실행 간에 DB 파일 하나만 보관해도 전송 기록이 모두 들어 있도록
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=DELETE')
+        self._conn.executescript(_SCHEMA)
+
+    def sent_urls(self, source, urls):
+        """urls 중 이미 보낸 URL 집합 (정규화 전 원래 값으로 반환)"""
+        by_key = {}
+        for url in urls:
+            key = normalize_url(url)
+            if key:
+                by_key.setdefault(key, []).append(url)
+        found = set()
+        with self._lock:
+            for chunk in _chunks(list(by_key)):
+                marks = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT url FROM seen_articles WHERE source = ? AND sent_at IS NOT NULL AND url IN ({marks})',
+                    [source, *chunk],
+                )
+                for (key,) in rows:
+                    found.update(by_key[key])
+        return found
+
+    def _sent_hashes(self, source, hashes):
+        found = set()
+        with self._lock:
+            for chunk in _chunks(list(hashes)):
+                marks = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    # 통계가 없으면 플래너가 기본 키(source)로 소스 전체를 훑으므로 해시 인덱스 지정
+                    f'SELECT content_hash FROM seen_articles INDEXED BY idx_seen_hash '
+                    f'WHERE source = ? AND sent_at IS NOT NULL AND content_hash IN ({marks})',
+                    [source, *chunk],
+                )
+                found.update(h for (h,) in rows)
+        return found
+
+    def unsent(self, source, items, url_key='url', title_key='title'):
+        """아직 보내지 않은 기사만 (URL 또는 제목 해시가 이미 보낸 기사와 같으면 제외)"""
+        if not items:
+            return []
+        sent = self.sent_urls(source, [item.get(url_key) for item in items])
+        hashes = {content_hash(item.get(title_key)) for item in items} - {None}
+        sent_hashes = self._sent_hashes(source, hashes) if hashes else set()
+        return [
+            item for item in items
+            if item.get(url_key) not in sent
+            and content_hash(item.get(title_key)) not in sent_hashes
+        ]
+
+    def mark_sent(self, source, items, url_key='url', title_key='title'):
+        """기사들을 전송 완료로 기록 (처음 보는 기사는 새로 추가)"""
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        rows = []
+        for item in items:
+            url = normalize_url(item.get(url_key))
+            if url:
+                title = item.get(title_key)
+                rows.append((source, url, content_hash(title), title, now, now))
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'INSERT INTO seen_articles (source, url, content_hash, title, first_seen, sent_at) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (source, url) DO UPDATE SET '
+                'content_hash = excluded.content_hash, title = excluded.title, '
+                'sent_at = COALESCE(seen_articles.sent_at, excluded.sent_at)',
+                rows,
+            )
+        return len(rows)
+
+    def count(self, source=None):
+        with self._lock:
+            if source is None:
+                return self._conn.execute('SELECT COUNT(*) FROM seen_articles').fetchone()[0]
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM seen_articles WHERE source = ?', (source,)
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """프로세스 공용 SeenStore (NEWSBOT_SEEN_DB, 기본 seen_articles.db)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SeenStore()
+        return _store
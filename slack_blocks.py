@@ -0,0 +1,115 @@
+# Slack Block Kit 패킹
+# 기사 링크를 한 줄씩 section 블록에 넣지 않고, mrkdwn section 하나에 3000자 한도까지 여러 줄을 채움
+# 블록 리스트는 메시지당 50블록 한도에 맞춰 순서대로 최소 개수의 메시지로 나눔
+# (줄 순서를 유지하는 한, 한도까지 채우고 넘어가는 greedy 방식이 블록/메시지 수 최소)
+
+# -*- coding: utf-8 -*-
+import re
+
+SECTION_TEXT_LIMIT = 3000    # section.text 최대 길이
+MAX_BLOCKS = 50              # 메시지당 최대 블록 수
+MESSAGE_TEXT_LIMIT = 40000   # 메시지 하나의 블록 텍스트 합계 상한 (Slack 메시지 길이 한도)
+ELLIPSIS = '…'
+
+_LINK = re.compile(r'<([^|>]+)\|')
+
+
+def slack_len(text):
+    """Slack 기준 글자 수 (UTF-16 코드 유닛 — 이모지 등은 2로 셈, 한도를 넘지 않도록 보수적으로)"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def escape_mrkdwn(text):
+    """mrkdwn 제어 문자 이스케이프 (&, <, >) — 제목의 '>'가 링크를 깨뜨리지 않도록"""
+    return (text or '').replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _truncate(text, limit):
+    if slack_len(text) <= limit:
+        return text
+    while text and slack_len(text) > limit - 1:
+        text = text[:-1]
+    return text.rstrip() + ELLIPSIS
+
+
+def link_url(url):
+    """mrkdwn 링크에 넣는 형태의 URL ('|', '>'가 링크를 끊지 않도록 인코딩)"""
+    return (url or '').replace('|', '%7C').replace('>', '%3E')
+
+
+def link_line(url, title, prefix='', suffix='', limit=SECTION_TEXT_LIMIT):
+    """'{prefix}<url|title>{suffix}' 한 줄 — 한도를 넘으면 제목을 줄여서 맞춤"""
+    url = link_url(url)
+    title = escape_mrkdwn(title).replace('|', '¦')
+    if not url:
+        return _truncate(f'{prefix}{title}{suffix}', limit)
+    room = limit - slack_len(f'{prefix}<{url}|>{suffix}')
+    return f'{prefix}<{url}|{_truncate(title, max(room, 1))}>{suffix}'
+
+
+def section(text):
+    return {"type": "section", "text": {"type": "mrkdwn", "text": text}}
+
+
+def pack_lines(lines, heading=None, limit=SECTION_TEXT_LIMIT):
+    """
+    줄 목록 → section 블록 리스트 (각 text는 limit 이하, 줄 순서 유지)
+    heading은 첫 블록 맨 위에 붙여서 제목만 따로 떨어지지 않게 함
+    한 줄이 limit을 넘으면 잘라서 넣음
+    """
+    blocks = []
+    current = [heading] if heading else []
+    size = slack_len(heading) if heading else 0
+    for line in lines:
+        line = _truncate(line, limit)
+        added = slack_len(line) + (1 if current else 0)   # 줄바꿈 1자
+        if current and size + added > limit:
+            blocks.append(section('\n'.join(current)))
+            current, size = [], 0
+            added = slack_len(line)
+        current.append(line)
+        size += added
+    if current:
+        blocks.append(section('\n'.join(current)))
+    return blocks
+
+
+def _block_text_len(block):
+    total = 0
+    text = block.get('text')
+    if isinstance(text, dict):
+        total += slack_len(text.get('text', ''))
+    for element in block.get('elements', ()):
+        total += slack_len(element.get('text', '')) if isinstance(element, dict) else 0
+    return total
+
+
+def split_messages(blocks, max_blocks=MAX_BLOCKS, text_limit=MESSAGE_TEXT_LIMIT):
+    """
+    블록 리스트 → 메시지별 블록 리스트 (순서 유지, 메시지당 max_blocks개·text_limit자 이하)
+    이어지는 메시지는 구분선(divider)으로 시작하지 않도록 맨 앞 구분선은 버림
+    """
+    messages = []
+    current, size = [], 0
+    for block in blocks:
+        length = _block_text_len(block)
+        if current and (len(current) >= max_blocks or size + length > text_limit):
+            messages.append(current)
+            current, size = [], 0
+        if not current and messages and block.get('type') == 'divider':
+            continue
+        current.append(block)
+        size += length
+    if current:
+        messages.append(current)
+    return messages
+
+
+def message_urls(blocks):
+    """메시지 블록 안의 링크 URL 집합 (link_url 형태) — 어떤 항목이 이 메시지로 나갔는지 확인용"""
+    urls = set()
+    for block in blocks:
+        text = block.get('text')
+        if isinstance(text, dict):
+            urls.update(_LINK.findall(text.get('text', '')))
+    return urls
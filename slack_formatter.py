@@ -2,18 +2,38 @@
 
 # -*- coding: utf-8 -*-
 import json
-from datetime import datetime, timedelta, timezone
+import sqlite3
+import time
+from datetime import timedelta, timezone
 import requests
+from article_archive import get_archive
+from cassette import install_session
+from crawl_result import CrawlResult
+from json_sink import SINK
+from metrics import METRICS, instrument_session, span
+from near_dup import dedupe_near_duplicates
+from news_dates import DayIndex, now_kst
+from seen_store import get_store
+from slack_blocks import link_line, link_url, message_urls, pack_lines, split_messages
 
 # 한국 시간대 (UTC+9)
 KST = timezone(timedelta(hours=9))
 
+# 전송 설정 — Webhook은 초당 1건 정도로 제한되므로 메시지 사이 간격을 둠
+SEND_TIMEOUT = 10
+SEND_RETRIES = 3
+MAX_RETRY_DELAY = 60
+MESSAGE_INTERVAL = 1.0
+
+# Webhook 전송 세션 (HTTP 지표 기록 + 카세트 녹화/재생 대상)
+SLACK_SESSION = install_session(instrument_session(requests.Session()), alias='slack-webhook')
+
+
 def format_slack_message(all_news_data, kaif_data, newsletter_items=None):
     """
     어제의 원자력 뉴스를 Slack 메시지 형식으로 포맷팅
     """
-    now_kst = datetime.now(KST)
-    yesterday = now_kst - timedelta(days=1)
+    yesterday = now_kst() - timedelta(days=1)
     yesterday_str = yesterday.strftime('%Y년 %m월 %d일 (%A)')
 
     # Slack Block Kit 형식으로 메시지 구성
@@ -56,6 +76,12 @@ def format_slack_message(all_news_data, kaif_data, newsletter_items=None):
                 'url': news.get('url', '')
             })
 
+    # 소스 간 같은 기사 묶기 (에너지신문 → 원자력산업신문 → KAIF 순서로 먼저 나온 항목이 대표)
+    deduped = dedupe_near_duplicates(general_news_list)
+    if len(deduped) < len(general_news_list):
+        print(f"[DEDUP] 유사 중복 기사 {len(general_news_list) - len(deduped)}건 제외")
+    general_news_list = deduped
+
     # 원자력계 소식/이벤트 (KAIF 뉴스레터 — 날짜 필터 없이 그대로)
     newsletter = newsletter_items or []
     nuclear_news_list = [n for n in newsletter if n.get('category') == 'nuclear_news']
@@ -64,62 +90,30 @@ def format_slack_message(all_news_data, kaif_data, newsletter_items=None):
     total_count = len(general_news_list) + len(nuclear_news_list) + len(nuclear_events_list)
     all_news_list = general_news_list  # 푸터 카운트용
 
-    # 일반 뉴스 목록 출력
+    # 일반 뉴스 목록 출력 — 링크 여러 줄을 section 하나에 3000자까지 채움 (메시지당 50블록 한도 대비)
     if general_news_list:
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*📌 어제의 뉴스* ({len(general_news_list)}건)"
-            }
-        })
-
-        for idx, news in enumerate(general_news_list, 1):
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"{idx}. <{news['url']}|{news['title']}>"
-                }
-            })
+        blocks.extend(pack_lines(
+            [link_line(news['url'], news['title'], prefix=f"{idx}. ",
+                       suffix=f" _(외 {news['duplicates']}건)_" if news.get('duplicates') else "")
+             for idx, news in enumerate(general_news_list, 1)],
+            heading=f"*📌 어제의 뉴스* ({len(general_news_list)}건)",
+        ))
 
     # 원자력계 소식 섹션
     if nuclear_news_list:
         blocks.append({"type": "divider"})
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*⚛️ 원자력계 소식* ({len(nuclear_news_list)}건)"
-            }
-        })
-        for news in nuclear_news_list:
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"• <{news['url']}|{news['title']}>"
-                }
-            })
+        blocks.extend(pack_lines(
+            [link_line(news['url'], news['title'], prefix="• ") for news in nuclear_news_list],
+            heading=f"*⚛️ 원자력계 소식* ({len(nuclear_news_list)}건)",
+        ))
 
     # 원자력계 이벤트 섹션
     if nuclear_events_list:
         blocks.append({"type": "divider"})
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": f"*📅 원자력계 이벤트* ({len(nuclear_events_list)}건)"
-            }
-        })
-        for news in nuclear_events_list:
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"• <{news['url']}|{news['title']}>"
-                }
-            })
+        blocks.extend(pack_lines(
+            [link_line(news['url'], news['title'], prefix="• ") for news in nuclear_events_list],
+            heading=f"*📅 원자력계 이벤트* ({len(nuclear_events_list)}건)",
+        ))
 
     # 푸터
     blocks.append({"type": "divider"})
@@ -128,7 +122,7 @@ def format_slack_message(all_news_data, kaif_data, newsletter_items=None):
         "elements": [
             {
                 "type": "mrkdwn",
-                "text": f"총 {total_count}건의 뉴스 | 수집 시간: {datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')} (KST)"
+                "text": f"총 {total_count}건의 뉴스 | 수집 시간: {now_kst().strftime('%Y-%m-%d %H:%M:%S')} (KST)"
             }
         ]
     })
@@ -136,93 +130,95 @@ def format_slack_message(all_news_data, kaif_data, newsletter_items=None):
     return blocks
 
 
-def send_to_slack(webhook_url, blocks):
+def _post_with_retry(webhook_url, body):
+    """
+    JSON 본문 하나 전송 — 429는 Retry-After만큼, 5xx/연결 오류는 지수 백오프로 재시도
+    응답 대기 중 시간 초과는 재시도하지 않음 (이미 게시됐을 수 있어 다시 보내면 중복)
+    반환: 마지막 응답 (네트워크 오류로 끝나면 None)
+    """
+    response = None
+    for attempt in range(SEND_RETRIES + 1):
+        if attempt:
+            METRICS.count('slack.retries')
+        try:
+            with span('slack.post'):
+                response = SLACK_SESSION.post(webhook_url, data=body, timeout=SEND_TIMEOUT,
+                                              headers={'Content-Type': 'application/json; charset=utf-8'})
+        except requests.ReadTimeout as e:
+            print(f"[ERROR] Slack 응답 시간 초과 — 게시됐을 수 있어 재시도하지 않음: {e}")
+            return None
+        except requests.RequestException as e:
+            print(f"[RETRY] Slack 연결 오류: {e}")
+            response = None
+            delay = 2 ** attempt
+        else:
+            if response.status_code == 429:
+                try:
+                    delay = float(response.headers.get('Retry-After', 1))
+                except ValueError:
+                    delay = 1.0
+                print(f"[RETRY] Slack 요청 한도 초과 (429) — {delay:.0f}초 후 재시도")
+            elif response.status_code >= 500:
+                print(f"[RETRY] Slack 서버 오류 {response.status_code}")
+                delay = 2 ** attempt
+            else:
+                return response
+        if attempt < SEND_RETRIES:
+            time.sleep(min(delay, MAX_RETRY_DELAY))
+    return response
+
+
+def send_to_slack(webhook_url, blocks, on_sent=None):
     """
     Slack Webhook으로 메시지 전송
+    블록이 메시지 한도(50블록)를 넘으면 순서대로 여러 메시지로 나눠 보냄 — 하나라도 실패하면 중단
+    on_sent: 메시지 하나가 전송될 때마다 그 메시지의 블록 리스트로 호출 (중간에 실패해도 앞 메시지는 기록되도록)
+    반환: 전부 전송했으면 True
     """
-    payload = {
-        "blocks": blocks
-    }
-
-    response = requests.post(
-        webhook_url,
-        json=payload,
-        headers={'Content-Type': 'application/json'}
-    )
-
-    if response.status_code == 200:
-        print("[OK] Slack 메시지 전송 완료!")
-        return True
-    else:
-        print(f"[ERROR] Slack 전송 실패: {response.status_code} - {response.text}")
-        return False
-
-
-def create_today_summary():
+    messages = split_messages(blocks)
+    for i, message_blocks in enumerate(messages, 1):
+        if i > 1:
+            time.sleep(MESSAGE_INTERVAL)
+        # 한글을 \uXXXX로 풀지 않고 공백 없이 직렬화 (본문 크기 절반 이하)
+        body = json.dumps({"blocks": message_blocks}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        response = _post_with_retry(webhook_url, body)
+        if response is None or response.status_code != 200:
+            detail = f"{response.status_code} - {response.text}" if response is not None else "연결 실패"
+            print(f"[ERROR] Slack 전송 실패 ({i}/{len(messages)}): {detail}")
+            return False
+        print(f"[OK] Slack 메시지 전송 완료 ({i}/{len(messages)}, {len(message_blocks)}블록, {len(body) / 1024:.1f}KB)")
+        if on_sent is not None:
+            on_sent(message_blocks)
+    return True
+
+
+def create_today_summary(result=None):
     """
-    오늘 날짜 뉴스 요약 JSON 생성
+    오늘 날짜 뉴스 요약 생성
+    result: 이번 실행의 CrawlResult — 없으면 (--slack-only / 단독 실행) 저장된 소스별 JSON에서 읽음
     """
-    # 데이터 파일 읽기
-    try:
-        with open('energy_news_data.json', 'r', encoding='utf-8') as f:
-            energy_data = json.load(f)
-            energy_news = energy_data.get('news_list', [])
-            # source 필드 추가
-            for news in energy_news:
-                news['source'] = 'energy_news'
-    except:
-        energy_news = []
-
-    try:
-        with open('knpnews_data.json', 'r', encoding='utf-8') as f:
-            knp_data = json.load(f)
-            knp_news = knp_data.get('news_list', [])
-            # source 필드 추가
-            for news in knp_news:
-                news['source'] = 'knpnews'
-    except:
-        knp_news = []
-
-    try:
-        with open('kaif_data.json', 'r', encoding='utf-8') as f:
-            kaif_data = json.load(f)
-            kaif_posts = kaif_data.get('posts', [])
-    except:
-        kaif_posts = []
-
+    if result is None:
+        result = CrawlResult.from_files()
+    kaif_posts = result.kaif_posts
     # KAIF 뉴스레터 (날짜 필터 없이 그대로)
-    try:
-        with open('kaif_newsletter_data.json', 'r', encoding='utf-8') as f:
-            newsletter_data = json.load(f)
-            newsletter_items = newsletter_data.get('items', [])
-        print(f"[OK] 뉴스레터 항목 {len(newsletter_items)}개 로드")
-    except:
-        newsletter_items = []
+    newsletter_items = result.newsletter_items
 
     # 어제 날짜 확인 (한국 시간 기준)
-    now_kst = datetime.now(KST)
-    yesterday = now_kst - timedelta(days=1)
+    now = now_kst()
+    yesterday = now - timedelta(days=1)
     today_str = yesterday.strftime('%Y.%m.%d')  # 2026.04.13
-    today_str_alt = yesterday.strftime('%Y-%m-%d')  # 2026-04-13
-    today_date_only = yesterday.strftime('%m.%d')  # 04.13 (연도 없는 형식용)
-
-    # 모든 뉴스 합치기
-    all_news = energy_news + knp_news
-
-    # 어제 날짜 뉴스만 필터링
-    today_news = []
-    for news in all_news:
-        date_str = news.get('date') or ''
-        # 다양한 날짜 형식 체크
-        # "2026.04.13 09:01", "2026-04-13", "04.13 09:01" 형식
-        if date_str and (today_str in date_str or
-            today_str_alt in date_str or
-            date_str.startswith(today_str) or
-            date_str.startswith(today_str_alt) or
-            date_str.startswith(today_date_only)):
-            today_news.append(news)
-            title = news.get('title', '').encode('cp949', errors='replace').decode('cp949')
-            print(f"[OK] 어제 뉴스 발견: {title} - {date_str}")
+
+    # 모든 뉴스 합치기 (소스별 'source' 필드는 CrawlResult에서 보장)
+    all_news = result.news
+
+    # 날짜별 인덱스로 어제 뉴스만 (소스별 날짜 형식은 news_dates에서 한 번씩만 해석)
+    day_index = DayIndex(all_news, today=now.date())
+    today_news = day_index.day(yesterday.date())
+    for news in today_news:
+        title = news.get('title', '').encode('cp949', errors='replace').decode('cp949')
+        print(f"[OK] 어제 뉴스 발견: {title} - {news.get('date')}")
+    if day_index.undated:
+        print(f"[SKIP] 날짜를 해석할 수 없는 뉴스 {len(day_index.undated)}개")
 
     # 요약 데이터 생성
     summary = {
@@ -239,43 +235,122 @@ def create_today_summary():
         'newsletter_items': newsletter_items
     }
 
-    # JSON 파일로 저장
-    output_file = f'yesterday_news_{yesterday.strftime("%Y%m%d")}.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(summary, f, ensure_ascii=False, indent=2)
+    # 기사 아카이브에 이번 수집분 전체 추가 (이미 있는 기사는 무시, 실패해도 요약/전송은 계속)
+    try:
+        with span('archive.add'):
+            added = get_archive().add_result(result, today=now.date())
+        print(f"[OK] 기사 아카이브에 새 기사 {sum(added.values())}개 추가")
+    except sqlite3.Error as e:
+        print(f"[SKIP] 기사 아카이브 기록 실패: {e}")
 
-    print(f"\n[OK] 어제의 뉴스 요약이 '{output_file}'에 저장되었습니다.")
+    # JSON 파일로 저장 (백그라운드 기록)
+    output_file = f'yesterday_news_{yesterday.strftime("%Y%m%d")}.json'
+    if SINK.write(output_file, summary):
+        print(f"\n[OK] 어제의 뉴스 요약을 '{output_file}'에 저장합니다.")
     print(f"총 {len(today_news)}개의 뉴스 기사 + {len(kaif_posts)}개의 KAIF 게시물")
     print(f"대상 날짜: {yesterday.strftime('%Y년 %m월 %d일')}")
 
     return summary
 
 
-def main_with_slack(webhook_url=None):
+def _unsent_items(store, items, default_source, url_key='url'):
+    """소스별로 묶어 아직 보내지 않은 항목만 (원래 순서 유지)"""
+    groups = {}
+    for item in items:
+        groups.setdefault(item.get('source') or default_source, []).append(item)
+    keep = set()
+    for source, group in groups.items():
+        keep.update(id(item) for item in store.unsent(source, group, url_key=url_key))
+    return [item for item in items if id(item) in keep]
+
+
+def drop_sent(summary, store=None):
+    """요약에서 이미 Slack으로 보낸 기사/게시물/뉴스레터 항목 제외"""
+    store = store or get_store()
+    fresh = dict(summary)
+    fresh['news'] = _unsent_items(store, summary['news'], 'news')
+    fresh['kaif_posts'] = store.unsent('kaif', summary['kaif_posts'], url_key='list_url')
+    fresh['newsletter_items'] = _unsent_items(store, summary.get('newsletter_items', []), 'kaif_newsletter')
+
+    for key in ('news', 'kaif_posts', 'newsletter_items'):
+        skipped = len(summary.get(key, [])) - len(fresh[key])
+        if skipped:
+            print(f"[SEEN] {key}: 이미 보낸 항목 {skipped}개 제외")
+    return fresh
+
+
+def _post_urls(post):
+    """KAIF 게시물이 메시지에 남기는 링크 (국내/세계 기사)"""
+    news_links = post.get('news_links', {})
+    return [news['url'] for key in ('domestic', 'international') for news in news_links.get(key, []) if news.get('url')]
+
+
+def mark_delivered(summary, store=None, delivered_urls=None):
+    """
+    전송한 항목을 전송 이력에 기록
+    delivered_urls: 일부 메시지만 전송된 경우 전송된 메시지의 링크 집합 (message_urls) — 링크가 모두 나간 항목만 기록
+    (메시지에 링크가 없는 항목, 유사 중복으로 묶여 빠진 기사는 전체 전송 때만 기록 — 다음 실행에서 다시 보냄)
+    """
+    store = store or get_store()
+
+    def delivered(urls):
+        if delivered_urls is None:
+            return True
+        return bool(urls) and all(link_url(url) in delivered_urls for url in urls)
+
+    marked = 0
+    for key, default_source in (('news', 'news'), ('newsletter_items', 'kaif_newsletter')):
+        groups = {}
+        for item in summary.get(key, []):
+            if delivered([item['url']] if item.get('url') else []):
+                groups.setdefault(item.get('source') or default_source, []).append(item)
+        for source, group in groups.items():
+            marked += store.mark_sent(source, group)
+    posts = [post for post in summary['kaif_posts'] if delivered(_post_urls(post))]
+    marked += store.mark_sent('kaif', posts, url_key='list_url')
+    print(f"[OK] 전송 이력 {marked}건 기록" + (" (일부 메시지만 전송됨)" if delivered_urls is not None else ""))
+
+
+def main_with_slack(webhook_url=None, result=None):
     """
     어제의 뉴스 요약 생성 및 Slack 전송
+    result: crawl_all_news()의 CrawlResult (없으면 저장된 파일에서 읽음)
     """
     print("="*100)
     print("어제의 원자력 뉴스 요약 생성 중...")
     print("="*100)
 
     # 요약 생성
-    summary = create_today_summary()
+    with span('slack.summary'):
+        summary = create_today_summary(result)
+    # 이전 실행에서 이미 보낸 항목 제외 (재실행 시 중복 전송 방지)
+    summary = drop_sent(summary)
+    has_new = summary['news'] or summary['kaif_posts'] or summary.get('newsletter_items')
 
     # Slack 메시지 포맷팅
     print("\nSlack 메시지 포맷팅 중...")
-    blocks = format_slack_message(summary['news'], summary['kaif_posts'], summary.get('newsletter_items', []))
+    with span('slack.format'):
+        blocks = format_slack_message(summary['news'], summary['kaif_posts'], summary.get('newsletter_items', []))
 
-    # Slack 메시지 미리보기 (JSON)
+    # Slack 메시지 미리보기 (JSON, 실제 전송 단위로 나눈 메시지 목록)
     preview_file = 'slack_message_preview.json'
-    with open(preview_file, 'w', encoding='utf-8') as f:
-        json.dump({"blocks": blocks}, f, ensure_ascii=False, indent=2)
-    print(f"[OK] Slack 메시지 미리보기가 '{preview_file}'에 저장되었습니다.")
+    messages = split_messages(blocks)
+    if SINK.write(preview_file, {"messages": [{"blocks": m} for m in messages]}):
+        print(f"[OK] Slack 메시지 미리보기를 '{preview_file}'에 저장합니다. ({len(blocks)}블록, 메시지 {len(messages)}개)")
 
     # Slack 전송 (Webhook URL이 제공된 경우)
-    if webhook_url:
+    if webhook_url and not has_new:
+        print("\n[SKIP] 새로 보낼 항목이 없어 Slack 전송을 건너뜁니다.")
+    elif webhook_url:
         print("\nSlack으로 전송 중...")
-        send_to_slack(webhook_url, blocks)
+        delivered_urls = set()
+        with span('slack.send'):
+            sent = send_to_slack(webhook_url, blocks, on_sent=lambda m: delivered_urls.update(message_urls(m)))
+        if sent:
+            mark_delivered(summary)
+        elif delivered_urls:
+            # 앞쪽 메시지는 이미 게시됨 — 거기 실린 항목은 다음 실행에서 다시 보내지 않도록 기록
+            mark_delivered(summary, delivered_urls=delivered_urls)
     else:
         print("\n[INFO] Webhook URL이 없어서 Slack 전송을 건너뜁니다.")
         print("[INFO] Slack 전송을 원하시면 main_with_slack('YOUR_WEBHOOK_URL')을 호출하세요.")
@@ -0,0 +1,211 @@
+# 페이지 스냅샷 파서
+# driver.page_source를 한 번만 받아 lxml로 파싱 (항목별 WebDriver 왕복 제거)
+
+# -*- coding: utf-8 -*-
+from functools import lru_cache
+from urllib.parse import urljoin
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from metrics import METRICS
+import os
+import re
+import time
+
+# 목록 파싱 모드: snapshot(기본) / webdriver(기존 방식) / compare(둘 다 실행 후 비교·시간 측정)
+PARSE_MODE = os.getenv('NEWSBOT_PARSE_MODE', 'snapshot')
+
+
+@lru_cache(maxsize=None)
+def css(selector):
+    """CSS 선택자를 XPath로 한 번만 컴파일해 재사용"""
+    return CSSSelector(selector, translator='html')
+
+
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.I)
+_XML_DECL = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+def decode_html(content, content_type=None):
+    """
+    HTTP 응답 바이트 → 문자열
+    charset 우선순위: Content-Type 헤더 → <meta charset> → UTF-8 → CP949 (국내 사이트)
+    """
+    charset = None
+    if content_type and 'charset=' in content_type.lower():
+        charset = content_type.lower().split('charset=')[-1].split(';')[0].strip(' "\'')
+    if not charset:
+        m = _META_CHARSET.search(content[:4096])
+        charset = m.group(1).decode('ascii') if m else None
+    for encoding in filter(None, (charset, 'utf-8')):
+        try:
+            return content.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return content.decode('cp949', errors='replace')
+
+
+def load_html(page_source, base_url=None):
+    """페이지 소스(문자열) → lxml 문서"""
+    # 문자열 입력에 인코딩 선언이 있으면 lxml이 거부하므로 제거
+    return lxml_html.fromstring(_XML_DECL.sub('', page_source, count=1), base_url=base_url)
+
+
+def element_text(elem):
+    """WebDriver .text와 같은 형태로 텍스트 정리 (\xa0 정규화 + 연속 공백 축약)"""
+    if elem is None:
+        return None
+    return ' '.join(elem.text_content().replace('\xa0', ' ').split())
+
+
+# innerText 근사: 블록 요소는 줄바꿈, 표 셀은 탭으로 구분
+_BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt', 'fieldset',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table',
+    'tbody', 'thead', 'tfoot', 'tr', 'ul', 'caption',
+}
+_SKIP_TAGS = {'script', 'style', 'head', 'noscript', 'template'}
+
+
+def inner_text(elem):
+    """
+    WebDriver .text / innerText 근사 (줄 구조 유지)
+    - 블록 요소와 <br>은 줄바꿈, 같은 행의 <td>/<th>는 탭으로 구분
+    - 줄마다 연속 공백 축약 후 빈 줄 제거
+    """
+    if elem is None:
+        return None
+    parts = []
+
+    def walk(node):
+        tag = node.tag if isinstance(node.tag, str) else None
+        if tag in _SKIP_TAGS or (tag is None and node.tag is not None):
+            # 주석/처리 지시문은 건너뛰되 tail 텍스트는 유지
+            pass
+        else:
+            if tag == 'br':
+                parts.append('\n')
+            elif tag in _BLOCK_TAGS:
+                parts.append('\n')
+            elif tag in ('td', 'th'):
+                parts.append('\t')
+            if node.text:
+                parts.append(node.text)
+            for child in node:
+                walk(child)
+                if child.tail:
+                    parts.append(child.tail)
+            if tag in _BLOCK_TAGS:
+                parts.append('\n')
+
+    walk(elem)
+    lines = []
+    for line in ''.join(parts).replace('\xa0', ' ').split('\n'):
+        line = ' '.join(line.split())
+        if line:
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+def element_url(elem, attr, base_url):
+    """get_attribute('href'/'src')처럼 절대 URL로 변환"""
+    if elem is None:
+        return None
+    value = elem.get(attr)
+    if value is None:
+        return None
+    return urljoin(base_url, value.strip()) if base_url else value.strip()
+
+
+def first(elem, selector):
+    """find_element 대응: 첫 번째 매칭 요소 또는 None"""
+    found = css(selector)(elem)
+    return found[0] if found else None
+
+
+def find_list_items(doc, selectors, min_count, container=False):
+    """
+    선택자를 앞에서부터 시도해 min_count개 이상 항목이 나오는 첫 결과 반환
+    container=True: 선택자가 목록(ul)을 가리킴 → 첫 매칭 요소 아래 모든 li
+    container=False: 선택자가 항목(li) 자체를 가리킴
+    반환: (선택자, 항목 리스트) 또는 (None, [])
+    """
+    for selector in selectors:
+        if container:
+            elem = first(doc, selector)
+            items = elem.findall('.//li') if elem is not None else []
+        else:
+            items = css(selector)(doc)
+        if len(items) >= min_count:
+            return selector, items
+    return None, []
+
+
+def extract_article(item, base_url):
+    """
+    목록 항목(li) 하나에서 기사 정보 추출 — Selenium 파서와 같은 필드/fallback 순서
+    type2: span.byline > em [카테고리, 기자, 날짜]
+    type1: em.info.category / em.info.name / em.info.dated
+    """
+    news_data = {}
+    news_data['thumbnail'] = element_url(first(item, 'a.thumb img'), 'src', base_url)
+
+    title_elem = first(item, 'h2.titles a')
+    news_data['title'] = element_text(title_elem)
+    news_data['url'] = element_url(title_elem, 'href', base_url)
+
+    news_data['preview'] = element_text(first(item, 'p.lead a'))
+
+    byline = first(item, 'span.byline')
+    if byline is not None:
+        ems = byline.findall('.//em')
+        news_data['category'] = element_text(ems[0]) if len(ems) >= 1 else None
+        news_data['reporter'] = element_text(ems[1]) if len(ems) >= 2 else None
+        news_data['date']     = element_text(ems[2]) if len(ems) >= 3 else None
+    else:
+        news_data['category'] = element_text(first(item, 'em.info.category'))
+        news_data['reporter'] = element_text(first(item, 'em.info.name'))
+        news_data['date']     = element_text(first(item, 'em.info.dated'))
+
+    return news_data
+
+
+def parse_article_list(page_source, base_url, selectors, min_count, container=False):
+    """
+    목록 페이지 스냅샷 파싱
+    반환: (사용된 선택자, 기사 dict 리스트) — 목록을 못 찾으면 (None, [])
+    """
+    doc = load_html(page_source, base_url)
+    selector, items = find_list_items(doc, selectors, min_count, container=container)
+    return selector, [extract_article(item, base_url) for item in items]
+
+
+def timed_parse(label, parse_mode, snapshot_parse, webdriver_parse):
+    """
+    parse_mode에 따라 목록 파싱 실행 후 소요 시간 출력
+    compare 모드: 두 방식을 모두 실행해 결과 일치 여부와 속도 차이를 출력하고 스냅샷 결과 반환
+    """
+    if parse_mode == 'webdriver':
+        started = time.perf_counter()
+        result = webdriver_parse()
+        webdriver_ms = (time.perf_counter() - started) * 1000
+        METRICS.observe('span', f'{label}.parse', webdriver_ms)
+        print(f"[PARSE] {label} webdriver 파싱: {webdriver_ms:.1f}ms")
+        return result
+
+    started = time.perf_counter()
+    result = snapshot_parse()
+    snapshot_ms = (time.perf_counter() - started) * 1000
+    METRICS.observe('span', f'{label}.parse', snapshot_ms)
+    print(f"[PARSE] {label} snapshot 파싱: {snapshot_ms:.1f}ms")
+
+    if parse_mode == 'compare':
+        started = time.perf_counter()
+        legacy = webdriver_parse()
+        webdriver_ms = (time.perf_counter() - started) * 1000
+        speedup = webdriver_ms / snapshot_ms if snapshot_ms else float('inf')
+        print(f"[PARSE] {label} webdriver 파싱: {webdriver_ms:.1f}ms → snapshot {speedup:.1f}배 빠름")
+        if legacy != result:
+            print(f"[WARN] {label} 두 파싱 결과가 다릅니다 (snapshot {len(result or [])}개 / webdriver {len(legacy or [])}개)")
+
+    return result